@@ -181,6 +181,7 @@ router.post("/metadata", (req, res) => {
       return res.status(400).json({ r: "err", msg: "body must be JSON object" });
     }
     tcp.metadataJson = JSON.parse(JSON.stringify(body));
+    tcp.notifyMetadataChanged(); // 구독 클라이언트에 변경분 푸시
     res.json({ r: "ok", msg: "replaced", size: Object.keys(tcp.metadataJson).length });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -196,6 +197,7 @@ router.patch("/metadata", (req, res) => {
       return res.status(400).json({ r: "err", msg: "body must be JSON object" });
     }
     deepMerge(tcp.metadataJson, patch);
+    tcp.notifyMetadataChanged();
     res.json({ r: "ok", msg: "merged" });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -207,6 +209,7 @@ router.delete("/metadata", (req, res) => {
   try {
     const tcp = getTcp(req);
     tcp.metadataJson = {};
+    tcp.notifyMetadataChanged();
     res.json({ r: "ok", msg: "cleared" });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -227,6 +230,7 @@ router.put("/metadata/:path", (req, res) => {
     const value = hasWrapper ? body.value : body; // {value} 혹은 raw object 둘 다 허용
 
     setByPath(tcp.metadataJson, path, value);
+    tcp.notifyMetadataChanged();
     res.json({ r: "ok", path, replaced: true });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -246,10 +250,12 @@ router.patch("/metadata/:path", (req, res) => {
 
     if (cur && typeof cur === "object" && !Array.isArray(cur) && patch && typeof patch === "object" && !Array.isArray(patch)) {
       deepMerge(cur, patch);
+      tcp.notifyMetadataChanged();
       return res.json({ r: "ok", path, merged: true });
     }
     // 대상이 object가 아니면 통째로 교체
     setByPath(tcp.metadataJson, path, patch);
+    tcp.notifyMetadataChanged();
     res.json({ r: "ok", path, replaced: true });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -264,6 +270,7 @@ router.delete("/metadata/:path", (req, res) => {
     if (!path) return res.status(400).json({ r: "err", msg: "path required" });
 
     const ok = deleteByPath(tcp.metadataJson, path);
+    tcp.notifyMetadataChanged();
     res.json({ r: "ok", path, deleted: ok });
   } catch (e) {
     res.status(500).json({ r: "err", msg: e.message });
@@ -21,6 +21,17 @@ export const PUSH_JSON     = 0x03;
 export const PUSH_STATUS   = 0x04;
 export const PUSH_ALERT    = 0x05;
 
+// 요청 ID 확장: REQ_JSON 바디에 "req_id"(uint32)가 있으면 REQ_ACK_ID로 응답
+// (데이터 응답 명령은 PUSH_JSON에 같은 req_id를 넣어 응답), welcome의 features로 지원 여부 알림
+export const REQ_ACK_ID     = 0x06;
+export const FEATURE_REQ_ID = "req_id";
+export const FEATURE_SUBSCRIBE = "subscribe"; // 메타데이터 구독 (subscribe/unsubscribe, metadata_patch 푸시)
+// 바이너리 푸시: {"cmd":"bin_hello","formats":["msgpack"]}로 요청한 연결에만 PUSH_BIN 전송
+// (응답 bin_keys의 cmd별 키 사전 사용), 바디는 PUSH_JSON과 같은 size(4B) + payload
+export const PUSH_BIN      = 0x07;
+export const FEATURE_BIN   = "bin";
+export const BIN_FORMAT_MSGPACK = "msgpack";
+
 // 상태코드
 export const SUCCESS                 = 0;
 export const ERR_CHECKCODE_MISMATCH  = 1;
@@ -56,6 +67,12 @@ export function buildJsonPacket(code, obj) {
   return Buffer.concat([buildHeader(code), size, body]);
 }
 
+export function buildBinPacket(code, body) {
+  const size = Buffer.allocUnsafe(4);
+  size.writeUInt32LE(body.length, 0);
+  return Buffer.concat([buildHeader(code), size, body]);
+}
+
 // REQ_ACK 응답 바디: <IB
 export function buildAckPacketFor(reqCode, status) {
   const header = buildHeader(REQ_ACK);
@@ -65,6 +82,29 @@ export function buildAckPacketFor(reqCode, status) {
   return Buffer.concat([header, body]);
 }
 
+// REQ_ACK_ID 응답 바디: <IIB (req_code, req_id, status)
+export function buildAckIdPacketFor(reqCode, reqId, status) {
+  const header = buildHeader(REQ_ACK_ID);
+  const body = Buffer.allocUnsafe(9);
+  body.writeUInt32LE(reqCode, 0);
+  body.writeUInt32LE(reqId, 4);
+  body.writeUInt8(status, 8);
+  return Buffer.concat([header, body]);
+}
+
+// 요청 ID가 있으면 REQ_ACK_ID, 없으면 기존 REQ_ACK
+export function buildRequestAck(reqCode, reqId, status) {
+  return reqId === null || reqId === undefined
+    ? buildAckPacketFor(reqCode, status)
+    : buildAckIdPacketFor(reqCode, reqId, status);
+}
+
+// 요청 ID 확인 (uint32 정수만 인정)
+export function parseRequestId(obj) {
+  const id = obj?.req_id;
+  return Number.isInteger(id) && id >= 0 && id <= 0xFFFFFFFF ? id : null;
+}
+
 // PUSH_STATUS/ALERT 바디: status(1) + reserved(15)
 export function buildPushStatusPacket(status) {
   const header = buildHeader(PUSH_STATUS);
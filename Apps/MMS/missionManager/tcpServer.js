@@ -21,6 +21,7 @@ import {
   IMG_JPG, IMG_PNG, IMG_BMP,
   buildHeader, buildJsonPacket, buildAckPacketFor,
   buildPushStatusPacket, buildPushAlertPacket,
+  FEATURE_REQ_ID, FEATURE_SUBSCRIBE, buildRequestAck, parseRequestId,
 } from "./tcpProtocol.js";
 import { deepMerge, getByPath } from "./deepMerge.js";
 
@@ -111,6 +112,12 @@ export class TcpServer {
 
     // 부팅 시각
     this.bootTsSec = Math.floor(Date.now() / 1000);
+
+    // 메타데이터 구독 (구독 키의 변경분만 JSON Patch로 푸시)
+    this.subscriptions = new Map(); // socket -> { writer, keys: Set<string> }
+    this.subSnapshots = new Map();  // 구독 키 -> 마지막으로 푸시한 값(복사본)
+    this.metadataRev = 0;
+    this.notifyTimer = null;
   }
 
   // === 시간 유틸 ===
@@ -166,6 +173,7 @@ export class TcpServer {
       return { ok: false, mode: merge ? "merge" : "replace", path: file };
     }
     const json = JSON.parse(fs.readFileSync(file, "utf8"));
+    this.notifyMetadataChanged();
     if (merge) {
       deepMerge(this.metadataJson, json);
       return { ok: true, mode: "merge", path: file };
@@ -186,6 +194,95 @@ export class TcpServer {
     return { ok: true, path: file };
   }
 
+  // ====== 메타데이터 구독 ======
+  #readKey(key) {
+    const v = key.includes(".") ? getByPath(this.metadataJson, key) : this.metadataJson?.[key];
+    return v === undefined ? null : JSON.parse(JSON.stringify(v));
+  }
+
+  // "robot_1.status" => "/robot_1/status" (JSON Pointer)
+  #keyToPointer(key) {
+    return "/" + key.split(".").map(p => p.replace(/~/g, "~0").replace(/\//g, "~1")).join("/");
+  }
+
+  // prev -> next 변경분을 JSON Patch 연산으로 (객체는 키 단위 재귀, 배열/값은 통째로 replace)
+  #diff(prev, next, pointer, ops) {
+    const isObj = v => v && typeof v === "object" && !Array.isArray(v);
+    if (isObj(prev) && isObj(next)) {
+      for (const k of Object.keys(prev)) {
+        if (!(k in next)) ops.push({ op: "remove", path: `${pointer}/${k.replace(/~/g, "~0").replace(/\//g, "~1")}` });
+      }
+      for (const [k, v] of Object.entries(next)) {
+        const p = `${pointer}/${k.replace(/~/g, "~0").replace(/\//g, "~1")}`;
+        if (!(k in prev)) ops.push({ op: "add", path: p, value: v });
+        else this.#diff(prev[k], v, p, ops);
+      }
+      return;
+    }
+    if (JSON.stringify(prev) !== JSON.stringify(next)) ops.push({ op: "replace", path: pointer, value: next });
+  }
+
+  /**
+   * 구독 등록 (보류 중인 변경분을 먼저 푸시한 뒤 현재 값 반환)
+   * @returns {Object<string, any>} key -> 현재 값
+   */
+  subscribeMetadata(socket, writer, keys) {
+    if (this.notifyTimer) {
+      clearImmediate(this.notifyTimer);
+      this.#flushMetadataChanges();
+    }
+    let sub = this.subscriptions.get(socket);
+    if (!sub) {
+      sub = { writer, keys: new Set() };
+      this.subscriptions.set(socket, sub);
+    }
+    const data = {};
+    for (const key of keys) {
+      sub.keys.add(key);
+      if (!this.subSnapshots.has(key)) this.subSnapshots.set(key, this.#readKey(key));
+      data[key] = this.subSnapshots.get(key);
+    }
+    return data;
+  }
+
+  /** 구독 해제 (keys 생략 시 소켓의 모든 구독) */
+  unsubscribeMetadata(socket, keys = null) {
+    const sub = this.subscriptions.get(socket);
+    if (!sub) return;
+    for (const key of keys ?? [...sub.keys]) sub.keys.delete(key);
+    if (!sub.keys.size) this.subscriptions.delete(socket);
+
+    const inUse = new Set();
+    for (const s of this.subscriptions.values()) for (const k of s.keys) inUse.add(k);
+    for (const key of [...this.subSnapshots.keys()]) if (!inUse.has(key)) this.subSnapshots.delete(key);
+  }
+
+  /** metadataJson 변경 알림 (TCP/HTTP 변경 후 호출, 같은 틱의 변경은 한 번에 푸시) */
+  notifyMetadataChanged() {
+    if (this.notifyTimer || !this.subSnapshots.size) return;
+    this.notifyTimer = setImmediate(() => this.#flushMetadataChanges());
+  }
+
+  #flushMetadataChanges() {
+    this.notifyTimer = null;
+    const now_time = this.#currentTimeString();
+    const elapsed_time = this.#elapsedTimeString();
+    for (const [key, prev] of this.subSnapshots) {
+      const next = this.#readKey(key);
+      const patch = [];
+      this.#diff(prev, next, this.#keyToPointer(key), patch);
+      if (!patch.length) continue;
+      this.subSnapshots.set(key, next);
+
+      const packet = buildJsonPacket(PUSH_JSON, {
+        cmd: "metadata_patch", key, rev: ++this.metadataRev, patch, now_time, elapsed_time,
+      });
+      for (const sub of this.subscriptions.values()) {
+        if (sub.keys.has(key)) sub.writer.send(packet).catch(() => { });
+      }
+    }
+  }
+
   get state() {
     return {
       ip: this.ip,
@@ -193,6 +290,7 @@ export class TcpServer {
       timeoutMs: this.timeoutMs,
       version: this.version,
       clients: this.sockets.size,
+      subscribers: this.subscriptions.size,
       banks: this.imageBank.size,
     };
   }
@@ -241,10 +339,14 @@ export class TcpServer {
     const closeWithLog = () => {
       try { socket.destroy(); } catch { }
       this.sockets.delete(socket);
+      this.unsubscribeMetadata(socket);
       console.log(`[TCP] closed: ${addr}`);
     };
 
-    socket.on("close", () => this.sockets.delete(socket));
+    socket.on("close", () => {
+      this.sockets.delete(socket);
+      this.unsubscribeMetadata(socket);
+    });
 
     try {
       // welcome push
@@ -253,6 +355,7 @@ export class TcpServer {
         cmd: "welcome",
         version: this.version,
         server_time: Math.floor(Date.now() / 1000),
+        features: [FEATURE_REQ_ID, FEATURE_SUBSCRIBE], // 요청 ID 확장 / 메타데이터 구독 지원
         id: nextId(),
       })); // 원본 흐름 유지 :contentReference[oaicite:2]{index=2}
 
@@ -366,14 +469,43 @@ export class TcpServer {
             throw e;
           }
 
+          // 요청 ID 확장: req_id가 있으면 ACK/데이터 응답에 같은 ID를 실어 보냄 (클라이언트 동시 요청 구분)
+          let reqId = null;
+          const ack = (status) => writer.send(buildRequestAck(requestCode, reqId, status));
+          const reply = (msg) => writer.send(buildJsonPacket(PUSH_JSON, reqId === null ? msg : { ...msg, req_id: reqId }));
+
           try {
             const obj = JSON.parse(body.toString("utf8"));
             if (typeof obj !== "object" || Array.isArray(obj)) throw new Error("JSON root must be object");
+            reqId = parseRequestId(obj);
 
             const cmd = String(obj.cmd || "").toLowerCase();
             if (cmd === "append") {
               const data = (typeof obj.data === "object" && obj.data) ? obj.data : {};
               deepMerge(this.metadataJson, data);
+              this.notifyMetadataChanged();
+            } else if (cmd === "subscribe") {
+              // 구독 키(점표기)의 현재 값을 응답하고, 이후 변경분만 metadata_patch로 푸시
+              const keys = (Array.isArray(obj.keys) ? obj.keys : [obj.key]).filter(k => typeof k === "string" && k);
+              if (!keys.length) {
+                await ack(ERR_INVALID_PARAMETER);
+                continue;
+              }
+              const data = this.subscribeMetadata(socket, writer, keys);
+              await reply({
+                cmd: "metadata_snapshot",
+                keys,
+                data,
+                rev: this.metadataRev,
+                now_time: this.#currentTimeString(),
+                elapsed_time: this.#elapsedTimeString()
+              });
+              continue;
+            } else if (cmd === "unsubscribe") {
+              const keys = Array.isArray(obj.keys) ? obj.keys : (obj.key ? [obj.key] : null);
+              this.unsubscribeMetadata(socket, keys);
+              await ack(SUCCESS);
+              continue;
             } else if (cmd === "get_all") {
               const snapshot = JSON.parse(JSON.stringify(this.metadataJson));
 
@@ -381,12 +513,12 @@ export class TcpServer {
               const now_time = this.#currentTimeString();
               const elapsed_time = this.#elapsedTimeString();
 
-              await writer.send(buildJsonPacket(PUSH_JSON, {
+              await reply({
                 cmd: "all_metadata",
                 data: snapshot,
                 now_time,
                 elapsed_time
-              }));
+              });
               continue;
             } else if (cmd === "get_item") {
               const key = String(obj.key || "");
@@ -398,14 +530,14 @@ export class TcpServer {
               const now_time = this.#currentTimeString();
               const elapsed_time = this.#elapsedTimeString();
 
-              await writer.send(buildJsonPacket(PUSH_JSON, {
+              await reply({
                 cmd: "item_metadata",
                 key,
                 token,
                 value,
                 now_time,       // "yyyy-MM-dd hh:mm:ss"
                 elapsed_time    // "HH:MM:SS" (서버 시작 이후)
-              }));
+              });
               // await writer.send(buildJsonPacket(PUSH_JSON, { cmd: "item_metadata", key, value, token }));
 
               continue;
@@ -415,7 +547,7 @@ export class TcpServer {
               const token = obj.token;
 
               if (!key) {
-                await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_PARAMETER));
+                await ack(ERR_INVALID_PARAMETER);
                 continue;
               }
 
@@ -432,9 +564,10 @@ export class TcpServer {
               } else {
                 this.metadataJson[key] = value;
               }
+              this.notifyMetadataChanged();
 
               // 1) 요청에 대한 ACK (클라이언트의 send_json()이 기다림)
-              await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+              await ack(SUCCESS);
 
               // 2) (선택) 에코/브로드캐스트용 PUSH_JSON
               //    UI 동기화/다중 클라이언트 갱신에 유용
@@ -450,7 +583,7 @@ export class TcpServer {
               for (const [bId, e] of this.imageBank.entries()) {
                 banks.push({ bank_id: bId, img_type: e.type, img_size: e.size, img_seq: e.seq, ts: Math.floor(e.ts ?? Date.now() / 1000) });
               }
-              await writer.send(buildJsonPacket(PUSH_JSON, { cmd: "bank_list", banks }));
+              await reply({ cmd: "bank_list", banks });
               continue;
             } else if (cmd === "get_bank_info") {
               const bId = Number(obj.bank_id ?? -1);
@@ -458,24 +591,24 @@ export class TcpServer {
               const msg = e
                 ? { cmd: "bank_info", bank_id: bId, exists: true, img_type: e.type, img_size: e.size, img_seq: e.seq, ts: Math.floor(e.ts ?? Date.now() / 1000) }
                 : { cmd: "bank_info", bank_id: bId, exists: false };
-              await writer.send(buildJsonPacket(PUSH_JSON, msg));
+              await reply(msg);
               continue;
             } else if (cmd === "clear_bank") {
               const bId = Number(obj.bank_id ?? -1);
               this.imageBank.delete(bId);
-              await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+              await ack(SUCCESS);
               continue;
             } else {
-              await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_PARAMETER));
+              await ack(ERR_INVALID_PARAMETER);
               continue;
             }
           } catch (e) {
             console.warn(`[TCP][WARN] invalid JSON: ${e.message}`);
-            await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_FORMAT));
+            await ack(ERR_INVALID_FORMAT);
             continue;
           }
 
-          await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+          await ack(SUCCESS);
           continue;
         }
 
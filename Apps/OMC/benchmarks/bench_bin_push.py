@@ -0,0 +1,75 @@
+"""
+filename: bench_bin_push.py
+
+robot_update 푸시 PUSH_JSON vs PUSH_BIN(MessagePack + 키 사전) 바디 크기 / 디코딩 벤치마크
+- 메시지: RBS 시뮬레이터 Robot.toJSON() 형태
+- legacy : json.loads(body.decode("utf-8")) (기존 구현 그대로)
+- json   : network.json_codec 백엔드별 (설치된 것만)
+- bin    : network.bin_codec (msgpack 설치 시)
+
+실행: (Apps/OMC 폴더에서) python benchmarks/bench_bin_push.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from network.bin_codec import BinCodec, bin_available
+from network.json_codec import available_codecs, create_codec
+
+N = 100_000
+REPEAT = 5
+
+ROBOT_UPDATE = {
+    "cmd": "robot_update",
+    "data": {
+        "id": 1, "x": 12.345678901, "y": -3.21098765, "angle": 123.456789,
+        "mode": "manual", "mission": "stop",
+        "wheelbase": 1.2, "wheelRadius": 0.3, "steerLimitDeg": 30, "maxWheelRPM": 300,
+        "WheelSpeed": 120, "WheelAngle": 5, "WheelOmega": 0.12, "steerDeg": 4.9876543,
+        "v": 1.23456789, "vx": 1.1234567, "vy": 0.234567,
+        "longitude": 129.414623456, "latitude": 36.121454567,
+        "originLon": 129.41462, "originLat": 36.12145, "metersPerDeg": 111320,
+        "battPercent": 83.7, "battTempC": 32.4, "battState": 0, "battHealth": "normal",
+    },
+}
+
+
+def _rate(label: str, fn) -> float:
+    """ REPEAT회 중 가장 빠른 실행 기준 처리율 (스케줄링 노이즈 제거) """
+    best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+    rate = N / best
+    print(f"  {label:<36s} {rate:>12,.0f} msgs/sec ({best / N * 1e6:.2f} us/msg)")
+    return rate
+
+
+def main():
+    json_body = json.dumps(ROBOT_UPDATE, separators=(",", ":")).encode("utf-8")  # 서버 JSON.stringify와 같은 형식
+    print(f"[size] PUSH_JSON body {len(json_body)} B")
+    bin_codec = None
+    if bin_available():
+        bin_codec = BinCodec({"robot_update": list(ROBOT_UPDATE["data"])})
+        bin_body = bin_codec.encode(ROBOT_UPDATE)
+        assert bin_codec.decode(bin_body) == ROBOT_UPDATE
+        # 키 사전과 길이가 같은 원래 배열 data는 값 배열로 오인하지 않아야 함
+        plain = {"cmd": "robot_update", "data": list(range(len(ROBOT_UPDATE["data"])))}
+        assert bin_codec.decode(bin_codec.encode(plain)) == plain
+        print(f"[size] PUSH_BIN  body {len(bin_body)} B  -> x{len(json_body) / len(bin_body):.2f} smaller")
+    else:
+        print("[size] PUSH_BIN  (msgpack 미설치 - 생략)")
+
+    print("[decode] robot_update 푸시 바디 -> dict")
+    base = _rate("legacy json.loads(body.decode())", lambda: [json.loads(json_body.decode("utf-8")) for _ in range(N)])
+    for name in available_codecs():
+        codec = create_codec(name)
+        rate = _rate(f"PUSH_JSON codec {name}", lambda: [codec.decode(json_body) for _ in range(N)])
+        print(f"    -> x{rate / base:.2f}")
+    if bin_codec is not None:
+        rate = _rate("PUSH_BIN msgpack + key dict", lambda: [bin_codec.decode(bin_body) for _ in range(N)])
+        print(f"    -> x{rate / base:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+filename: bench_detection_overlay.py
+
+감지 결과 오버레이 벤치마크 (1920x1080 프레임)
+- legacy  : 기존 draw_detections 그대로 (프레임 복사 + 감지마다 rectangle/getTextSize/putText)
+- renderer: DetectionOverlayRenderer.draw (복사 없이 polylines 1회 + 캐시된 레이블 스프라이트)
+- legacy 경로는 update_main_image의 추가 복사(cv_img.copy())도 포함하여 비교
+
+실행: (Apps/OMC 폴더에서) python benchmarks/bench_detection_overlay.py
+"""
+import os
+import random
+import sys
+import timeit
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dectector.detection_overlay import DetectionOverlayRenderer
+
+REPEAT = 7
+NUMBER = 20
+CLASSES = ["boat", "person", "buoy", "ship", "bird"]
+
+
+# ---- 기존(baseline) 구현 ----
+def _legacy_draw_detections(image, detections):
+    if not detections:
+        return image
+    result_image = image.copy()
+    for detection in detections:
+        box = detection['box']
+        x1, y1, x2, y2 = map(int, box)
+        name = detection['name']
+        confidence = detection['confidence']
+        cv2.rectangle(result_image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        label = f"{name}: {confidence:.2f}"
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.6
+        thickness = 2
+        (text_width, text_height), baseline = cv2.getTextSize(label, font, font_scale, thickness)
+        cv2.rectangle(result_image, (x1, y1 - text_height - 10),
+                      (x1 + text_width, y1), (0, 255, 0), -1)
+        cv2.putText(result_image, label, (x1, y1 - 5),
+                    font, font_scale, (0, 0, 0), thickness)
+    return result_image
+
+
+def make_detections(count: int, width: int = 1920, height: int = 1080):
+    rng = random.Random(count)
+    detections = []
+    for _ in range(count):
+        x1, y1 = rng.uniform(0, width - 50), rng.uniform(0, height - 50)
+        detections.append({
+            "box": [x1, y1, x1 + rng.uniform(20, 200), y1 + rng.uniform(20, 200)],
+            "name": rng.choice(CLASSES),
+            "confidence": rng.uniform(0.3, 1.0),
+        })
+    return detections
+
+
+def _ms(fn) -> float:
+    """ REPEAT회 중 가장 빠른 실행 기준 1회 소요 시간 (ms) """
+    return min(timeit.repeat(fn, number=NUMBER, repeat=REPEAT)) / NUMBER * 1000.0
+
+
+def main():
+    frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    renderer = DetectionOverlayRenderer()
+    canvas = frame.copy()
+
+    print(f"{'boxes':>6} | {'legacy (copy x2)':>17} | {'renderer in place':>17} | {'speedup':>7}")
+    for count in (10, 100, 300, 1000):
+        detections = make_detections(count)
+        renderer.draw(canvas, detections)  # 스프라이트 캐시 워밍업 (스트림에서는 첫 프레임 이후 상태)
+        legacy = _ms(lambda: _legacy_draw_detections(frame.copy(), detections))
+        fast = _ms(lambda: renderer.draw(canvas, detections))
+        print(f"{count:6d} | {legacy:14.3f} ms | {fast:14.3f} ms | {legacy / fast:6.1f}x")
+    print(f"cached sprites: {len(renderer._sprites)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+filename: bench_json_codec.py
+
+TCP Agent JSON 바디 인코딩/디코딩 마이크로 벤치마크 (robot_update 푸시 / set_item 요청)
+- legacy : json.dumps(obj).encode("utf-8") / json.loads(body.decode("utf-8")) (기존 구현 그대로)
+- codec  : network.json_codec 백엔드별 (설치된 것만: msgspec / orjson / json)
+- ROBOT_UPDATE: RBS 시뮬레이터가 실제로 보낸 메시지 (Robot.toJSON(), 2초 주행 후)
+  msgspec 설치 시 decode_typed()가 RobotUpdate 스키마로 디코딩되는지 먼저 확인 (dict 대체 경로로 빠지면 실패)
+
+실행: (Apps/OMC 폴더에서) python benchmarks/bench_json_codec.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from network.json_codec import RobotUpdate, available_codecs, create_codec, to_builtins
+
+N = 100_000
+REPEAT = 5
+
+ROBOT_UPDATE = {
+    "cmd": "robot_update",
+    "data": {
+        "id": 1, "x": 3.724343998835245, "y": 0.5023337168755729, "angle": 15.685790268083109,
+        "mode": "manual", "mission": "stop",
+        "wheelbase": 1.2, "wheelRadius": 0.15, "steerLimitDeg": 35, "maxWheelRPM": 300,
+        "WheelSpeed": 120, "WheelAngle": 5, "WheelOmega": 2, "steerDeg": 5.000000000000002,
+        "v": 1.8472564803107983, "vx": 1.8170731017153807, "vy": 0.5013012342041611,
+        "longitude": 129.4146614180144, "latitude": 36.12145451251992,
+        "originLon": 129.41462, "originLat": 36.12145, "metersPerDeg": 111320,
+        "battPercent": 99.1, "battTempC": 29.6, "battState": 0, "battHealth": "normal",
+    },
+}
+SET_ITEM = {"cmd": "set_item", "key": "robot_1.robot_status_data", "value": ROBOT_UPDATE["data"], "req_id": 42}
+
+
+def _rate(label: str, fn) -> float:
+    """ REPEAT회 중 가장 빠른 실행 기준 처리율 (스케줄링 노이즈 제거) """
+    best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+    rate = N / best
+    print(f"  {label:<36s} {rate:>12,.0f} msgs/sec")
+    return rate
+
+
+def bench_encode():
+    print("[encode] set_item 요청 바디 생성")
+    base = _rate("legacy json.dumps().encode()", lambda: [json.dumps(SET_ITEM).encode("utf-8") for _ in range(N)])
+    for name in available_codecs():
+        codec = create_codec(name)
+        rate = _rate(f"codec {name}", lambda: [codec.encode(SET_ITEM) for _ in range(N)])
+        print(f"    -> x{rate / base:.2f}")
+
+
+def check_typed_schema():
+    """ 실제 robot_update가 스키마 검증을 통과하고 dict 경로와 같은 값으로 복원되는지 확인 """
+    if "msgspec" not in available_codecs():
+        print("[check] msgspec 미설치 - 스키마 확인 생략")
+        return
+    body = json.dumps(ROBOT_UPDATE, separators=(",", ":")).encode("utf-8")  # 서버 JSON.stringify와 같은 형식
+    message = create_codec("msgspec").decode_typed(body)
+    assert isinstance(message, RobotUpdate), f"robot_update가 스키마 밖으로 디코딩됨: {type(message)}"
+    assert to_builtins(message) == ROBOT_UPDATE, "RobotStatus 필드가 Robot.toJSON()과 다름"
+    print("[check] robot_update -> RobotUpdate OK")
+
+
+def bench_decode():
+    print("[decode] robot_update 푸시 바디 파싱")
+    body = json.dumps(ROBOT_UPDATE).encode("utf-8")
+    base = _rate("legacy json.loads(body.decode())", lambda: [json.loads(body.decode("utf-8")) for _ in range(N)])
+    for name in available_codecs():
+        codec = create_codec(name)
+        rate = _rate(f"codec {name}", lambda: [codec.decode(body) for _ in range(N)])
+        print(f"    -> x{rate / base:.2f}")
+        if name == "msgspec":
+            _rate("codec msgspec (typed Struct)", lambda: [codec.decode_typed(body) for _ in range(N)])
+
+
+if __name__ == "__main__":
+    print(f"available: {available_codecs()}")
+    check_typed_schema()
+    bench_encode()
+    bench_decode()
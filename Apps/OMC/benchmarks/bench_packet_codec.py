@@ -0,0 +1,106 @@
+"""
+filename: bench_packet_codec.py
+
+감시장비 패킷 빌드/파싱 마이크로 벤치마크
+- legacy : 포맷 문자열 struct.pack/unpack + bytes 결합 + dict 생성 (기존 구현 그대로)
+- 송신   : 헤더만 pack, 페이로드는 결합 없이 sendmsg iovec으로 (CommandWriter 송신 경로)
+- 수신   : PacketCodec.decode_motor_camera_info NamedTuple 레코드
+
+실행: (Apps/OMC 폴더에서) python benchmarks/bench_packet_codec.py
+"""
+import os
+import sys
+import struct
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from observer.packet_protocol_observer import (
+    PacketProtocol, PacketCodec,
+    MotorMode, MotorPanControl, MotorTiltControl,
+)
+
+N = 200_000
+REPEAT = 5
+BATCH = 32  # CommandWriter.MAX_BATCH
+
+
+# ---- 기존(baseline) 구현: 헤더 pack + bytes 결합, 포맷 문자열 unpack + dict ----
+def _legacy_build_packet(content_type_id: int, sequence_num: int, data: bytes = b'') -> bytes:
+    header = struct.pack(PacketProtocol.HEADER_FORMAT, content_type_id, len(data), sequence_num)
+    return header + data
+
+
+def _legacy_parse(data: bytes) -> dict:
+    if len(data) != 8:
+        return {"error": "Invalid length"}
+    pan, tilt, zoom, mode = struct.unpack('<h h H H', data)
+    return {
+        "pan_angle": pan / 100.0,
+        "tilt_angle": tilt / 100.0,
+        "eo_zoom_position": zoom,
+        "drive_mode": mode,
+    }
+
+
+def _rate(label: str, fn) -> float:
+    """ REPEAT회 중 가장 빠른 실행 기준 처리율 (스케줄링 노이즈 제거) """
+    best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+    rate = N / best
+    print(f"  {label:<36s} {rate:>12,.0f} packets/sec")
+    return rate
+
+
+def bench_build():
+    print(f"[build] 모터 구동명령 패킷 {BATCH}개 송신 배치 생성 (헤더 + 16 bytes)")
+    args = (MotorMode.SPEED_CONTROL, MotorPanControl.LEFT, 15.0, 0.0,
+            MotorTiltControl.STOP, 0.0, 0.0)
+    payload = PacketProtocol.build_motor_control_payload(*args)
+    rounds = N // BATCH
+
+    def legacy():
+        for r in range(rounds):
+            b''.join([_legacy_build_packet(0x3021, r + i, payload) for i in range(BATCH)])
+
+    def parts():
+        pack_header = PacketProtocol.HEADER_STRUCT.pack
+        for r in range(rounds):
+            iov = []
+            for i in range(BATCH):
+                iov.append(pack_header(0x3021, len(payload), r + i))
+                iov.append(payload)
+
+    before = _rate("build_packet + b''.join", legacy)
+    after = _rate("헤더 pack + 페이로드 iovec (sendmsg)", parts)
+    print(f"  -> x{after / before:.2f}")
+
+
+def bench_parse():
+    print("[parse] 모터 및 카메라 구동 정보 파싱 (8 bytes)")
+    data = struct.pack('<h h H H', 1234, -250, 10, 1)
+    view = memoryview(data)
+
+    def legacy():
+        for _ in range(N):
+            _legacy_parse(data)
+
+    def parse_dict():
+        parse = PacketProtocol.parse_motor_camera_info
+        for _ in range(N):
+            parse(view)
+
+    def decode_motor():
+        decode = PacketCodec.decode_motor_camera_info
+        for _ in range(N):
+            decode(view)
+
+    before = _rate("legacy struct.unpack + dict", legacy)
+    after = _rate("parse_motor_camera_info (dict)", parse_dict)
+    print(f"  -> x{after / before:.2f}")
+    after = _rate("decode_motor_camera_info (record)", decode_motor)
+    print(f"  -> x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    bench_build()
+    bench_parse()
@@ -0,0 +1,198 @@
+"""
+filename: load_multi_robot_transport.py
+
+MultiRobotTransport 부하 테스트 (로컬 가짜 감시장비 서버 N대)
+- 가짜 서버: 스레드 1개(selectors)로 로봇 N대 분량의 리슨 소켓을 열고
+  접속한 클라이언트에게 모터 및 카메라 구동 정보(0x308x)를 --rate Hz로 전송,
+  Heartbeat(0x305x) 명령에는 응답(ACK) 전송
+- 클라이언트: MultiRobotTransport 스레드 1개로 N대 연결, 100ms마다 전 로봇에 Heartbeat/모터 명령 송신
+- 결과: 연결 수, 로봇별/전체 수신 프레임 처리율, Heartbeat 왕복 수, 프로세스 CPU 시간
+
+실행: (Apps/OMC 폴더에서) python benchmarks/load_multi_robot_transport.py --robots 12 --rate 200 --duration 5
+"""
+import argparse
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+from observer.packet_protocol_observer import (
+    PacketProtocol, CommandType, ResponseType, MotorMode, MotorPanControl, MotorTiltControl
+)
+from observer.multi_robot_transport_observer import MultiRobotTransport
+
+HEADER = PacketProtocol.HEADER_STRUCT
+MOTOR_INFO = PacketProtocol.MOTOR_CAMERA_INFO_STRUCT
+
+
+class FakeGimbalServers(threading.Thread):
+    """ 로봇 N대 분량의 가짜 감시장비 서버 (스레드 1개) """
+    TICK = 0.01  # 10ms마다 누적된 프레임을 한 번에 전송
+
+    def __init__(self, robot_count: int, rate_hz: float):
+        super().__init__(daemon=True)
+        self.rate_hz = rate_hz
+        self.selector = selectors.DefaultSelector()
+        self.ports = {}
+        self.clients = {}      # sock -> robot_id
+        self.seq = {}
+        self.frames_due = {}   # robot_id -> 누적 전송 예정 프레임 (소수 포함)
+        self.commands = {}     # robot_id -> 수신 명령 수
+        self.rx_buffers = {}
+        self._is_running = True
+        for robot_id in range(1, robot_count + 1):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(1)
+            listener.setblocking(False)
+            self.ports[robot_id] = listener.getsockname()[1]
+            self.selector.register(listener, selectors.EVENT_READ, ("listen", robot_id))
+
+    def stop(self):
+        self._is_running = False
+
+    def run(self):
+        last = time.monotonic()
+        while self._is_running:
+            for key, _ in self.selector.select(self.TICK):
+                kind, robot_id = key.data
+                if kind == "listen":
+                    conn, _ = key.fileobj.accept()
+                    conn.setblocking(False)
+                    self.clients[conn] = robot_id
+                    self.rx_buffers[conn] = bytearray()
+                    self.frames_due[robot_id] = 0.0
+                    self.selector.register(conn, selectors.EVENT_READ, ("client", robot_id))
+                else:
+                    self._on_client_readable(key.fileobj, robot_id)
+
+            now = time.monotonic()
+            elapsed, last = now - last, now
+            for conn, robot_id in list(self.clients.items()):
+                self.frames_due[robot_id] += elapsed * self.rate_hz
+                count = int(self.frames_due[robot_id])
+                if count:
+                    self.frames_due[robot_id] -= count
+                    self._send_motor_frames(conn, robot_id, count)
+
+    def _send_motor_frames(self, conn, robot_id: int, count: int):
+        content_id = ResponseType.RES_MOTOR_CAMERA_INFO + robot_id
+        chunk = bytearray()
+        for _ in range(count):
+            seq = self.seq.get(robot_id, 0) + 1
+            self.seq[robot_id] = seq
+            chunk += HEADER.pack(content_id, MOTOR_INFO.size, seq)
+            chunk += MOTOR_INFO.pack(seq % 18000, -(seq % 2000), 1, 1)
+        self._send(conn, bytes(chunk))
+
+    def _on_client_readable(self, conn, robot_id: int):
+        try:
+            data = conn.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self.selector.unregister(conn)
+            self.clients.pop(conn, None)
+            conn.close()
+            return
+        buf = self.rx_buffers[conn]
+        buf += data
+        offset = 0
+        while len(buf) - offset >= HEADER.size:
+            content_id, data_len, seq = HEADER.unpack_from(buf, offset)
+            if len(buf) - offset < HEADER.size + data_len:
+                break
+            offset += HEADER.size + data_len
+            self.commands[robot_id] = self.commands.get(robot_id, 0) + 1
+            if content_id & 0xFFF0 == CommandType.CMD_HEARTBEAT:
+                self._send(conn, HEADER.pack(ResponseType.RES_HEARTBEAT_ACK + robot_id, 0, seq))
+        del buf[:offset]
+
+    def _send(self, conn, data: bytes):
+        try:
+            conn.sendall(data)
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--robots", type=int, default=12, help="로봇(가짜 서버) 수 (1~15)")
+    parser.add_argument("--rate", type=float, default=200.0, help="로봇당 모터 정보 전송률 (Hz)")
+    parser.add_argument("--duration", type=float, default=5.0, help="측정 시간 (초)")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    servers = FakeGimbalServers(args.robots, args.rate)
+    servers.start()
+
+    transport = MultiRobotTransport()
+    frames = {robot_id: 0 for robot_id in servers.ports}
+    batches = {robot_id: 0 for robot_id in servers.ports}
+    heartbeats = {robot_id: 0 for robot_id in servers.ports}
+    connected = set()
+
+    def on_batch(robot_id, arr):
+        frames[robot_id] += len(arr)
+        batches[robot_id] += 1
+
+    def on_heartbeat(robot_id):
+        heartbeats[robot_id] += 1
+
+    def on_status(robot_id, ok):
+        (connected.add if ok else connected.discard)(robot_id)
+
+    transport.received_motor_info_batch.connect(on_batch)
+    transport.received_heartbeat.connect(on_heartbeat)
+    transport.connection_status.connect(on_status)
+
+    motor_payload = PacketProtocol.build_motor_control_payload(
+        MotorMode.SPEED_CONTROL, MotorPanControl.LEFT, 10.0, 0.0, MotorTiltControl.STOP, 0.0, 0.0
+    )
+    heartbeat_payload = PacketProtocol.build_heartbeat_payload()
+
+    def send_commands():
+        for robot_id in connected:
+            transport.send_command(robot_id, CommandType.CMD_HEARTBEAT, heartbeat_payload)
+            transport.send_command(robot_id, CommandType.CMD_MOTOR_CONTROL, motor_payload)
+
+    for robot_id, port in servers.ports.items():
+        transport.connect_robot(robot_id, "127.0.0.1", port)
+
+    command_timer = QTimer()
+    command_timer.timeout.connect(send_commands)
+    command_timer.start(100)
+
+    cpu0 = time.process_time()
+    t0 = time.monotonic()
+    QTimer.singleShot(int(args.duration * 1000), app.quit)
+    app.exec()
+    elapsed = time.monotonic() - t0
+    cpu = time.process_time() - cpu0
+
+    command_timer.stop()
+    transport.stop()
+    servers.stop()
+
+    total_frames = sum(frames.values())
+    print(f"[load] robots={args.robots} rate={args.rate:.0f}Hz duration={elapsed:.1f}s "
+          f"threads={threading.active_count()}")
+    for robot_id in servers.ports:
+        print(f"  robot {robot_id:2d}: frames {frames[robot_id]:7d} ({frames[robot_id] / elapsed:7.1f}/s) "
+              f"batches {batches[robot_id]:6d}  heartbeat ack {heartbeats[robot_id]:4d}  "
+              f"server cmds {servers.commands.get(robot_id, 0):5d}")
+    print(f"  total: {total_frames / elapsed:,.0f} frames/s (expected {args.robots * args.rate:,.0f}/s), "
+          f"connected {len(connected)}/{args.robots}, cpu {cpu / elapsed * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,24 +6,38 @@
 #############################
 
 import asyncio
-import json
 import struct
 from typing import Dict, Optional, Union, Callable
 from pathlib import Path
 import time
+import itertools
+import copy
 from collections import defaultdict
 
 from network.protocol import ServerProtocol, ClientProtocol
+from network.json_patch import apply_patch, get_by_path, set_by_parts
+from network.json_codec import CODEC_STDLIB, JsonCodec, get_codec
+from network.bin_codec import BinCodec, bin_available
 
 class Client:
     def __init__(self, host: str, port: int,
-                 checkcode:int = ServerProtocol.checkcode, timeout: float = 15.0):
+                 checkcode:int = ServerProtocol.checkcode, timeout: float = 15.0,
+                 codec: Optional[JsonCodec] = None, binary: bool = True):
         self.host = host
         self.port = port
         self.checkcode = checkcode
         self.timeout = timeout
-
-        print(f"[CLIENT] initialized for {self.host}:{self.port} with checkcode={self.checkcode}")
+        # [!] JSON 바디 코덱 (msgspec/orjson 설치 시 사용, 없으면 표준 json)
+        self.codec = codec or get_codec()
+        # [!] 바이너리 푸시 (PUSH_BIN/MessagePack): 서버 welcome에 "bin"이 있고 msgpack 설치 시 bin_hello로 협상
+        #     협상 전/실패 시에는 기존 PUSH_JSON 그대로, 푸시 콜백은 두 경우 모두 같은 dict를 받음
+        #     orjson/msgspec 코덱이 있으면 PUSH_JSON 디코딩이 더 빠르므로 표준 json 코덱일 때만 협상
+        #     (benchmarks/bench_bin_push.py: PUSH_BIN 디코딩은 표준 json보다 약 2.3배 빠르지만 orjson/msgspec보다 약 30% 느림)
+        self.binary = binary and bin_available() and self.codec.name == CODEC_STDLIB
+        self.bin_codec: Optional[BinCodec] = None
+        self._bin_task: Optional[asyncio.Task] = None
+
+        print(f"[CLIENT] initialized for {self.host}:{self.port} with checkcode={self.checkcode} (json={self.codec.name})")
 
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
@@ -32,8 +46,19 @@ class Client:
         self._write_lock = asyncio.Lock()
         self._closed = False
 
-        # 요청별 대기자
+        # 요청별 대기자 (요청 ID 미지원 서버: 요청 코드별 큐, 같은 코드 요청은 잠금으로 직렬화)
         self.waiters: Dict[int, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self._code_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # [!] 요청 ID 확장: req_id -> 응답 Future (ACK 상태코드 또는 PUSH_JSON 응답 dict)
+        #     서버 welcome의 features에 "req_id"가 있으면 사용, 같은 연결에서 여러 요청 동시 진행 가능
+        self.req_id_enabled = False
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._req_ids = itertools.count(1)
+        # [!] 메타데이터 구독 미러 (metadata_snapshot/metadata_patch를 수신 루프에서 적용)
+        self.subscribe_enabled = False
+        self.metadata: dict = {}
+        self.metadata_rev = 0
+        self.subscribed_keys = set()
         # item_metadata 토큰별 대기자
         self._item_waiters: Dict[str, asyncio.Queue] = {}
 
@@ -42,6 +67,7 @@ class Client:
         self.on_connection_lost: Optional[Callable[[str], None]] = None
 
         self.on_push_update: Optional[Callable[[dict], None]] = None
+        self.on_metadata_changed: Optional[Callable[[str, object, dict], None]] = None  # (key, value 복사본, 메시지)
 
     def _notify_connect(self, json_info: dict):
         cb = self.on_connection_start
@@ -80,6 +106,9 @@ class Client:
         if self._closed:
             return
         self._closed = True
+        self._fail_pending(ConnectionError("client closed"))
+        if self._bin_task and not self._bin_task.done():
+            self._bin_task.cancel()
         if self._recv_task and not self._recv_task.done():
             self._recv_task.cancel()
             try:
@@ -94,6 +123,30 @@ class Client:
                 pass
         print("[CLIENT] closed")
 
+    def _fail_pending(self, exc: Exception):
+        """ 응답 대기 중인 요청 모두 실패 처리 (연결 종료 시) """
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def _negotiate_bin(self):
+        """ 바이너리 푸시 협상 (응답 bin_keys는 수신 루프에서 적용 - 첫 PUSH_BIN보다 먼저 도착) """
+        try:
+            res = await self.request_json({"cmd": "bin_hello", "formats": [ServerProtocol.BIN_FORMAT_MSGPACK]})
+            if self.bin_codec is None:
+                print(f"[CLIENT][INFO] binary push not accepted (res={res}), using PUSH_JSON")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[CLIENT][WARN] bin_hello failed: {e}, using PUSH_JSON")
+
+    def _next_req_id(self) -> int:
+        while True:
+            req_id = next(self._req_ids) & 0xFFFFFFFF
+            if req_id and req_id not in self._pending:
+                return req_id
+
     async def _read_exactly(self, n: int) -> bytes:
         assert self.reader is not None
         return await asyncio.wait_for(self.reader.readexactly(n), timeout=self.timeout)
@@ -101,12 +154,13 @@ class Client:
     # ---------- 기본 요청 ----------
     async def send_ping(self) -> bool:
 
-        await ClientProtocol.send_ping(
-            writer=self.writer,
-            lock=self._write_lock
-        )
-        
-        status = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_PING].get(), timeout=self.timeout)
+        async with self._code_locks[ServerProtocol.REQ_PING]:
+            await ClientProtocol.send_ping(
+                writer=self.writer,
+                lock=self._write_lock
+            )
+            
+            status = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_PING].get(), timeout=self.timeout)
         return status == ServerProtocol.SUCCESS
 
     # ---------- 이미지 업/다운 ----------
@@ -130,8 +184,9 @@ class Client:
         # 16B header: <B 3x I I I  (img_type, bank_id, img_size, img_seq)
         data_hdr = struct.pack("<B3xIII", img_type, bank_id, len(data), seq)
 
-        await ServerProtocol.send_packet(self.writer, header + data_hdr + data, self._write_lock)
-        status = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_IMG_UP].get(), timeout=self.timeout)
+        async with self._code_locks[ServerProtocol.REQ_IMG_UP]:
+            await ServerProtocol.send_packet(self.writer, header + data_hdr + data, self._write_lock)
+            status = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_IMG_UP].get(), timeout=self.timeout)
         return status == ServerProtocol.SUCCESS
 
 
@@ -139,9 +194,10 @@ class Client:
         header = struct.pack("<II", self.checkcode, ServerProtocol.REQ_IMG_DOWN)
         # 다운로드는 4바이트 bank_id 바디를 동봉
         body = struct.pack("<I", bank_id)
-        await ServerProtocol.send_packet(self.writer, header + body, self._write_lock)
+        async with self._code_locks[ServerProtocol.REQ_IMG_DOWN]:
+            await ServerProtocol.send_packet(self.writer, header + body, self._write_lock)
 
-        res = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_IMG_DOWN].get(), timeout=self.timeout)
+            res = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_IMG_DOWN].get(), timeout=self.timeout)
 
         if isinstance(res, int):
             return None if res != ServerProtocol.SUCCESS else None
@@ -149,9 +205,8 @@ class Client:
         return res  # {"bank_id": int, "type": int, "seq": int, "data": bytes}
 
     # ---------- JSON ----------
-    async def send_json(self, obj: dict) -> bool:
-        
-        body = json.dumps(obj).encode("utf-8")
+    async def _send_json_body(self, obj: dict):
+        body = self.codec.encode(obj)
         if len(body) > (4 * 1024 * 1024):
             raise ValueError("JSON data too large (>4MB)")
 
@@ -159,8 +214,34 @@ class Client:
         size = struct.pack("<I", len(body))
         await ServerProtocol.send_packet(self.writer, header + size + body, self._write_lock)
 
-        status = await asyncio.wait_for(self.waiters[ServerProtocol.REQ_JSON].get(), timeout=self.timeout)
-        return status == ServerProtocol.SUCCESS
+    async def request_json(self, obj: dict, timeout: Optional[float] = None) -> Union[int, dict]:
+        """
+        JSON 요청 후 응답 대기
+        - 요청 ID 지원 서버: obj에 req_id를 붙여 보내고 같은 ID의 응답만 받음 (다른 요청과 동시 진행 가능)
+        - 미지원 서버: REQ_JSON ACK 순서대로 받음 (JSON 요청끼리 직렬화)
+        Returns: ACK 상태코드(int) 또는 데이터 응답(PUSH_JSON dict, get_all/get_item 등)
+        """
+        if self.writer is None:
+            raise ConnectionError("not connected")
+        timeout = self.timeout if timeout is None else timeout
+
+        if not self.req_id_enabled:
+            async with self._code_locks[ServerProtocol.REQ_JSON]:
+                await self._send_json_body(obj)
+                return await asyncio.wait_for(self.waiters[ServerProtocol.REQ_JSON].get(), timeout=timeout)
+
+        req_id = self._next_req_id()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = fut
+        try:
+            await self._send_json_body({**obj, "req_id": req_id})
+            return await asyncio.wait_for(fut, timeout=timeout)
+        finally:
+            self._pending.pop(req_id, None)
+
+    async def send_json(self, obj: dict, timeout: Optional[float] = None) -> bool:
+        res = await self.request_json(obj, timeout)
+        return isinstance(res, dict) or res == ServerProtocol.SUCCESS
     
     async def send_json_append(self, obj: dict) -> bool:
         
@@ -168,26 +249,76 @@ class Client:
 
         return await self.send_json(payload)
 
-    async def request_json_by_key(self, key: str) -> Optional[dict]:
+    async def request_json_by_key(self, key: str, timeout: Optional[float] = None) -> Optional[dict]:
         if self.writer is None:
             raise ConnectionError("not connected")
 
         token = f"item:{time.time_ns()}"  # 요청에 대한 확인을 위한 토큰 생성 , 겹치지않는 값이어야함
-        q: asyncio.Queue = asyncio.Queue()
-        self._item_waiters[token] = q
-
         payload = {"cmd": "get_item", "key": key, "token": token}
-        body = json.dumps(payload).encode("utf-8")
-        header = struct.pack("<II", self.checkcode, ServerProtocol.REQ_JSON)
-        size = struct.pack("<I", len(body))
-        await ServerProtocol.send_packet(self.writer, header + size + body, self._write_lock)
 
+        if self.req_id_enabled:
+            res = await self.request_json(payload, timeout)
+            return res if isinstance(res, dict) else None
+
+        q: asyncio.Queue = asyncio.Queue()
+        self._item_waiters[token] = q
         try:
-            res = await asyncio.wait_for(q.get(), timeout=self.timeout)
+            await self._send_json_body(payload)
+            res = await asyncio.wait_for(q.get(), timeout=self.timeout if timeout is None else timeout)
             return res
         finally:
             self._item_waiters.pop(token, None)
 
+    # ---------- 메타데이터 구독 ----------
+    async def subscribe(self, keys, timeout: Optional[float] = None) -> bool:
+        """
+        메타데이터 키 구독 (점표기 경로, 예: "robot_1")
+        - 응답(metadata_snapshot)으로 self.metadata 미러를 채우고, 이후 서버가 변경분만 metadata_patch로 푸시
+        - 요청 ID/구독 확장을 지원하지 않는 서버면 False (기존 get_item 폴링 사용)
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        if not (self.req_id_enabled and self.subscribe_enabled):
+            return False
+        res = await self.request_json({"cmd": "subscribe", "keys": list(keys)}, timeout)
+        return isinstance(res, dict) and res.get("cmd") == "metadata_snapshot"
+
+    async def unsubscribe(self, keys=None, timeout: Optional[float] = None) -> bool:
+        """ 구독 해제 (keys 생략 시 전체) """
+        if isinstance(keys, str):
+            keys = [keys]
+        payload = {"cmd": "unsubscribe"}
+        if keys is not None:
+            payload["keys"] = list(keys)
+        ok = await self.send_json(payload, timeout)
+        self.subscribed_keys.difference_update(keys if keys is not None else list(self.subscribed_keys))
+        return ok
+
+    def get_metadata(self, key: str, default=None):
+        """ 미러에서 조회 (이벤트 루프 스레드 외부에서는 on_metadata_changed의 복사본 사용 권장) """
+        return get_by_path(self.metadata, key, default)
+
+    def _apply_metadata(self, obj_data: dict):
+        """ metadata_snapshot / metadata_patch를 미러에 반영 후 키별 콜백 """
+        if obj_data.get("cmd") == "metadata_snapshot":
+            data = obj_data.get("data") or {}
+            for key, value in data.items():
+                set_by_parts(self.metadata, key.split("."), value)
+            self.subscribed_keys.update(data)
+            changed = list(data)
+        else:
+            apply_patch(self.metadata, obj_data.get("patch") or [])
+            changed = [obj_data.get("key")]
+        self.metadata_rev = obj_data.get("rev", self.metadata_rev)
+
+        cb = self.on_metadata_changed
+        if cb:
+            for key in changed:
+                try:
+                    cb(key, copy.deepcopy(get_by_path(self.metadata, key)), obj_data)
+                except Exception as e:
+                    print(f"[CLIENT][WARN] on_metadata_changed callback error: {e}")
+
     # ---------- 수신 루프 ----------
     async def _recv_loop(self):
         try:
@@ -203,19 +334,42 @@ class Client:
                     print(f"[CLIENT][WARN] checkcode mismatch: got={r_check}, expected={self.checkcode}")
                     return
 
-                # PUSH_JSON
-                if r_req == ServerProtocol.PUSH_JSON:
+                # PUSH_JSON / PUSH_BIN (바디 형식만 다르고 처리는 동일)
+                if r_req == ServerProtocol.PUSH_JSON or r_req == ServerProtocol.PUSH_BIN:
                     size = struct.unpack("<I", await self._read_exactly(4))[0]
                     body = await self._read_exactly(size) if size > 0 else b""
                     try:
-                        obj_data = json.loads(body.decode("utf-8"))
+                        if r_req == ServerProtocol.PUSH_JSON:
+                            obj_data = self.codec.decode(body)
+                        else:
+                            obj_data = self.bin_codec.decode(body)
                     except Exception:
                         obj_data = {"raw": body[:128].hex()}
 
                     # print(f"[PUSH JSON] {obj_data}")
 
                     if obj_data.get("cmd") == "welcome":
+                        features = obj_data.get("features") or []
+                        self.req_id_enabled = ServerProtocol.FEATURE_REQ_ID in features
+                        self.subscribe_enabled = ServerProtocol.FEATURE_SUBSCRIBE in features
                         self._notify_connect(obj_data)
+                        if (self.binary and ServerProtocol.FEATURE_BIN in features
+                                and ServerProtocol.BIN_FORMAT_MSGPACK in (obj_data.get("bin_formats") or [])):
+                            self._bin_task = asyncio.create_task(self._negotiate_bin())
+
+                    # [!] 바이너리 푸시 키 사전 (이후 PUSH_BIN 디코딩에 사용)
+                    elif obj_data.get("cmd") == "bin_keys" and obj_data.get("format") == ServerProtocol.BIN_FORMAT_MSGPACK:
+                        self.bin_codec = BinCodec(obj_data.get("keys"))
+                        print(f"[CLIENT] binary push enabled ({self.bin_codec.name}, keys={list(self.bin_codec.keys)})")
+
+                    # [!] 구독 미러 갱신 (요청 ID 응답보다 먼저 - subscribe() 반환 시점에 미러가 채워져 있도록)
+                    if obj_data.get("cmd") in ("metadata_snapshot", "metadata_patch"):
+                        self._apply_metadata(obj_data)
+
+                    # [!] 요청 ID 응답 (get_all/get_item 등 데이터 응답), 푸시 콜백에도 그대로 전달
+                    fut = self._pending.get(obj_data.get("req_id"))
+                    if fut is not None and not fut.done():
+                        fut.set_result(obj_data)
 
                     if obj_data.get("cmd") == "item_metadata":
                         token = obj_data.get("token")
@@ -237,7 +391,7 @@ class Client:
                         await ClientProtocol.send_ack(
                             writer=self.writer,
                             checkcode_val=self.checkcode,
-                            req_code=ServerProtocol.PUSH_JSON,
+                            req_code=r_req,
                             status=ServerProtocol.SUCCESS,
                             lock=self._write_lock
                         )
@@ -278,6 +432,18 @@ class Client:
                                 print(f"[CLIENT][INFO] ACK for req={code}, status={status} (no waiter)")
                         continue
 
+                # [!] REQ_ACK_ID (요청 ID 확장 ACK)
+                elif r_req == ServerProtocol.REQ_ACK_ID:
+                    code, req_id, status = struct.unpack("<IIB", await self._read_exactly(9))
+                    if status == ServerProtocol.WARN_TIMEOUT:
+                        print(f"[CLIENT][WARN] server-side timeout warning for req={code} (id={req_id})")
+                    fut = self._pending.get(req_id)
+                    if fut is not None and not fut.done():
+                        fut.set_result(status)
+                    else:
+                        print(f"[CLIENT][INFO] ACK for req={code} id={req_id}, status={status} (no waiter)")
+                    continue
+
                 # PUSH_ALERT
                 elif r_req == ServerProtocol.PUSH_ALERT:
                     body = await self._read_exactly(16)  # status(1) + reserved(15)
@@ -313,3 +479,5 @@ class Client:
             pass
         except Exception as e:
             print(f"[CLIENT][ERROR] recv_loop: {e}")
+        finally:
+            self._fail_pending(ConnectionError("connection closed"))
@@ -34,20 +34,26 @@ class ConfigManager:
             "imageDetectionServer" : {
                 "enable": False,
                 "ip": "localhost",
-                "port": 8085
-                
+                "port": 8085,
+                "transport": "jpeg",  # raw / jpeg / png / shm (서버와 협상, 미지원 시 raw, shm은 같은 호스트 전용)
+                "inputSize": 640      # 모델 입력 크기 (letterbox 축소 전송)
             },
             "isSoundOn": False,
             "fullscreen": True,
             "mmsServer": {
                 "enable": False,
                 "ip": "localhost",
-                "port": 8282
+                "port": 8282,
+                "statusUploadMaxRateHz": 1.0,   # robot_status_data 최대 업로드 빈도
+                "statusUploadPrecision": {      # 실수 필드별 소수 자릿수 ("*" = 기본값), 반올림 후 변경분만 업로드
+                    "*": 3, "latitude": 7, "longitude": 7, "angle": 1
+                }
             },
             "robotControlServer": {
                 "enable": False,
                 "ip": "localhost",
-                "port": 8283
+                "port": 8283,
+                "binaryPush": True   # 서버 지원 + msgpack 설치 + orjson/msgspec 미설치 시 robot_update를 PUSH_BIN(MessagePack)으로 수신
             }
         }
         
@@ -100,6 +106,22 @@ class ConfigManager:
         """
         self.config["imageDetectionServer"]["port"] = int(port)
 
+    def get_detection_server_transport(self):
+        """
+        이미지 감지 서버 전송 모드 반환 (서버와 협상, 미지원 시 raw)
+        Returns:
+            str: "raw" / "jpeg" / "png" / "shm" (같은 호스트 서버 공유 메모리)
+        """
+        return self.config["imageDetectionServer"].get("transport", "raw")
+
+    def get_detection_server_input_size(self):
+        """
+        이미지 감지 모델 입력 크기 반환 (letterbox 축소 전송)
+        Returns:
+            int | None: 정사각형 입력 크기 (예: 640), None이면 원본 크기 전송
+        """
+        return self.config["imageDetectionServer"].get("inputSize")
+
     def get_detection_server_enable(self):
         """
         이미지 감지 서버 활성화 상태 반환
@@ -143,6 +165,22 @@ class ConfigManager:
         """
         return self.config.get("mmsServer", {})
     
+    def get_mms_status_upload_max_rate(self):
+        """
+        robot_status_data 최대 업로드 빈도 반환
+        Returns:
+            float: Hz (0이면 제한 없음 - 업로드 타이머 주기마다 변경분 전송)
+        """
+        return float(self.config["mmsServer"].get("statusUploadMaxRateHz", 1.0))
+
+    def get_mms_status_upload_precision(self):
+        """
+        robot_status_data 실수 필드별 소수 자릿수 반환
+        Returns:
+            dict: 필드 이름 또는 점표기 경로 -> 자릿수 ("*" = 나머지 실수 기본값)
+        """
+        return self.config["mmsServer"].get("statusUploadPrecision", {"*": 3})
+
     def get_robot_control_server_info(self):
         """
         로봇 제어 서버 정보 반환
@@ -152,6 +190,14 @@ class ConfigManager:
         """
         return self.config.get("robotControlServer", {})
 
+    def get_robot_control_binary_push(self):
+        """
+        로봇 제어 서버 바이너리 푸시(PUSH_BIN) 사용 여부 반환
+        Returns:
+            bool: True면 연결 시 bin_hello로 협상 (서버 미지원, msgpack 미설치, orjson/msgspec 사용 시 PUSH_JSON 유지)
+        """
+        return bool(self.config["robotControlServer"].get("binaryPush", True))
+
     def save_config(self):
         """
         설정을 파일에 저장
@@ -14,20 +14,236 @@ import numpy as np
 import cv2
 import threading
 import time
+from multiprocessing import shared_memory
 from PySide6.QtCore import QObject, Signal, QThread
 from typing import Optional, List, Dict, Any
 
+from utils.reconnect_scheduler import ReconnectScheduler
+from dectector.detection_overlay import DetectionOverlayRenderer
+
+# ==============================================================================
+# 이미지 전송 모드
+# ==============================================================================
+# 헤더 (26 bytes, "<L3I10s"): [데이터 길이] [height] [width] [channels] [인코딩/dtype 문자열]
+# - raw : dtype 문자열("uint8") + 원시 픽셀 (기존 규격, 모든 서버 지원)
+# - jpeg/png : 인코딩 문자열 + 압축 이미지 (height/width/channels는 디코딩 후 크기)
+# 협상: 연결 직후 데이터 길이 0, dtype "caps" 헤더를 보내면 지원 서버는
+#       {"encodings": ["raw", "jpeg", ...], "input_size": 640} JSON으로 응답.
+#       응답이 없거나 연결이 끊기면 기존 서버로 보고 raw로 재연결
+# - shm (같은 호스트 서버 전용): 프레임은 공유 메모리 링 슬롯에 쓰고 소켓으로는 슬롯 번호만 전송
+#   1) 링 생성/변경 시: dtype "shm_open" + {"name", "slots", "slot_bytes"} JSON -> 서버 {"ok": true} 응답
+#   2) 프레임: dtype "shm" + [슬롯 번호(4)] [바이트 수(4)] (height/width/channels는 슬롯 이미지 크기)
+#   서버가 shm을 지원하지 않거나 원격 서버면 jpeg -> raw 순으로 대체
+DETECTION_HEADER_STRUCT = struct.Struct("<L3I10s")
+SHM_SLOT_STRUCT = struct.Struct("<2I")
+TRANSPORT_RAW = "raw"
+TRANSPORT_JPEG = "jpeg"
+TRANSPORT_PNG = "png"
+TRANSPORT_SHM = "shm"
+TRANSPORT_MODES = (TRANSPORT_RAW, TRANSPORT_JPEG, TRANSPORT_PNG, TRANSPORT_SHM)
+CAPS_REQUEST = b"caps"
+SHM_OPEN_REQUEST = b"shm_open"
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+LETTERBOX_COLOR = 114  # YOLO 학습 시 letterbox 패딩 색상
+
+
+class LetterboxTransform:
+    """원본 프레임 <-> 모델 입력(letterbox) 좌표 변환"""
+    __slots__ = ("scale", "pad_x", "pad_y", "width", "height")
+
+    def __init__(self, scale: float, pad_x: int, pad_y: int, width: int, height: int):
+        self.scale = scale
+        self.pad_x = pad_x
+        self.pad_y = pad_y
+        self.width = width    # 원본 프레임 크기
+        self.height = height
+
+    def restore_boxes(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """감지 박스(x1, y1, x2, y2)를 원본 프레임 좌표로 변환"""
+        if self.scale == 1.0 and self.pad_x == 0 and self.pad_y == 0:
+            return detections
+        for detection in detections:
+            box = detection.get('box')
+            if not box or len(box) < 4:
+                continue
+            x1, y1, x2, y2 = box[:4]
+            detection['box'] = [
+                min(max((x1 - self.pad_x) / self.scale, 0.0), self.width),
+                min(max((y1 - self.pad_y) / self.scale, 0.0), self.height),
+                min(max((x2 - self.pad_x) / self.scale, 0.0), self.width),
+                min(max((y2 - self.pad_y) / self.scale, 0.0), self.height),
+            ]
+        return detections
+
+
+class SharedFrameRing:
+    """
+    감지 서버와 공유하는 프레임 링 버퍼 (multiprocessing.shared_memory)
+    - slots개의 고정 크기 슬롯을 순서대로 사용 (요청/응답이 순차이므로 응답 수신 후 슬롯 재사용 안전)
+    - 클라이언트가 생성/해제(unlink), 서버는 이름으로 열어서 읽기만 함
+    """
+
+    def __init__(self, slot_bytes: int, slots: int = 2):
+        self.slot_bytes = slot_bytes
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes * slots)
+        self._next_slot = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.shm.name, "slots": self.slots, "slot_bytes": self.slot_bytes}
+
+    def write(self, image: np.ndarray):
+        """다음 슬롯에 이미지 복사 -> (슬롯 번호, 바이트 수)"""
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        view = np.ndarray(image.shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        view[...] = image
+        del view  # 공유 메모리 버퍼 참조 해제 (close() 가능하도록)
+        return slot, image.nbytes
+
+    def close(self):
+        # close()가 실패해도(살아 있는 view -> BufferError) unlink()는 반드시 호출 (/dev/shm에 세그먼트가 남지 않도록)
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # 매핑은 마지막 view가 해제될 때 정리됨
+        finally:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class DetectionFrameEncoder:
+    """
+    감지 요청 이미지 인코더
+    - input_size가 있으면 비율 유지 축소 후 정사각형 캔버스 중앙에 배치 (letterbox)
+    - letterbox 캔버스/축소 버퍼는 프레임 크기가 바뀌지 않는 한 재사용 (프레임마다 할당 없음)
+    - transport에 따라 raw / JPEG / PNG 로 인코딩
+    """
+
+    def __init__(self, transport: str = TRANSPORT_RAW, input_size: Optional[int] = None,
+                 jpeg_quality: int = 85, png_compression: int = 1):
+        if transport not in TRANSPORT_MODES:
+            raise ValueError(f"지원하지 않는 전송 모드: {transport}")
+        self.transport = transport
+        self.input_size = input_size
+        self.jpeg_quality = jpeg_quality
+        self.png_compression = png_compression
+        self._canvas = None
+        self._resized = None
+        self._layout = None  # (원본 shape) -> 재사용 판단
+        self.ring: Optional[SharedFrameRing] = None  # shm 전송 시 사용 (DetectionClient가 생성/교체)
+
+    def output_nbytes(self, image: np.ndarray) -> int:
+        """전송할 모델 입력 이미지 크기 (바이트)"""
+        channels = image.shape[2] if image.ndim == 3 else 1
+        if self.input_size:
+            return self.input_size * self.input_size * channels
+        return image.shape[0] * image.shape[1] * channels
+
+    def encode(self, image: np.ndarray):
+        """
+        Returns:
+            (header, payload, transform) - payload는 bytes 또는 memoryview (캔버스 재사용, 전송 후 무효)
+        """
+        if image.dtype != np.uint8:
+            image = image.astype(np.uint8)
+        if image.ndim == 2:
+            image = image[:, :, np.newaxis]
+
+        model_image, transform = self._letterbox(image)
+        height, width, channels = model_image.shape
+
+        if self.transport == TRANSPORT_RAW:
+            payload = memoryview(np.ascontiguousarray(model_image)).cast('B')  # 복사 없이 전송
+            tag = str(model_image.dtype)
+        elif self.transport == TRANSPORT_SHM:
+            slot, nbytes = self.ring.write(model_image)
+            payload = memoryview(SHM_SLOT_STRUCT.pack(slot, nbytes))
+            tag = TRANSPORT_SHM
+        else:
+            if self.transport == TRANSPORT_JPEG:
+                ok, encoded = cv2.imencode('.jpg', model_image, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+            else:
+                ok, encoded = cv2.imencode('.png', model_image, [int(cv2.IMWRITE_PNG_COMPRESSION), self.png_compression])
+            if not ok:
+                raise ValueError(f"{self.transport} 인코딩 실패")
+            payload = memoryview(encoded).cast('B')
+            tag = self.transport
+
+        header = DETECTION_HEADER_STRUCT.pack(
+            payload.nbytes, height, width, channels, tag.encode('utf-8').ljust(10, b'\x00')
+        )
+        return header, payload, transform
+
+    def _letterbox(self, image: np.ndarray):
+        height, width = image.shape[:2]
+        size = self.input_size
+        if not size or (height == size and width == size):
+            return image, LetterboxTransform(1.0, 0, 0, width, height)
+
+        scale = min(size / width, size / height)
+        new_w, new_h = max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+        pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+        layout = image.shape
+        if self._layout != layout:
+            # 프레임 크기가 바뀐 경우에만 버퍼 재할당
+            self._canvas = np.full((size, size, image.shape[2]), LETTERBOX_COLOR, dtype=np.uint8)
+            self._resized = np.empty((new_h, new_w, image.shape[2]), dtype=np.uint8)
+            self._layout = layout
+
+        resized = cv2.resize(image, (new_w, new_h), dst=self._resized, interpolation=cv2.INTER_AREA)
+        self._canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized.reshape(new_h, new_w, -1)
+        return self._canvas, LetterboxTransform(scale, pad_x, pad_y, width, height)
+
+
 class DetectionClient:
-    
-    def __init__(self, host='localhost', port=8085):
+    """
+    객체 감지 서버 클라이언트
+    - 장기 실행 감지 워커 스레드 1개가 연결 유지 및 요청/응답을 순차 처리 (프레임마다 스레드 생성 없음)
+    - 최신 프레임 슬롯: detect_objects_async()는 슬롯만 교체하고 즉시 반환 (복사 없음)
+      워커가 가져가기 전에 새 프레임이 오면 이전 프레임은 건너뜀 (skipped)
+    - 연결 실패/끊김 시 워커가 백오프 후 재연결 (GUI 스레드에서 connect 하지 않음)
+    - 전송 모드(raw/jpeg/png) 협상 + letterbox 축소 전송, 감지 박스는 원본 프레임 좌표로 복원
+    """
+    RATE_WINDOW = 1.0  # 요청률 계산 구간 (초)
+    EMA_ALPHA = 0.1
+    NEGOTIATE_TIMEOUT = 2.0  # 전송 모드 협상 응답 대기 (초)
+
+    def __init__(self, host='localhost', port=8085,
+                 transport: str = TRANSPORT_RAW, input_size: Optional[int] = None, jpeg_quality: int = 85,
+                 shm_slots: int = 2):
+        """
+        Args:
+            transport: 희망 전송 모드 (raw/jpeg/png/shm), 서버가 지원하지 않으면 raw
+                       (shm은 같은 호스트 서버 전용, 불가 시 jpeg)
+            input_size: 모델 입력 크기 (예: 640 -> 640x640 letterbox), None이면 원본 크기 전송
+                        (서버가 협상 응답에 input_size를 주면 서버 값 사용)
+        """
         self.host = host
         self.port = port
+        self.transport = transport
+        self.input_size = input_size
+        self._encoder = DetectionFrameEncoder(TRANSPORT_RAW, input_size, jpeg_quality)
+        self._caps_unsupported = False  # 협상 실패 -> 다음 연결 1회는 협상 생략 (그 연결이 성공하면 해제)
+        self.server_caps = None
+        self.shm_slots = shm_slots
         self.socket = None
         self.connected = False
-        self.detection_thread = None
-        self.pending_frames = []  # 대기 중인 프레임들
-        self.max_pending_frames = 3  # 최대 대기 프레임 수
-        self.processing = False
+        self.detection_thread = None  # 감지 워커 스레드 (1개, 장기 실행)
+        self._cond = threading.Condition()  # 최신 프레임 슬롯 보호
+        self._latest_frame = None
+        self._is_running = False
+        self._reconnect = ReconnectScheduler(name=f"detector_{host}:{port}")
+
+        # 통계
+        self.reset_stats()
         
         # 콜백 함수들 (시그널 대신 사용)
         self.on_detection_results = None  # callback(detections, image)
@@ -36,26 +252,107 @@ class DetectionClient:
         
     def connect_to_server(self) -> bool:
         """서버에 연결"""
+        self._reconnect.record_attempt()
+        skipped_negotiation = self._caps_unsupported
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.host, self.port))
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self._reconnect.connect_timeout)
+            sock.connect((self.host, self.port))
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # 헤더/이미지 분할 송신 지연 방지
+            if not self._negotiate_transport(sock):
+                # 기존 서버가 협상 요청에 연결을 끊었을 수 있으므로 raw 모드로 다시 연결
+                sock.close()
+                sock = socket.create_connection((self.host, self.port), self._reconnect.connect_timeout)
+                sock.settimeout(None)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket = sock
             self.connected = True
+            self._reconnect.record_success()
+            if skipped_negotiation:
+                # 협상 실패는 일시적 오류(타임아웃 등)일 수 있으므로 영구 적용하지 않고 다음 연결에서 다시 협상
+                self._caps_unsupported = False
             if self.on_connection_status:
                 self.on_connection_status(True)
             if self.on_status_update:
-                self.on_status_update(f"서버 연결 성공: {self.host}:{self.port}")
+                self.on_status_update(f"서버 연결 성공: {self.host}:{self.port} "
+                                      f"(전송: {self._encoder.transport}, 입력: {self._encoder.input_size or '원본'})")
             return True
         except Exception as e:
             self.connected = False
+            self._reconnect.record_failure(e)
             if self.on_connection_status:
                 self.on_connection_status(False)
             if self.on_status_update:
                 self.on_status_update(f"서버 연결 실패: {e}")
             return False
     
+    def _negotiate_transport(self, sock: socket.socket) -> bool:
+        """
+        전송 모드 협상 (raw 요청이거나 기존 서버로 확인된 경우 생략)
+        Returns: False면 협상 실패로 연결을 다시 열어야 함
+        """
+        self._encoder.transport = TRANSPORT_RAW
+        self._encoder.input_size = self.input_size
+        if self.transport == TRANSPORT_RAW or self._caps_unsupported:
+            return True
+        try:
+            sock.settimeout(self.NEGOTIATE_TIMEOUT)
+            sock.sendall(DETECTION_HEADER_STRUCT.pack(0, 0, 0, 0, CAPS_REQUEST.ljust(10, b'\x00')))
+            size_data = self._recv_exact(4, sock)
+            caps = None
+            if size_data:
+                body = self._recv_exact(struct.unpack("<L", size_data)[0], sock)
+                caps = json.loads(body.decode('utf-8')) if body else None
+            sock.settimeout(None)
+        except (OSError, ValueError) as e:
+            caps = None
+            if self.on_status_update:
+                self.on_status_update(f"전송 모드 협상 실패 ({e}), raw 모드 사용")
+
+        if not isinstance(caps, dict) or 'encodings' not in caps:
+            self._caps_unsupported = True
+            return False
+
+        self.server_caps = caps
+        encodings = caps['encodings']
+        if self.transport == TRANSPORT_SHM and (TRANSPORT_SHM not in encodings or self.host not in LOCAL_HOSTS):
+            # 공유 메모리는 같은 호스트에서만 가능 -> 압축 전송으로 대체
+            if TRANSPORT_JPEG in encodings:
+                self._encoder.transport = TRANSPORT_JPEG
+        elif self.transport in encodings:
+            self._encoder.transport = self.transport
+        if caps.get('input_size'):
+            self._encoder.input_size = int(caps['input_size'])
+        return True
+
+    def _ensure_shared_ring(self, image: np.ndarray):
+        """shm 전송: 프레임이 들어갈 공유 메모리 링을 준비하고 서버에 알림 (크기 변경 시 재생성)"""
+        nbytes = self._encoder.output_nbytes(image)
+        ring = self._encoder.ring
+        if ring is not None and ring.slot_bytes >= nbytes:
+            return
+        if ring is not None:
+            ring.close()
+            self._encoder.ring = None
+        ring = SharedFrameRing(nbytes, self.shm_slots)
+        self._encoder.ring = ring
+
+        body = json.dumps(ring.describe()).encode('utf-8')
+        self.socket.sendall(DETECTION_HEADER_STRUCT.pack(len(body), 0, 0, 0, SHM_OPEN_REQUEST.ljust(10, b'\x00')) + body)
+        reply = self._receive_response()
+        if not reply or not reply.get('ok'):
+            raise ConnectionError(f"공유 메모리 링 등록 실패: {reply}")
+
+    def _release_shared_ring(self):
+        if self._encoder.ring is not None:
+            self._encoder.ring.close()
+            self._encoder.ring = None
+
     def disconnect_from_server(self):
         """연결 종료"""
         self.connected = False
+        self._release_shared_ring()
         if self.socket:
             try:
                 self.socket.close()
@@ -70,65 +367,160 @@ class DetectionClient:
     def is_connected(self) -> bool:
         """연결 상태 확인"""
         return self.connected and self.socket is not None
-    
-    def detect_objects_async(self, image: np.ndarray):
-        """비동기로 객체 감지 요청"""
-        if not self.is_connected():
-            if not self.connect_to_server():
+
+    def start(self):
+        """감지 워커 시작 (detect_objects_async() 첫 호출 시 자동 시작)"""
+        with self._cond:
+            if self._is_running:
                 return
-        
-        # 대기 중인 프레임이 너무 많으면 오래된 것 제거
-        if len(self.pending_frames) >= self.max_pending_frames:
-            self.pending_frames.pop(0)
-        
-        # 현재 프레임을 대기 목록에 추가
-        self.pending_frames.append(image.copy())
-        
-        # 처리 중이 아니면 새로운 쓰레드 시작
-        if not self.processing:
-            self.detection_thread = threading.Thread(target=self._process_detection_queue)
-            self.detection_thread.daemon = True
-            self.detection_thread.start()
-    
-    def _process_detection_queue(self):
-        """감지 큐 처리 (별도 쓰레드에서 실행)"""
-        self.processing = True
-        
-        while self.pending_frames and self.is_connected():
+            self._is_running = True
+        self._reconnect.reset()
+        self.detection_thread = threading.Thread(target=self._detection_worker, name="detection-worker", daemon=True)
+        self.detection_thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """감지 워커 종료 및 연결 해제"""
+        with self._cond:
+            self._is_running = False
+            self._latest_frame = None
+            self._cond.notify_all()
+        self._reconnect.cancel()
+        if self.socket:
             try:
-                # 가장 최신 프레임 가져기
-                image = self.pending_frames.pop()
-                # 나머지 오래된 프레임들 제거 (최신 것만 처리)
-                self.pending_frames.clear()
-                
-                # 감지 수행
-                detections = self._detect_objects_sync(image)
-                
-                if detections is not None:
-                    # 결과를 콜백으로 전달
-                    if self.on_detection_results:
-                        self.on_detection_results(detections, image)
-                
-            except Exception as e:
-                if self.on_status_update:
-                    self.on_status_update(f"감지 처리 중 오류: {e}")
+                self.socket.shutdown(socket.SHUT_RDWR)  # 응답 대기 중인 recv 해제
+            except OSError:
+                pass
+        if self.detection_thread and self.detection_thread is not threading.current_thread():
+            self.detection_thread.join(timeout)
+        self.detection_thread = None
+        self.disconnect_from_server()
+    
+    def detect_objects_async(self, image: np.ndarray, meta=None):
+        """
+        비동기로 객체 감지 요청 (최신 프레임 슬롯에 등록 후 즉시 반환)
+        [!] 수정: 프레임 복사/스레드 생성 없음. 호출 후 image를 수정하지 않아야 함
+        meta: 영상 스레드의 FrameMeta (결과 수신 시 디코딩 -> 감지 결과 지연 기록)
+        """
+        if not self._is_running:
+            self.start()
+        with self._cond:
+            if self._latest_frame is not None:
+                self.skipped_frames += 1  # 워커가 처리하기 전에 새 프레임으로 교체
+            self._latest_frame = (image, meta)
+            self.submitted_frames += 1
+            self._cond.notify()
+
+    def _take_frame(self):
+        """최신 (프레임, FrameMeta)를 꺼냄 (종료 시 None)"""
+        with self._cond:
+            while self._is_running and self._latest_frame is None:
+                self._cond.wait()
+            item = self._latest_frame
+            self._latest_frame = None
+            return item
+
+    def _detection_worker(self):
+        """감지 워커 (연결 유지 + 최신 프레임 요청/응답 반복)"""
+        while True:
+            item = self._take_frame()
+            if item is None:
+                return
+            image, meta = item
+
+            if not self.is_connected():
+                if not self.connect_to_server():
+                    self.skipped_frames += 1  # 연결 실패로 처리하지 못한 프레임
+                    self._reconnect.schedule_retry()
+                    if not self._reconnect.wait():
+                        return
+                    continue
+
+            t0 = time.perf_counter()
+            detections = self._detect_objects_sync(image)
+            if detections is None:
+                # 송수신 실패: 연결을 정리하고 다음 프레임에서 재연결
+                self.failed_requests += 1
+                self._reconnect.record_failure("감지 요청 실패")
                 self.disconnect_from_server()
-                break
-        
-        self.processing = False
+                continue
+            self._record_request((time.perf_counter() - t0) * 1000.0)
+            if meta is not None:
+                meta.mark_detected()
+
+            if self.on_detection_results:
+                try:
+                    self.on_detection_results(detections, image)
+                except Exception as e:
+                    if self.on_status_update:
+                        self.on_status_update(f"감지 처리 중 오류: {e}")
+
+    # --- 통계 ---
+    def _record_request(self, rtt_ms: float):
+        now = time.monotonic()
+        self.completed_requests += 1
+        self.rtt_ms = rtt_ms if self.rtt_ms == 0.0 else self.rtt_ms + self.EMA_ALPHA * (rtt_ms - self.rtt_ms)
+        self.max_rtt_ms = max(self.max_rtt_ms, rtt_ms)
+        self._rate_count += 1
+        elapsed = now - self._rate_started
+        if elapsed >= self.RATE_WINDOW:
+            self.request_rate = self._rate_count / elapsed
+            self._rate_count = 0
+            self._rate_started = now
+
+    def _record_bytes(self, raw_bytes: int, sent_bytes: int):
+        self.sent_bytes += sent_bytes
+        self.raw_bytes += raw_bytes
+        self.bytes_per_frame = sent_bytes if self.bytes_per_frame == 0.0 else \
+            self.bytes_per_frame + self.EMA_ALPHA * (sent_bytes - self.bytes_per_frame)
+
+    def reset_stats(self):
+        self.sent_bytes = 0
+        self.raw_bytes = 0           # 원본 프레임 크기 합 (압축률 계산용)
+        self.bytes_per_frame = 0.0   # 요청당 전송 바이트 (EMA)
+        self.submitted_frames = 0
+        self.skipped_frames = 0      # 최신 프레임으로 교체되었거나 미연결로 처리하지 못한 프레임
+        self.completed_requests = 0
+        self.failed_requests = 0
+        self.request_rate = 0.0      # 초당 감지 요청 완료 수
+        self.rtt_ms = 0.0            # 요청 송신 -> 응답 수신 (EMA)
+        self.max_rtt_ms = 0.0
+        self._rate_count = 0
+        self._rate_started = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """요청률, 왕복 시간, 건너뛴 프레임 등 감지 워커 통계"""
+        return {
+            "connected": self.is_connected(),
+            "submitted": self.submitted_frames,
+            "skipped": self.skipped_frames,
+            "completed": self.completed_requests,
+            "failed": self.failed_requests,
+            "request_rate": round(self.request_rate, 2),
+            "rtt_ms": round(self.rtt_ms, 2),
+            "max_rtt_ms": round(self.max_rtt_ms, 2),
+            "transport": self._encoder.transport,
+            "input_size": self._encoder.input_size,
+            "bytes_per_frame": int(self.bytes_per_frame),
+            "compression": round(self.raw_bytes / self.sent_bytes, 1) if self.sent_bytes else 0.0,
+            "shm": self._encoder.ring.describe() if self._encoder.ring else None,
+            "reconnect": self._reconnect.stats(),
+        }
     
     def _detect_objects_sync(self, image: np.ndarray) -> Optional[List[Dict[str, Any]]]:
-        """동기적으로 객체 감지 수행"""
+        """동기적으로 객체 감지 수행 (감지 박스는 원본 프레임 좌표)"""
         try:
             # 이미지 전송
-            if not self._send_image(image):
+            transform = self._send_image(image)
+            if transform is None:
                 return None
             
             # 결과 수신
             response = self._receive_response()
+            if response is None:
+                return None  # 수신 실패/연결 종료 (빈 결과와 구분)
             
-            if response and 'detections' in response:
-                return response['detections']
+            if 'detections' in response:
+                return transform.restore_boxes(response['detections'])
             else:
                 return []
                 
@@ -137,47 +529,38 @@ class DetectionClient:
                 self.on_status_update(f"감지 요청 실패: {e}")
             return None
     
-    def _send_image(self, image: np.ndarray) -> bool:
-        """이미지를 서버로 전송"""
+    def _send_image(self, image: np.ndarray) -> Optional[LetterboxTransform]:
+        """이미지를 서버로 전송 (협상된 전송 모드/입력 크기), 성공 시 좌표 변환 정보 반환"""
         try:
-            if image.dtype != np.uint8:
-                image = image.astype(np.uint8)
-            
-            height, width, channels = image.shape
-            data = image.tobytes()
-            data_len = len(data)
-            dtype_str = str(image.dtype)
-            dtype_bytes = dtype_str.encode('utf-8').ljust(10, b'\x00')
-            
-            # 헤더 패킹 (26 bytes)
-            header = struct.pack("<L3I10s", data_len, height, width, channels, dtype_bytes)
+            if self._encoder.transport == TRANSPORT_SHM:
+                self._ensure_shared_ring(image)
+            header, payload, transform = self._encoder.encode(image)
             
             # 헤더 + 데이터 전송
-            self.socket.sendall(header + data)
-            return True
+            self.socket.sendall(header)
+            self.socket.sendall(payload)
+            self._record_bytes(image.nbytes, len(header) + payload.nbytes)
+            return transform
             
         except Exception as e:
             if self.on_status_update:
                 self.on_status_update(f"이미지 전송 실패: {e}")
-            return False
+            return None
     
     def _receive_response(self) -> Optional[Dict[str, Any]]:
         """서버 응답 수신"""
         try:
             # 메시지 크기 수신 (4 bytes)
-            size_data = self.socket.recv(4)
+            size_data = self._recv_exact(4)
             if not size_data:
                 return None
             
             message_size = struct.unpack("<L", size_data)[0]
             
             # JSON 데이터 수신
-            json_data = b''
-            while len(json_data) < message_size:
-                chunk = self.socket.recv(message_size - len(json_data))
-                if not chunk:
-                    return None
-                json_data += chunk
+            json_data = self._recv_exact(message_size)
+            if json_data is None:
+                return None
             
             # JSON 파싱
             response = json.loads(json_data.decode('utf-8'))
@@ -188,16 +571,31 @@ class DetectionClient:
                 self.on_status_update(f"응답 수신 실패: {e}")
             return None
 
+    def _recv_exact(self, n: int, sock: socket.socket = None) -> Optional[bytes]:
+        """정확히 n 바이트 수신 (연결 종료 시 None)"""
+        sock = sock or self.socket
+        buf = bytearray(n)
+        view = memoryview(buf)
+        received = 0
+        while received < n:
+            count = sock.recv_into(view[received:])
+            if not count:
+                return None
+            received += count
+        return bytes(buf)
+
 class DetectionThread(QThread):
     """감지를 위한 전용 쓰레드"""
     
     detection_results = Signal(list, np.ndarray)  # 감지 결과, 원본 이미지
     status_update = Signal(str)
     
-    def __init__(self, host='localhost', port=8085):
+    def __init__(self, host='localhost', port=8085, transport: str = TRANSPORT_RAW, input_size: Optional[int] = None):
         super().__init__()
         self.host = host
         self.port = port
+        self.transport = transport
+        self.input_size = input_size
         self.client = None
         self.running = False
         
@@ -210,29 +608,28 @@ class DetectionThread(QThread):
         """감지 중지"""
         self.running = False
         if self.client:
-            self.client.disconnect_from_server()
+            self.client.stop()
         self.quit()
         self.wait()
     
     def run(self):
         """쓰레드 메인 루프"""
         # 쓰레드 내에서 클라이언트 생성
-        self.client = DetectionClient(self.host, self.port)
+        self.client = DetectionClient(self.host, self.port, transport=self.transport, input_size=self.input_size)
         
         # 콜백 함수 설정 (시그널 발생)
         self.client.on_detection_results = self._on_detection_results
         self.client.on_status_update = self._on_status_update
         self.client.on_connection_status = self._on_connection_status
         
-        # 연결 시도
-        if not self.client.connect_to_server():
-            return
+        # 감지 워커 시작 (연결/재연결은 워커가 수행)
+        self.client.start()
         
-        # 쓰레드 유지 (실제 작업은 다른 메서드에서 수행)
+        # 쓰레드 유지 (실제 작업은 감지 워커에서 수행)
         while self.running:
             self.msleep(100)
         
-        self.client.disconnect_from_server()
+        self.client.stop()
     
     def _on_detection_results(self, detections, image):
         """감지 결과 콜백 - 시그널 발생"""
@@ -247,45 +644,21 @@ class DetectionThread(QThread):
         # 필요하면 추가 처리
         pass
     
-    def detect_objects(self, image: np.ndarray):
-        """객체 감지 요청"""
+    def detect_objects(self, image: np.ndarray, meta=None):
+        """객체 감지 요청 (meta: 영상 스레드 FrameMeta, 감지 지연 통계용)"""
         if self.client and self.running:
-            self.client.detect_objects_async(image)
+            self.client.detect_objects_async(image, meta)
+
+    def stats(self) -> Dict[str, Any]:
+        """감지 워커 통계 (요청률, 왕복 시간, 건너뛴 프레임)"""
+        return self.client.stats() if self.client else {}
+
+_overlay_renderer = DetectionOverlayRenderer()
 
 def draw_detections(image: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
-    """감지 결과를 이미지에 그리기"""
+    """감지 결과를 이미지에 그리기 (원본은 유지하고 복사본에 그림)"""
     if not detections:
         return image
     
-    result_image = image.copy()
-    
-    for detection in detections:
-        # 바운딩 박스 좌표
-        box = detection['box']
-        x1, y1, x2, y2 = map(int, box)
-        
-        # 클래스 이름과 신뢰도
-        name = detection['name']
-        confidence = detection['confidence']
-        
-        # 바운딩 박스 그리기 (초록색)
-        cv2.rectangle(result_image, (x1, y1), (x2, y2), (0, 255, 0), 2)
-        
-        # 레이블 텍스트
-        label = f"{name}: {confidence:.2f}"
-        
-        # 텍스트 크기 계산
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
-        thickness = 2
-        (text_width, text_height), baseline = cv2.getTextSize(label, font, font_scale, thickness)
-        
-        # 텍스트 배경 그리기
-        cv2.rectangle(result_image, (x1, y1 - text_height - 10), 
-                     (x1 + text_width, y1), (0, 255, 0), -1)
-        
-        # 텍스트 그리기
-        cv2.putText(result_image, label, (x1, y1 - 5), 
-                   font, font_scale, (0, 0, 0), thickness)
-    
-    return result_image
\ No newline at end of file
+    # [!] 수정: 박스는 polylines 1회, 레이블은 캐시된 스프라이트 사용 (복사 없이 그리려면 DetectionOverlayRenderer.draw)
+    return _overlay_renderer.draw(image.copy(), detections)
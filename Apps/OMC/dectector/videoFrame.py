@@ -3,6 +3,7 @@ from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
 
 import UI.reference.videoFrame
+from utils.frame_presenter import FramePresenter
 
 class VideoDialog(QDialog,UI.reference.videoFrame.Ui_Dialog):
     def __init__(self, *args, **kwargs):
@@ -17,6 +18,7 @@ class VideoDialog(QDialog,UI.reference.videoFrame.Ui_Dialog):
         self.layout = QVBoxLayout()
         self.video_label = QLabel()
         self.video_label.setAlignment(Qt.AlignCenter)  # 이미지가 중앙에 배치되도록 설정
+        self.presenter = FramePresenter()
         self.layout.addWidget(self.video_label)
         self.setLayout(self.layout)
         
@@ -41,4 +43,17 @@ class VideoDialog(QDialog,UI.reference.videoFrame.Ui_Dialog):
         scaled_pixmap = pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.video_label.setPixmap(scaled_pixmap)
 
+    def present_frame(self, frame, overlay=None):
+        """
+        BGR 프레임(np.ndarray)을 라벨 크기로 한 번만 축소해서 표시 (QPixmap 재스케일 없음)
+        :param overlay: 축소된 프레임에 그릴 콜백 (image, scale)
+        """
+        self.video_label.setPixmap(self.presenter.present(frame, self.video_label.size(), overlay))
+
+    def present_scaled(self, scaled, overlay=None):
+        """
+        영상 스레드에서 다이얼로그 크기로 미리 축소된 프레임(ScaledFrame) 표시
+        """
+        self.video_label.setPixmap(self.presenter.present_scaled(scaled, overlay))
+
         
@@ -4,15 +4,16 @@ author: gbox3d
 
 비디오 스트림 및 감지 기능을 관리하는 컨트롤러
 """
-import cv2
 import numpy as np
 from PySide6.QtCore import QObject, Slot, Qt
-from PySide6.QtGui import QImage, QPixmap, QFont
+from PySide6.QtGui import QFont
 
-from dectector.video_thread import VideoThread
+from video.stream_manager import get_stream_manager
 from dectector.videoFrame import VideoDialog
-from dectector.detector_client import DetectionThread, draw_detections
+from dectector.detector_client import DetectionThread
+from dectector.detection_overlay import DetectionOverlayRenderer
 from utils.my_qt_utils import limit_plaintext_lines
+from utils.frame_presenter import FramePresenter
 
 class VideoController(QObject):
     """비디오 스트림과 감지 기능을 관리하는 컨트롤러"""
@@ -24,15 +25,22 @@ class VideoController(QObject):
         self.current_unit_index_sub = current_unit_index_sub
         self.font_d2coding = font_d2coding
         
-        # 비디오 관련 변수
-        self.mainCameraThread = None
-        self.subCameraThread = None
+        # 비디오 관련 변수 (스트림 관리자 구독 - 같은 URL은 RTSP 세션/디코딩 공유)
+        self.main_stream = None      # 메인 라벨
+        self.zoom_stream = None      # 확대 다이얼로그
+        self.detector_stream = None  # 감지 요청용 원본 프레임
+        self.sub_stream = None       # 서브 라벨
         self.video_dialog = None
         
         # YOLO 감지 관련 변수
         self.yolo_detection_thread = None
         self.current_detections = []
         self.detection_overlay_enabled = False
+        self.overlay_renderer = DetectionOverlayRenderer()
+        
+        # 프레임 표시 (라벨별 축소 버퍼 재사용)
+        self.main_presenter = FramePresenter()
+        self.sub_presenter = FramePresenter()
         
     def initialize_main_camera(self, main_label, main_screen):
         """메인 카메라 초기화"""
@@ -51,9 +59,11 @@ class VideoController(QObject):
         rtsp_url = self.configMng.get_car_cam_url(car_idx=self.current_unit_index)
         print(f"Main RTSP URL: {rtsp_url}")
         
-        # 메인 카메라 비디오 스레드 생성 및 시작
-        self.mainCameraThread = VideoThread(rtsp_url)
-        self.mainCameraThread.start()
+        # 메인 카메라 스트림 구독
+        # [!] 라벨/확대창 크기 축소는 영상 스레드에서 수행, 원본 프레임은 감지 서버 사용 시에만 전달
+        manager = get_stream_manager()
+        self.main_stream = manager.subscribe(rtsp_url, "main", main_screen.size(), priority=0)
+        self.zoom_stream = manager.subscribe(rtsp_url, "zoom", (1920, 1080), visible=False, priority=0)
         
         # VideoDialog 미리 생성
         self.video_dialog = VideoDialog()
@@ -73,9 +83,8 @@ class VideoController(QObject):
         rtsp_url_sub = self.configMng.get_car_cam_url(car_idx=self.current_unit_index_sub)
         print(f"Sub RTSP URL: {rtsp_url_sub}")
         
-        # 서브 카메라 비디오 스레드 생성 및 시작
-        self.subCameraThread = VideoThread(rtsp_url_sub)
-        self.subCameraThread.start()
+        # 서브 카메라 스트림 구독 (메인과 같은 URL이면 세션 공유, 디코더 예산은 메인 우선)
+        self.sub_stream = get_stream_manager().subscribe(rtsp_url_sub, "sub", sub_label.size(), priority=1)
         
         return True
     
@@ -88,8 +97,16 @@ class VideoController(QObject):
         det_port = self.configMng.get_detection_server_port()
         
         # YOLO 감지 스레드 생성
-        self.yolo_detection_thread = DetectionThread(host=det_ip, port=det_port)
+        self.yolo_detection_thread = DetectionThread(
+            host=det_ip, port=det_port,
+            transport=self.configMng.get_detection_server_transport(),
+            input_size=self.configMng.get_detection_server_input_size()
+        )
         self.yolo_detection_thread.start_detection()
+        if self.main_stream:
+            # 감지 요청용 원본 프레임 (표시 출력 없음)
+            self.detector_stream = get_stream_manager().subscribe(
+                self.main_stream.url, "detector", full_frames=True, priority=0)
         
         self.detection_overlay_enabled = True
         log_widget.appendPlainText(f"감지 서버 연결: {det_ip}:{det_port}")
@@ -103,32 +120,55 @@ class VideoController(QObject):
         if self.yolo_detection_thread:
             self.yolo_detection_thread.detect_objects(cv_img)
         
-        # 현재 감지 결과가 있으면 이미지에 그리기
-        display_image = cv_img.copy()
+        # [!] 수정: BGR 프레임을 표시 크기로 1회 축소한 버퍼에 오버레이 후 QImage(BGR888)로 바로 감쌈
+        #     (cvtColor/copy/QPixmap 재스케일 없음, cv_img는 감지 워커도 참조하므로 직접 그리지 않음)
+        overlay = None
         if self.detection_overlay_enabled and self.current_detections:
-            display_image = draw_detections(display_image, self.current_detections)
-        
-        # Qt 형식으로 변환하여 화면에 표시
-        rgb_image = cv2.cvtColor(display_image, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = qt_image.scaled(main_screen.size(), Qt.KeepAspectRatio)
-        main_label.setPixmap(QPixmap.fromImage(pixmap))
+            detections = self.current_detections
+            overlay = lambda image, scale: self.overlay_renderer.draw(image, detections, scale)
+        main_label.setPixmap(self.main_presenter.present(cv_img, main_screen.size(), overlay))
         
-        # VideoDialog에도 전달
+        # VideoDialog에도 전달 (다이얼로그 크기로 별도 축소)
         if self.video_dialog and self.video_dialog.isVisible():
-            self.video_dialog.update_video_frame(QPixmap.fromImage(pixmap))
+            self.video_dialog.present_frame(cv_img, overlay)
+    
+    @Slot(np.ndarray, object)
+    def detect_main_image(self, cv_img, meta=None):
+        """메인 카메라 원본 프레임 감지 요청 (표시는 update_main_scaled, meta: 감지 지연 기록용 FrameMeta)"""
+        if self.yolo_detection_thread:
+            self.yolo_detection_thread.detect_objects(cv_img, meta)
+    
+    def _detection_overlay(self):
+        if self.detection_overlay_enabled and self.current_detections:
+            detections = self.current_detections
+            return lambda image, scale: self.overlay_renderer.draw(image, detections, scale)
+        return None
+    
+    @Slot(object)
+    def update_main_scaled(self, scaled, main_label, main_screen):
+        """영상 스레드에서 축소된 메인 카메라 프레임 표시 (GUI 스레드는 오버레이 + QPixmap 교체만)"""
+        main_label.setPixmap(self.main_presenter.present_scaled(scaled, self._detection_overlay()))
+        self.main_stream.set_size(main_screen.size())
+    
+    @Slot(object)
+    def update_zoom_scaled(self, scaled):
+        """영상 스레드에서 확대창 크기로 축소된 메인 카메라 프레임 표시"""
+        if self.video_dialog and self.video_dialog.isVisible():
+            self.video_dialog.present_scaled(scaled, self._detection_overlay())
+            self.zoom_stream.set_size(self.video_dialog.video_label.size())
+        else:
+            self.zoom_stream.set_visible(False)  # 닫힌 확대창은 축소 생략 (스트림 관리자 디코더 예산에도 반영)
+    
+    @Slot(object)
+    def update_sub_scaled(self, scaled, sub_label):
+        """영상 스레드에서 축소된 서브 카메라 프레임 표시"""
+        sub_label.setPixmap(self.sub_presenter.present_scaled(scaled))
+        self.sub_stream.set_size(sub_label.size())
     
     @Slot(np.ndarray)
     def update_sub_image(self, cv_img, sub_label):
         """서브 카메라 이미지 업데이트"""
-        rgb_image = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = qt_image.scaled(sub_label.size(), Qt.KeepAspectRatio)
-        sub_label.setPixmap(QPixmap.fromImage(pixmap))
+        sub_label.setPixmap(self.sub_presenter.present(cv_img, sub_label.size()))
     
     @Slot(list, np.ndarray)
     def on_detection_results(self, detections, original_image, log_widget):
@@ -165,12 +205,13 @@ class VideoController(QObject):
         """비디오 다이얼로그 표시"""
         if self.video_dialog and not self.video_dialog.isVisible():
             self.video_dialog.show()
+            if self.zoom_stream:
+                self.zoom_stream.set_visible(True, self.video_dialog.video_label.size())
     
     def cleanup(self):
         """리소스 정리"""
-        if self.mainCameraThread:
-            self.mainCameraThread.stop()
-        if self.subCameraThread:
-            self.subCameraThread.stop()
+        for stream in (self.main_stream, self.zoom_stream, self.detector_stream, self.sub_stream):
+            if stream:
+                stream.release()
         if self.yolo_detection_thread:
             self.yolo_detection_thread.stop_detection()
@@ -6,6 +6,7 @@ from PySide6.QtGui import QImage, QPixmap
 
 import csv 
 import json
+import time
 import os, subprocess
 import http.client
 import msvcrt
@@ -16,6 +17,7 @@ import UI.reference.mainForm_modify
 
 from utils.cssutils import change_background_color, change_text_color
 from utils.my_qt_utils import match_widget_to_parent
+from utils.frame_presenter import FramePresenter
 from configMng import ConfigManager
 
 # --- 상단 import 근처에 추가 ---
@@ -27,9 +29,11 @@ from map_controller import MapController
 # from status_manager import StatusManager
 
 from network.network_adapter import NetworkAdapter_MMS, NetworkAdapter_Robot
+from network.status_uploader import StatusDeltaUploader
 from client.client import Client
 
-from dectector.video_thread import VideoThread         
+from video.stream_manager import get_stream_manager
+from video.frame_metrics import draw_latency_hud
 from dectector.videoFrame import VideoDialog       
 
 from utils.utils import parse_command_line
@@ -72,8 +76,12 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
 
         print(f"Camera Enable: {CAM_ENABLE}, IR Camera URL: {IR_CAMERA_URL}, RGB Camera URL: {CAMERA_URL}")
 
-        self._rtsp_thread = None
+        # [!] 수정: RTSP 세션은 스트림 관리자가 URL별로 공유 (메인 라벨/확대창은 구독 2개)
+        self._rtsp_main_sub = None
+        self._rtsp_zoom_sub = None
+        self._latency_hud = False  # [!] F9: 영상 지연 HUD, F10: 지연 CSV 기록
         self._video_dialog = None
+        self._main_presenter = FramePresenter()  # 메인 카메라 라벨 표시용
 
         if CAM_ENABLE:
             print("Camera streaming is enabled.")
@@ -86,7 +94,8 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         if self.configMng.config['robotControlServer']['enable']:
             print(f"Robot Control Server Enabled: {ROBOT_HOST}:{ROBOT_PORT}")
             self.netRobot = NetworkAdapter_Robot(
-                lambda: Client(host=ROBOT_HOST, port=ROBOT_PORT)
+                lambda: Client(host=ROBOT_HOST, port=ROBOT_PORT,
+                               binary=self.configMng.get_robot_control_binary_push()) # [!] PUSH_BIN 협상 여부
             )
         else:
             print("Robot Control Server Disabled in Config.")
@@ -130,6 +139,16 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         self._meta_timer = QTimer(self)
         self._meta_timer.setInterval(self._meta_interval_ms)
         self._meta_timer.timeout.connect(self._poll_MMS_metadata)
+        # [!] 구독 지원 서버면 robot_n 변경분을 푸시로 받고 폴링(get_item)은 생략
+        self._mms_subscribed_key = None
+        self._server_clock = None           # (서버 시각, 경과 초, 수신 monotonic) - 구독 중 시계 표시용
+
+        # [!] robot_status_data 변경분 업로드 (반올림 후 바뀐 값만, 최대 빈도 제한)
+        self._status_uploader = None
+        upload_rate = self.configMng.get_mms_status_upload_max_rate()
+        self._status_upload_timer = QTimer(self)
+        self._status_upload_timer.setInterval(int(1000 / upload_rate) if upload_rate > 0 else 100)
+        self._status_upload_timer.timeout.connect(self._upload_robot_status)
 
         # === 추가: 하트비트 타이머(서버가 code=100 후 끊는 현상 방지) ===
         # self._hb_interval_ms = 3000          # 서버 요건에 맞게 조정(예: 300~1000ms)
@@ -171,50 +190,64 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         self.btnWaringJoin.clicked.connect(self.onClickedWarningJoin)
 
     def _start_rtsp(self, url: str):
-        """RTSP 스레드를 시작하고 프레임 신호를 UI에 연결"""
+        """RTSP 스트림을 구독하고 프레임 신호를 UI에 연결"""
         try:
-            if self._rtsp_thread:
+            if self._rtsp_main_sub:
                 self._stop_rtsp()
-            self._rtsp_thread = VideoThread(url)
-            self._rtsp_thread.change_pixmap_signal.connect(self._on_rtsp_frame)
-            self._rtsp_thread.start()
+            # [!] 수정: 라벨/확대창 크기 축소는 영상 스레드에서 수행 (원본 프레임 소비자 없음)
+            #     같은 URL을 다른 화면(VideoController 등)이 이미 수신 중이면 세션/디코딩 공유
+            manager = get_stream_manager()
+            self._rtsp_main_sub = manager.subscribe(url, "main", self.mainCamScreen_bmpLabel.size())
+            visible = bool(self._video_dialog and self._video_dialog.isVisible())
+            self._rtsp_zoom_sub = manager.subscribe(url, "zoom", self._zoom_output_size(), visible=visible)
+            self._rtsp_main_sub.frame_ready.connect(self._on_rtsp_main_frame)
+            self._rtsp_zoom_sub.frame_ready.connect(self._on_rtsp_zoom_frame)
             self.addLog(f"[UI] RTSP started: {url}")
         except Exception as e:
             self.addLog(f"[UI] ❌ RTSP start error: {e}")
 
     def _stop_rtsp(self):
-        """RTSP 스레드를 안전하게 중지"""
+        """RTSP 구독 해제 (마지막 구독이면 스트림 관리자가 세션 종료)"""
         try:
-            if self._rtsp_thread:
-                self._rtsp_thread.stop()
-                self._rtsp_thread = None
+            if self._rtsp_main_sub:
+                self._rtsp_main_sub.release()
+                self._rtsp_zoom_sub.release()
+                self._rtsp_main_sub = None
+                self._rtsp_zoom_sub = None
                 self.addLog("[UI] RTSP stopped")
         except Exception as e:
             self.addLog(f"[UI] ❌ RTSP stop error: {e}")
     
     @Slot(object)
-    def _on_rtsp_frame(self, cv_img):
-        """VideoThread에서 온 BGR 프레임을 QLabel/확대창에 반영"""
+    def _on_rtsp_main_frame(self, scaled):
+        """영상 스레드에서 라벨 크기로 축소된 프레임 표시 (GUI 스레드는 QPixmap 교체만)"""
+        try:
+            overlay = None
+            if self._latency_hud and self._rtsp_main_sub.latency:
+                lines = self._rtsp_main_sub.latency.hud_lines()
+                overlay = lambda image, scale: draw_latency_hud(image, lines)
+            self.mainCamScreen_bmpLabel.setPixmap(self._main_presenter.present_scaled(scaled, overlay))
+            self._rtsp_main_sub.set_size(self.mainCamScreen_bmpLabel.size())
+        except Exception as e:
+            print(f"[UI] _on_rtsp_main_frame error: {e}")
+
+    @Slot(object)
+    def _on_rtsp_zoom_frame(self, scaled):
+        """영상 스레드에서 확대창 크기로 축소된 프레임 표시"""
         try:
-            # OpenCV BGR -> RGB
-            h, w = cv_img.shape[:2]
-            rgb = cv_img[:, :, ::-1].copy()
-            qimg = QImage(rgb.data, w, h, w * 3, QImage.Format.Format_RGB888)
-            pix = QPixmap.fromImage(qimg)
-
-            # 메인 화면 갱신 (디자이너에 있는 QLabel 이름 사용)
-            if hasattr(self, "mainCamScreen_bmpLabel") and self.mainCamScreen_bmpLabel:
-                # 라벨 크기에 맞게 유지비율 스케일
-                scaled = pix.scaled(self.mainCamScreen_bmpLabel.size(),
-                                    Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.mainCamScreen_bmpLabel.setPixmap(scaled)
-
-            # 확대 다이얼로그가 열려 있으면 동시 업데이트
             if self._video_dialog and self._video_dialog.isVisible():
-                self._video_dialog.update_video_frame(pix)
+                self._video_dialog.present_scaled(scaled)
+                self._rtsp_zoom_sub.set_size(self._zoom_output_size())
+            else:
+                self._rtsp_zoom_sub.set_visible(False)  # 닫힌 확대창은 축소 생략
         except Exception as e:
-            # 프레임 변환 문제는 조용히 로깅
-            print(f"[UI] _on_rtsp_frame error: {e}")
+            print(f"[UI] _on_rtsp_zoom_frame error: {e}")
+
+    def _zoom_output_size(self):
+        """확대 다이얼로그 영상 영역 크기 (다이얼로그 생성 전에는 전체 화면 크기)"""
+        if self._video_dialog:
+            return self._video_dialog.video_label.size()
+        return (1920, 1080)
 
     def camZoomIn(self):
         """카메라 줌 인 (확대)"""
@@ -222,11 +255,15 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
             self._video_dialog = VideoDialog(self)
         self._video_dialog.show()
         self._video_dialog.raise_()
+        if self._rtsp_zoom_sub:
+            self._rtsp_zoom_sub.set_visible(True, self._zoom_output_size())
     def camZoomOut(self):
         """카메라 줌 아웃 (축소)"""
         if self._video_dialog:
             self._video_dialog.close()
             self._video_dialog = None
+        if self._rtsp_zoom_sub:
+            self._rtsp_zoom_sub.set_visible(False)
 
     # --- MainForm 클래스 내부에 유틸 추가(아무 메서드 위든 OK) ---
     def _is_log_view_at_bottom(self) -> bool:
@@ -264,9 +301,26 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
             print("Key Left Pressed")
         elif key == Qt.Key_Right:
             print("Key Right Pressed")
+        elif key == Qt.Key_F9:
+            self._latency_hud = not self._latency_hud
+        elif key == Qt.Key_F10:
+            self._toggle_latency_csv()
         else:
             super().keyPressEvent(event)
 
+    def _toggle_latency_csv(self):
+        """메인 카메라 프레임별 지연 CSV 기록 시작/중지 (실행 폴더에 latency_YYYYmmdd_HHMMSS.csv)"""
+        latency = self._rtsp_main_sub.latency if self._rtsp_main_sub else None
+        if latency is None:
+            return
+        if latency.csv_enabled:
+            latency.stop_csv()
+            self.addLog("[UI] latency CSV stopped")
+        else:
+            path = datetime.now().strftime("latency_%Y%m%d_%H%M%S.csv")
+            latency.start_csv(path)
+            self.addLog(f"[UI] latency CSV: {path}")
+
     def keyReleaseEvent(self, event):
         key = event.key()
 
@@ -326,19 +380,46 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         # 여기에 UI 업데이트 로직 추가
         self.currentTime.setText(data.get("now_time", "N/A"))
         self.operationTime.setText(data.get("elapsed_time", "N/A"))
+        try:
+            h, m, sec = (int(v) for v in data["elapsed_time"].split(":"))
+            now = datetime.strptime(data["now_time"], "%Y-%m-%d %H:%M:%S")
+            self._server_clock = (now, h * 3600 + m * 60 + sec, time.monotonic())
+        except (KeyError, TypeError, ValueError, AttributeError):
+            self._server_clock = None
+
+    def _tick_server_clock(self):
+        """ [!] 구독 중에는 서버 시각 푸시가 변경 시에만 오므로 마지막 수신 시각 기준으로 로컬 진행 """
+        if self._server_clock is None:
+            return
+        now, elapsed, received_at = self._server_clock
+        dt = int(time.monotonic() - received_at)
+        self.currentTime.setText(datetime.fromtimestamp(now.timestamp() + dt).strftime("%Y-%m-%d %H:%M:%S"))
+        total = elapsed + dt
+        self.operationTime.setText(f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}")
+
+    def _mms_robot_key(self) -> str:
+        unit_no = (getattr(self, "current_unit_index", 0) or 0) + 1
+        return f"robot_{unit_no}"
 
     @Slot()
     def _poll_MMS_metadata(self):
         # print("[UI] Polling MMS metadata...")
-        unit_no = (getattr(self, "current_unit_index", 0) or 0) + 1
-        key = f"robot_{unit_no}"
+        key = self._mms_robot_key()
         # print(f"[UI] Polling MMS metadata... key={key}")
         if getattr(self, "netMMS", None) and self.netMMS.is_connected():
-            self.netMMS.fetch_json_by_key(key)   # ← 어댑터 래퍼 호출
+            if self._mms_subscribed_key == key:
+                self._tick_server_clock()  # 변경분은 item_metadata_update 푸시로 수신
+            else:
+                self.netMMS.fetch_json_by_key(key)   # ← 어댑터 래퍼 호출 (구독 미지원 서버)
 
-            self.netMMS.set_json_by_key(
-                f"robot_{unit_no}.robot_status_data",
-                self.current_robot_status)
+    @Slot()
+    def _upload_robot_status(self):
+        """ [!] robot_status_data 변경분 업로드 (결과는 robot_status_upload/ack 메시지로 수신) """
+        if self._status_uploader is None or not (getattr(self, "netMMS", None) and self.netMMS.is_connected()):
+            return
+        payload = self._status_uploader.build(self.current_robot_status)
+        if payload:
+            self.netMMS.send_json_payload(payload, "robot_status_upload/ack")
 
 
     # === 하트비트 전송 ===
@@ -373,6 +454,19 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
             self._meta_timer.start()
             print("[UI] Started MMS metadata polling timer.")
 
+        # [!] 로봇 메타데이터 구독 (성공 시 subscribe/ack에서 폴링 중단)
+        self._mms_subscribed_key = None
+        self.netMMS.subscribe_items(self._mms_robot_key())
+
+        # [!] 재연결 후 첫 상태 업로드는 전체 교체
+        if self._status_uploader is None:
+            self._status_uploader = StatusDeltaUploader(
+                f"{self._mms_robot_key()}.robot_status_data",
+                precision=self.configMng.get_mms_status_upload_precision(),
+                max_rate_hz=self.configMng.get_mms_status_upload_max_rate())
+        self._status_uploader.reset()
+        self._status_upload_timer.start()
+
         # if not self._hb_timer.isActive():
         #     self._hb_timer.start()
         #     print("[UI] Started heartbeat timer.")
@@ -384,6 +478,11 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
     @Slot(str)
     def _ui_on_disconnected(self, reason: str):
         print("[UI] Disconnected:", reason)                
+        self._mms_subscribed_key = None
+        self._status_upload_timer.stop()
+        if self._status_uploader is not None:
+            self._status_uploader.reset()
+            print("[UI] Status upload stats:", self._status_uploader.stats())
         self.addLog(f"[UI] Disconnected from MMS server: {reason}")
 
     @Slot(str)
@@ -403,6 +502,17 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         if getattr(self, "_dead", False):
             return
 
+        if payload.get("cmd") == "robot_status_upload/ack":
+            if self._status_uploader is not None:
+                self._status_uploader.on_ack(payload.get("ok", False))
+            return
+
+        if payload.get("cmd") == "subscribe/ack":
+            if payload.get("ok"):
+                self._mms_subscribed_key = payload["keys"][0]
+                self.addLog(f"[UI] MMS 메타데이터 구독: {payload['keys']}")
+            return
+
         self.current_robot_data = payload.get("data", {})
         _robot_data = self.current_robot_data.get("value", {})
 
@@ -581,15 +691,19 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         
         # # 메인 카메라 초기화
         # if self.videoController.initialize_main_camera(self.mainCamScreen_bmpLabel, self.mainCamScreen):
-        #     # 비디오 스레드 시그널 연결
-        #     self.videoController.mainCameraThread.change_pixmap_signal.connect(
-        #         lambda img: self.videoController.update_main_image(
-        #             img, self.mainCamScreen_bmpLabel, self.mainCamScreen
+        #     # 비디오 스레드 시그널 연결 (표시: 영상 스레드에서 축소된 프레임, 원본: 감지 요청)
+        #     self.videoController.main_stream.frame_ready.connect(
+        #         lambda scaled: self.videoController.update_main_scaled(
+        #             scaled, self.mainCamScreen_bmpLabel, self.mainCamScreen
         #         )
         #     )
+        #     self.videoController.zoom_stream.frame_ready.connect(self.videoController.update_zoom_scaled)
             
         #     # 감지 서버 초기화
         #     if self.videoController.initialize_detection(self.edLogText):
+        #         self.videoController.detector_stream.full_frame_ready.connect(
+        #             self.videoController.detect_main_image
+        #         )
         #         self.videoController.yolo_detection_thread.detection_results.connect(
         #             lambda d, i: self.videoController.on_detection_results(d, i, self.edLogText)
         #         )
@@ -600,8 +714,8 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         # # 서브 카메라 초기화
         # if self.videoController.initialize_sub_camera(self.labelSubCamera):
         #     match_widget_to_parent(self.labelSubCamera)
-        #     self.videoController.subCameraThread.change_pixmap_signal.connect(
-        #         lambda img: self.videoController.update_sub_image(img, self.labelSubCamera)
+        #     self.videoController.sub_stream.frame_ready.connect(
+        #         lambda scaled: self.videoController.update_sub_scaled(scaled, self.labelSubCamera)
         #     )
         
         # 지도 컨트롤러
@@ -951,7 +1065,7 @@ class MainForm(QWidget, UI.reference.mainForm_modify.Ui_mainForm):
         self._dead = True
         try:
             # RTSP
-            if hasattr(self, "_rtsp_thread") and self._rtsp_thread:
+            if getattr(self, "_rtsp_main_sub", None):
                 self._stop_rtsp()
 
             # 타이머
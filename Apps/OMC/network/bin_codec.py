@@ -0,0 +1,61 @@
+"""
+filename : bin_codec.py
+
+TCP Agent PUSH_BIN 바디 코덱 (MessagePack + 키 사전)
+- 바디: [cmd, data, rest, keyed] (MessagePack 배열)
+  - data: keyed가 true면 키 사전(bin_keys 응답의 cmd별 키 목록) 순서의 값 배열 -> dict(zip(keys, values))로 복원
+          (키 구성이 다르면 서버가 원래 값 그대로 전송, 원래 배열인 data는 keyed=false로 구분)
+  - rest: cmd/data 외 필드 (token, req_id 등), 없으면 nil
+- 디코딩 결과는 PUSH_JSON과 같은 dict (data가 nil이면 생략)
+- msgpack 패키지 필요 (선택, 미설치 시 클라이언트는 바이너리 협상을 하지 않고 PUSH_JSON 사용)
+"""
+from typing import Dict, List, Optional
+
+try:
+    import msgpack  # (선택)
+except ImportError:
+    msgpack = None
+
+from network.protocol import BIN_FORMAT_MSGPACK
+
+
+def bin_available() -> bool:
+    return msgpack is not None
+
+
+class BinCodec:
+    name = BIN_FORMAT_MSGPACK
+
+    def __init__(self, keys: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            keys: cmd -> data 키 목록 (서버 bin_keys 응답의 keys 그대로)
+        """
+        if msgpack is None:
+            raise RuntimeError("msgpack 패키지가 설치되어 있지 않습니다.")
+        self.keys = {cmd: tuple(names) for cmd, names in (keys or {}).items()}
+
+    def encode(self, obj: dict) -> bytes:
+        """ 서버 인코더(msgpack.js)와 같은 규칙 (벤치마크/파이썬 서버용) """
+        cmd = obj.get("cmd", "")
+        data = obj.get("data")
+        keys = self.keys.get(cmd)
+        keyed = keys is not None and isinstance(data, dict) and len(data) == len(keys) and all(k in data for k in keys)
+        if keyed:
+            data = [data[k] for k in keys]
+        rest = {k: v for k, v in obj.items() if k != "cmd" and k != "data"} or None
+        return msgpack.packb([cmd, data, rest, keyed])
+
+    def decode(self, buf) -> dict:
+        cmd, data, rest, keyed = msgpack.unpackb(buf)
+        if keyed:
+            keys = self.keys.get(cmd)
+            if keys is None or len(keys) != len(data):
+                raise ValueError(f"PUSH_BIN 키 사전 불일치 (cmd={cmd})")
+            data = dict(zip(keys, data))
+        obj = {"cmd": cmd}
+        if data is not None:
+            obj["data"] = data
+        if rest:
+            obj.update(rest)
+        return obj
@@ -0,0 +1,184 @@
+"""
+filename : json_codec.py
+
+TCP Agent 프로토콜 JSON 코덱 (REQ_JSON / PUSH_JSON 바디)
+- encode(obj) -> UTF-8 bytes (str 경유 없이 바로 bytes)
+- decode(buf) -> dict (bytes / bytearray / memoryview 모두 허용)
+- 백엔드: msgspec > orjson > json(표준 라이브러리) 순으로 사용 가능한 것 선택 (선택 패키지, 미설치 시 json)
+- decode_typed(buf): msgspec 설치 시 robot_update / welcome / item_metadata를 msgspec.Struct로 디코딩
+  (그 외 cmd 또는 msgspec 미설치 시 dict) - 필드 타입 검증이 필요한 소비자용
+"""
+import json
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import msgspec  # (선택)
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson  # (선택)
+except ImportError:
+    orjson = None
+
+CODEC_AUTO = "auto"
+CODEC_MSGSPEC = "msgspec"
+CODEC_ORJSON = "orjson"
+CODEC_STDLIB = "json"
+
+
+class JsonCodec:
+    """표준 라이브러리 json (기본/대체 백엔드)"""
+    name = CODEC_STDLIB
+
+    def encode(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, buf) -> Any:
+        # json.loads(bytes)는 인코딩 판별을 거치므로 UTF-8 str로 바꿔 전달하는 편이 빠름
+        return json.loads(str(buf, "utf-8"))
+
+    def decode_typed(self, buf) -> Any:
+        return self.decode(buf)
+
+
+class OrjsonCodec(JsonCodec):
+    name = CODEC_ORJSON
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("orjson 패키지가 설치되어 있지 않습니다.")
+
+    def encode(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=self._OPTIONS)
+        except TypeError:
+            return super().encode(obj)  # orjson이 모르는 타입 (json.dumps 동작과 동일하게 처리/예외)
+
+    def decode(self, buf) -> Any:
+        return orjson.loads(buf)
+
+
+class MsgspecCodec(JsonCodec):
+    name = CODEC_MSGSPEC
+
+    def __init__(self):
+        if msgspec is None:
+            raise RuntimeError("msgspec 패키지가 설치되어 있지 않습니다.")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._typed_decoder = msgspec.json.Decoder(Union[RobotUpdate, Welcome, ItemMetadata])
+
+    def encode(self, obj) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except TypeError:
+            return super().encode(obj)
+
+    def decode(self, buf) -> Any:
+        return self._decoder.decode(buf)
+
+    def decode_typed(self, buf) -> Any:
+        try:
+            return self._typed_decoder.decode(buf)
+        except msgspec.ValidationError:
+            return self._decoder.decode(buf)  # 스키마 밖의 cmd
+
+
+# ==============================================================================
+# 메시지 스키마 (msgspec 설치 시, cmd 값으로 구분)
+# ==============================================================================
+if msgspec is not None:
+    class RobotStatus(msgspec.Struct):
+        """
+        robot_update.data (RBS api/simulator/robot.js Robot.toJSON()과 같은 필드/순서)
+        - JSON.stringify는 NaN/Infinity를 null로 보내므로 실수 필드는 None 허용
+        """
+        id: int = 0
+        x: Optional[float] = 0.0
+        y: Optional[float] = 0.0
+        angle: Optional[float] = 0.0
+        mode: str = "manual"
+        mission: str = "stop"
+        wheelbase: Optional[float] = None
+        wheelRadius: Optional[float] = None
+        steerLimitDeg: Optional[float] = None
+        maxWheelRPM: Optional[float] = None
+        WheelSpeed: Optional[float] = 0.0
+        WheelAngle: Optional[float] = 0.0
+        WheelOmega: Optional[float] = None
+        steerDeg: Optional[float] = 0.0
+        v: Optional[float] = 0.0
+        vx: Optional[float] = 0.0
+        vy: Optional[float] = 0.0
+        longitude: Optional[float] = None
+        latitude: Optional[float] = None
+        originLon: Optional[float] = None
+        originLat: Optional[float] = None
+        metersPerDeg: Optional[float] = None
+        battPercent: Optional[float] = None
+        battTempC: Optional[float] = None
+        battState: int = 0           # 0=normal, 1=warm, 2=hot, 3=critical
+        battHealth: str = "normal"   # battState 텍스트 라벨
+
+    class RobotUpdate(msgspec.Struct, tag_field="cmd", tag="robot_update"):
+        data: RobotStatus = msgspec.field(default_factory=RobotStatus)
+        token: Any = msgspec.UNSET  # control_robot 응답 푸시의 요청 매칭 값 (없으면 to_builtins에서 생략)
+
+    class Welcome(msgspec.Struct, tag_field="cmd", tag="welcome"):
+        version: str = ""
+        server_time: int = 0
+        features: List[str] = []
+        id: Optional[int] = None
+        packet_id: Optional[int] = None
+        app: Optional[str] = None
+        robot_id: Optional[int] = None
+
+    class ItemMetadata(msgspec.Struct, tag_field="cmd", tag="item_metadata"):
+        key: str = ""
+        value: Any = None
+        token: Optional[str] = None
+        now_time: Optional[str] = None
+        elapsed_time: Optional[str] = None
+        req_id: Optional[int] = None
+
+    def to_builtins(message) -> Dict[str, Any]:
+        """ Struct -> dict (cmd 포함) """
+        return msgspec.to_builtins(message) if isinstance(message, msgspec.Struct) else message
+else:
+    RobotStatus = RobotUpdate = Welcome = ItemMetadata = None
+
+    def to_builtins(message) -> Dict[str, Any]:
+        return message
+
+
+_BACKENDS = {CODEC_MSGSPEC: MsgspecCodec, CODEC_ORJSON: OrjsonCodec, CODEC_STDLIB: JsonCodec}
+_default_codec: Optional[JsonCodec] = None
+
+
+def available_codecs() -> List[str]:
+    names = []
+    if msgspec is not None:
+        names.append(CODEC_MSGSPEC)
+    if orjson is not None:
+        names.append(CODEC_ORJSON)
+    names.append(CODEC_STDLIB)
+    return names
+
+
+def create_codec(name: str = CODEC_AUTO) -> JsonCodec:
+    """ 코덱 생성 (auto: 설치된 가장 빠른 백엔드) """
+    if name == CODEC_AUTO:
+        name = available_codecs()[0]
+    if name not in _BACKENDS:
+        raise ValueError(f"지원하지 않는 JSON 코덱: {name}")
+    return _BACKENDS[name]()
+
+
+def get_codec() -> JsonCodec:
+    """ 프로세스 공용 기본 코덱 """
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = create_codec(CODEC_AUTO)
+    return _default_codec
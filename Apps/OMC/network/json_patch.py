@@ -0,0 +1,62 @@
+"""
+filename : json_patch.py
+
+메타데이터 미러용 JSON Patch(RFC 6902 일부) / 점표기 경로 유틸
+- MMS 구독 푸시(metadata_patch)의 add / replace / remove 연산만 지원
+- 서버가 보낸 변경분이 기준이므로 엄격 검사 대신 관대하게 적용
+  (replace 대상이 없으면 생성, remove 대상이 없으면 무시)
+"""
+from typing import Any, Iterable, List
+
+
+def pointer_to_parts(pointer: str) -> List[str]:
+    """ "/robot_1/a~1b" -> ["robot_1", "a/b"] """
+    if not pointer:
+        return []
+    return [p.replace("~1", "/").replace("~0", "~") for p in pointer.lstrip("/").split("/")]
+
+
+def get_by_path(doc: dict, key: str, default=None) -> Any:
+    """ 점표기 경로 조회 ("robot_1.status") """
+    cur = doc
+    for part in key.split("."):
+        if not isinstance(cur, dict) or part not in cur:
+            return default
+        cur = cur[part]
+    return cur
+
+
+def set_by_parts(doc: dict, parts: Iterable[str], value: Any):
+    """ 경로 값 설정 (중간 객체가 없거나 객체가 아니면 생성) """
+    parts = list(parts)
+    cur = doc
+    for part in parts[:-1]:
+        if not isinstance(cur.get(part), dict):
+            cur[part] = {}
+        cur = cur[part]
+    cur[parts[-1]] = value
+
+
+def remove_by_parts(doc: dict, parts: Iterable[str]):
+    parts = list(parts)
+    cur = doc
+    for part in parts[:-1]:
+        cur = cur.get(part) if isinstance(cur, dict) else None
+        if cur is None:
+            return
+    if isinstance(cur, dict):
+        cur.pop(parts[-1], None)
+
+
+def apply_patch(doc: dict, ops: Iterable[dict]) -> dict:
+    """ JSON Patch 연산을 doc에 직접 적용 """
+    for op in ops:
+        parts = pointer_to_parts(op.get("path", ""))
+        if not parts:
+            continue  # 루트 교체는 지원하지 않음 (구독은 항상 키 단위)
+        kind = op.get("op")
+        if kind in ("add", "replace"):
+            set_by_parts(doc, parts, op.get("value"))
+        elif kind == "remove":
+            remove_by_parts(doc, parts)
+    return doc
@@ -167,8 +167,7 @@ class NetworkAdapter(QObject):
 
         async def _task():
             import asyncio
-            coro = self._client.request_json_by_key(key)
-            res = await asyncio.wait_for(coro, timeout=timeout_sec) if timeout_sec and timeout_sec > 0 else await coro
+            res = await self._client.request_json_by_key(key, timeout=timeout_sec if timeout_sec and timeout_sec > 0 else None)
             return res  # dict | None (서버 구현에 따름)
 
         def done(fut):
@@ -196,7 +195,7 @@ class NetworkAdapter(QObject):
             import asyncio
             # 클라이언트의 send_json을 이용해 {"cmd":"set_item",...} 전송 (ACK 기반)
             payload = {"cmd": "set_item", "key": key, "value": value}
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec) # [!] 요청별 타임아웃 (요청 ID 응답 대기)
             return bool(ok)
 
         def done(fut):
@@ -212,11 +211,71 @@ class NetworkAdapter(QObject):
 
         self._run_async(_task(), on_done=done)
 
+    def send_json_payload(self, payload: dict, ack_cmd: str, *, timeout_sec: float = 5.0):
+        """ 임의 JSON 요청 전송 -> message(cmd=ack_cmd, ok=...) (StatusDeltaUploader 등 호출 측이 결과 처리) """
+        if not self._connected or not self._client:
+            self.message.emit({"cmd": ack_cmd, "ok": False, "error": "not connected"})
+            return
+
+        def done(fut):
+            try:
+                ok = fut.result()
+                self.message.emit({"cmd": ack_cmd, "ok": bool(ok)})
+            except Exception as e:
+                self.error.emit(f"[{payload.get('cmd')}] {e}")
+                self.message.emit({"cmd": ack_cmd, "ok": False, "error": str(e)})
+
+        self._run_async(self._client.send_json(payload, timeout=timeout_sec), on_done=done)
+
 # ===== MMS 전용 어댑터 (메타데이터/뱅크/알림 등) =====
 class NetworkAdapter_MMS(NetworkAdapter):
     def __init__(self, client_factory: Callable[[], Any], parent=None):
         super().__init__(client_factory, parent)
 
+    def start(self):
+        super().start()
+        self._client.on_metadata_changed = self._on_metadata_changed
+
+    # ===== 메타데이터 구독 (변경분 푸시) =====
+    def _on_metadata_changed(self, key: str, value, msg: dict):
+        """ 구독 키 변경 -> message(cmd='item_metadata_update'), data 형식은 get_item 응답과 동일 """
+        self.message.emit({
+            "cmd": "item_metadata_update", "key": key, "ok": True,
+            "data": {
+                "key": key, "value": value, "rev": msg.get("rev"),
+                "now_time": msg.get("now_time"), "elapsed_time": msg.get("elapsed_time"),
+            },
+        })
+
+    def subscribe_items(self, keys, *, timeout_sec: float = 5.0):
+        """ 키 구독 -> message(cmd='subscribe/ack', ok=False면 서버 미지원: 폴링 유지) """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        if not self._connected or not self._client:
+            self.message.emit({"cmd": "subscribe/ack", "keys": keys, "ok": False, "error": "not connected"})
+            return
+
+        def done(fut):
+            try:
+                ok = fut.result()
+                self.message.emit({"cmd": "subscribe/ack", "keys": keys, "ok": ok})
+            except Exception as e:
+                self.error.emit(f"[MMS:subscribe:{keys}] {e}")
+                self.message.emit({"cmd": "subscribe/ack", "keys": keys, "ok": False, "error": str(e)})
+
+        self._run_async(self._client.subscribe(keys, timeout=timeout_sec), on_done=done)
+
+    def unsubscribe_items(self, keys=None, *, timeout_sec: float = 5.0):
+        if not self._connected or not self._client:
+            return
+
+        def done(fut):
+            try:
+                fut.result()
+            except Exception as e:
+                self.error.emit(f"[MMS:unsubscribe:{keys}] {e}")
+
+        self._run_async(self._client.unsubscribe(keys, timeout=timeout_sec), on_done=done)
+
     # 메타데이터 전체 요청
     def fetch_all_metadata(self, *, timeout_sec: float = 5.0):
         if not self._connected or not self._client:
@@ -227,7 +286,7 @@ class NetworkAdapter_MMS(NetworkAdapter):
         async def _task():
             import asyncio
             payload = {"cmd": "get_all"}
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
 
         def done(fut):
@@ -252,7 +311,7 @@ class NetworkAdapter_MMS(NetworkAdapter):
         async def _task():
             import asyncio
             payload = {"cmd": "get_item", "key": key}
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
 
         def done(fut):
@@ -275,7 +334,7 @@ class NetworkAdapter_MMS(NetworkAdapter):
         async def _task():
             import asyncio
             payload = {"cmd": "set_item", "key": key, "value": value}
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
 
         def done(fut):
@@ -313,7 +372,7 @@ class NetworkAdapter_Robot(NetworkAdapter):
                 },
                 "token": token,
             }
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
         def done(fut):
             try:
@@ -346,7 +405,7 @@ class NetworkAdapter_Robot(NetworkAdapter):
                 "data": patch,
                 "token": token,
             }
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
         def done(fut):
             try:
@@ -376,7 +435,7 @@ class NetworkAdapter_Robot(NetworkAdapter):
                 "data": data,
                 "token": token,
             }
-            ok = await asyncio.wait_for(self._client.send_json(payload), timeout=timeout_sec)
+            ok = await self._client.send_json(payload, timeout=timeout_sec)
             return bool(ok)
         def done(fut):
             try:
@@ -5,11 +5,12 @@
 ## 위 주석은 수정하지 마세요.
 #############################
 
-import json
 import struct
 from typing import Optional
 import asyncio
 
+from network.json_codec import get_codec
+
 # 고정 체크코드
 checkcode: int = 20251004
 
@@ -31,6 +32,18 @@ PUSH_JSON    = 0x03
 PUSH_STATUS  = 0x04
 PUSH_ALERT   = 0x05
 
+# 요청 ID 확장: REQ_JSON 바디에 "req_id"(uint32)를 넣으면 서버가 REQ_ACK_ID로 응답
+# (데이터 응답 명령은 PUSH_JSON에 같은 req_id를 넣어 응답), welcome의 features로 지원 여부 확인
+REQ_ACK_ID     = 0x06
+FEATURE_REQ_ID = "req_id"
+# 메타데이터 구독: {"cmd":"subscribe","keys":[...]} -> metadata_snapshot 응답, 이후 변경분만 metadata_patch 푸시
+FEATURE_SUBSCRIBE = "subscribe"
+# 바이너리 푸시: {"cmd":"bin_hello","formats":["msgpack"]} -> bin_keys(cmd별 키 사전) 응답, 이후 이 연결의 푸시는 PUSH_BIN
+# 바디는 PUSH_JSON과 같은 size(uint32 LE) + payload (network/bin_codec.py)
+PUSH_BIN           = 0x07
+FEATURE_BIN        = "bin"
+BIN_FORMAT_MSGPACK = "msgpack"
+
 # 상태코드
 SUCCESS                 = 0
 ERR_CHECKCODE_MISMATCH  = 1
@@ -69,6 +82,14 @@ class ServerProtocol:
     PUSH_STATUS = PUSH_STATUS
     PUSH_ALERT  = PUSH_ALERT
 
+    REQ_ACK_ID     = REQ_ACK_ID
+    FEATURE_REQ_ID = FEATURE_REQ_ID
+    FEATURE_SUBSCRIBE = FEATURE_SUBSCRIBE
+
+    PUSH_BIN           = PUSH_BIN
+    FEATURE_BIN        = FEATURE_BIN
+    BIN_FORMAT_MSGPACK = BIN_FORMAT_MSGPACK
+
     SUCCESS               = SUCCESS
     ERR_CHECKCODE_MISMATCH= ERR_CHECKCODE_MISMATCH
     ERR_INVALID_DATA      = ERR_INVALID_DATA
@@ -102,7 +123,14 @@ class ServerProtocol:
 
     @staticmethod
     async def send_json(writer, code: int, obj: dict, lock: Optional[asyncio.Lock]=None):
-        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        body = get_codec().encode(obj) # [!] 코덱이 바로 UTF-8 bytes 생성 (msgspec/orjson, 미설치 시 json)
+        size = struct.pack("<I", len(body))
+        header = struct.pack("<II", checkcode, code)
+        await ServerProtocol.send_packet(writer, header + size + body, lock)
+
+    @staticmethod
+    async def send_bin(writer, code: int, body: bytes, lock: Optional[asyncio.Lock]=None):
+        # PUSH_BIN: 헤더(8B) + size(4B) + MessagePack 바디 (BinCodec.encode)
         size = struct.pack("<I", len(body))
         header = struct.pack("<II", checkcode, code)
         await ServerProtocol.send_packet(writer, header + size + body, lock)
@@ -115,6 +143,14 @@ class ServerProtocol:
         body   = struct.pack("<IB", req_code, status)
         await ServerProtocol.send_packet(writer, header + body, lock)
 
+    @staticmethod
+    async def send_ack_id(writer, req_code: int, req_id: int, status: int, lock: Optional[asyncio.Lock]=None):
+        # 헤더(8B): checkcode + REQ_ACK_ID
+        # 바디(9B): req_code(uint32 LE) + req_id(uint32 LE) + status(uint8)
+        header = struct.pack("<II", checkcode, REQ_ACK_ID)
+        body   = struct.pack("<IIB", req_code, req_id, status)
+        await ServerProtocol.send_packet(writer, header + body, lock)
+
     @staticmethod
     async def send_push_status(writer, status: int, lock: Optional[asyncio.Lock]=None):
         # 헤더(8B): checkcode + PUSH_STATUS
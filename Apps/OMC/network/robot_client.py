@@ -15,9 +15,10 @@ from protocol import (
     DriveControl, SensorStatus,
     create_drive_control_packet, parse_sensor_status_data
 )
+from utils.reconnect_scheduler import ReconnectScheduler
 
 class RobotClient:
-    def __init__(self, host="localhost", port=5000):
+    def __init__(self, host="localhost", port=5000, auto_reconnect=False):
         self.host = host
         self.port = port
         self.socket = None
@@ -26,6 +27,11 @@ class RobotClient:
         self.running = False
         self.sequence_no = 0
         self.lock = threading.Lock()
+
+        # 재연결 (지수 백오프 + 지터), auto_reconnect=True일 때 연결 실패/끊김 시 자동 재연결
+        self.auto_reconnect = auto_reconnect
+        self.reconnect = ReconnectScheduler(name=f"robot_client:{host}:{port}")
+        self.reconnect_thread = None
         
         # 센서 데이터 저장용
         self.sensors = {}
@@ -42,12 +48,27 @@ class RobotClient:
         self.on_drive_ack = None
         
     def connect(self):
-        """서버에 연결"""
+        """서버에 연결 (auto_reconnect이면 실패 시 백그라운드에서 재연결 계속)"""
+        self.reconnect.reset()
+        self.running = True
+        if self._open():
+            return True
+        if self.auto_reconnect:
+            self._start_reconnect()
+        else:
+            self.running = False
+        return False
+
+    def _open(self):
+        """연결 1회 시도 후 수신 스레드 시작"""
+        self.reconnect.record_attempt()
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.settimeout(self.reconnect.connect_timeout)
             self.socket.connect((self.host, self.port))
+            self.socket.settimeout(None)
             self.connected = True
-            self.running = True
+            self.reconnect.record_success()
             
             # 수신 스레드 시작
             self.recv_thread = threading.Thread(target=self.receive_loop)
@@ -58,12 +79,33 @@ class RobotClient:
             return True
         except Exception as e:
             print(f"연결 실패: {e}")
+            self.reconnect.record_failure(e)
+            if self.socket:
+                self.socket.close()
+                self.socket = None
             self.connected = False
             return False
+
+    def _start_reconnect(self):
+        if self.reconnect_thread and self.reconnect_thread.is_alive():
+            return
+        self.reconnect_thread = threading.Thread(target=self._reconnect_loop, daemon=True)
+        self.reconnect_thread.start()
+
+    def _reconnect_loop(self):
+        """연결될 때까지 백오프 대기 후 재시도 (disconnect() 시 중단)"""
+        while self.running:
+            delay = self.reconnect.schedule_retry()
+            print(f"{delay:.1f}초 후 재연결을 시도합니다... ({self.host}:{self.port})")
+            if not self.reconnect.wait() or not self.running:
+                break
+            if self._open():
+                break
             
     def disconnect(self):
         """서버 연결 종료"""
         self.running = False
+        self.reconnect.cancel()
         if self.socket:
             try:
                 self.socket.close()
@@ -148,6 +190,10 @@ class RobotClient:
                 except:
                     pass
                 self.socket = None
+            # 의도하지 않은 연결 끊김이면 재연결
+            if self.running and self.auto_reconnect:
+                self.reconnect.record_failure("서버 연결 끊김")
+                self._start_reconnect()
                 
     def process_packet(self, packet):
         """수신된 패킷 처리"""
@@ -0,0 +1,160 @@
+"""
+filename : status_uploader.py
+
+robot_status_data 변경분 업로드 (GUI 스레드 전용)
+- 마지막으로 ACK 받은 스냅샷과 비교해 바뀐 값만 MMS "append"(deepMerge)로 전송
+  (최초 업로드, 키 삭제, 재연결 후에는 set_item으로 전체 교체)
+- 실수 값은 필드별 자릿수로 반올림 후 비교 (센서 잡음으로 인한 업로드 억제)
+- 변경 없음 / 최소 간격 미경과 / 이전 업로드 ACK 대기 중이면 보내지 않음
+- 전체 교체 대비 절약한 바이트 수 집계
+"""
+import json
+import math
+import time
+from typing import Dict, Optional
+
+_NO_VALUE = object()
+
+
+class StatusDeltaUploader:
+    """
+    사용:
+        uploader = StatusDeltaUploader("robot_1.robot_status_data", precision={"*": 3, "latitude": 7})
+        payload = uploader.build(status)   # None이면 보낼 것 없음
+        if payload: send_json(payload) -> 완료 시 uploader.on_ack(ok)
+    """
+
+    def __init__(self, key: str, precision: Optional[Dict[str, int]] = None, max_rate_hz: float = 1.0):
+        """
+        Args:
+            key: 점표기 업로드 경로 (예: "robot_1.robot_status_data")
+            precision: 필드 이름(마지막 키) 또는 점표기 경로 -> 소수 자릿수, "*"는 나머지 실수 기본값
+                       (없으면 반올림 안 함)
+            max_rate_hz: 최대 업로드 빈도 (0 = 제한 없음)
+        """
+        self.key = key
+        self.precision = dict(precision or {})
+        self.max_rate_hz = max_rate_hz
+        self._acked = None       # 서버에 반영된 스냅샷 (None = 전체 교체 필요)
+        self._in_flight = None   # ACK 대기 중인 스냅샷
+        self._last_sent_at = 0.0
+        self.reset_stats()
+
+    # ==========================================================================
+    # 업로드
+    # ==========================================================================
+    def build(self, status: dict, now: float = None) -> Optional[dict]:
+        """ 보낼 JSON 요청 (append 또는 set_item), 보낼 필요 없으면 None """
+        if self._in_flight is not None:
+            return None
+        now = time.monotonic() if now is None else now
+        # 같은 주기의 타이머로 호출해도 지터로 한 주기를 건너뛰지 않도록 10% 여유
+        if self.max_rate_hz > 0 and now - self._last_sent_at < 0.9 / self.max_rate_hz:
+            return None
+
+        snapshot = self._quantize(status or {}, "")
+        full_payload = {"cmd": "set_item", "key": self.key, "value": snapshot}
+        full_bytes = len(json.dumps(full_payload))
+
+        delta = None if self._acked is None else self._diff(self._acked, snapshot)
+        if delta is _NO_VALUE:
+            payload = full_payload  # 키 삭제/타입 변경 -> 전체 교체
+        elif delta is None and self._acked is not None:
+            self.suppressed += 1
+            self.bytes_saved += full_bytes
+            return None
+        elif delta is None:
+            payload = full_payload
+        else:
+            payload = {"cmd": "append", "data": self._nest(delta)}
+
+        sent_bytes = len(json.dumps(payload))
+        self.uploads += 1
+        self.full_uploads += payload is full_payload
+        self.bytes_sent += sent_bytes
+        self.bytes_saved += full_bytes - sent_bytes
+        self._in_flight = snapshot
+        self._last_sent_at = now
+        return payload
+
+    def on_ack(self, ok: bool):
+        """ 업로드 결과 (실패 시 다음 build()에서 마지막 ACK 스냅샷 기준으로 다시 계산) """
+        if ok and self._in_flight is not None:
+            self._acked = self._in_flight
+        elif not ok:
+            self.failures += 1
+        self._in_flight = None
+
+    def reset(self):
+        """ 재연결 등 - 다음 업로드는 전체 교체 """
+        self._acked = None
+        self._in_flight = None
+        self._last_sent_at = 0.0
+
+    # ==========================================================================
+    # 내부
+    # ==========================================================================
+    def _quantize(self, value, path: str):
+        if isinstance(value, dict):
+            return {k: self._quantize(v, f"{path}.{k}" if path else k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._quantize(v, path) for v in value]
+        if isinstance(value, float) and math.isfinite(value):
+            digits = self.precision.get(path)
+            if digits is None:
+                digits = self.precision.get(path.rsplit(".", 1)[-1], self.precision.get("*"))
+            if digits is not None:
+                return round(value, digits)
+        return value
+
+    def _diff(self, prev, curr):
+        """
+        prev -> curr 변경분 (바뀐 값만 담은 중첩 dict)
+        Returns: None(변경 없음) / dict / _NO_VALUE(append로 표현 불가 - 키 삭제, dict<->값 변경)
+        """
+        if not isinstance(curr, dict) or not isinstance(prev, dict):
+            return _NO_VALUE
+        if any(k not in curr for k in prev):
+            return _NO_VALUE
+        delta = {}
+        for k, v in curr.items():
+            if k not in prev:
+                delta[k] = v
+            elif isinstance(v, dict) or isinstance(prev[k], dict):
+                sub = self._diff(prev[k], v)
+                if sub is _NO_VALUE:
+                    return _NO_VALUE
+                if sub is not None:
+                    delta[k] = sub
+            elif v != prev[k] or type(v) is not type(prev[k]):
+                delta[k] = v
+        return delta or None
+
+    def _nest(self, delta: dict) -> dict:
+        """ "robot_1.robot_status_data" + delta -> {"robot_1": {"robot_status_data": delta}} """
+        for part in reversed(self.key.split(".")):
+            delta = {part: delta}
+        return delta
+
+    # ==========================================================================
+    # 통계
+    # ==========================================================================
+    def reset_stats(self):
+        self.uploads = 0
+        self.full_uploads = 0
+        self.suppressed = 0      # 변경 없어 생략한 횟수
+        self.failures = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0     # 매번 전체 교체했을 때 대비
+
+    def stats(self) -> dict:
+        return {
+            "key": self.key,
+            "uploads": self.uploads,
+            "full_uploads": self.full_uploads,
+            "suppressed": self.suppressed,
+            "failures": self.failures,
+            "bytes_sent": self.bytes_sent,
+            "bytes_saved": self.bytes_saved,
+            "in_flight": self._in_flight is not None,
+        }
@@ -0,0 +1,142 @@
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+# ==============================================================================
+# 표적 처리 서버 프레임 전송 규격
+# ==============================================================================
+# - FRAMING_LEGACY   : [길이(4, >L)] [JPEG]
+# - FRAMING_SEQUENCED: [매직 'AFR1'(4)] [frame_seq(4, >L)] [capture_ts(8, >d, epoch 초)] [길이(4, >L)] [JPEG]
+#   서버는 탐지 결과 JSON에 "frame_seq"를 그대로 넣어 응답 (결과 수신 규격은 동일: [길이(4)] [JSON])
+#   레거시 서버는 frame_seq 없이 프레임 순서대로 응답한다고 가정하고 송신 순서(FIFO)로 매칭
+FRAMING_LEGACY = "legacy"
+FRAMING_SEQUENCED = "sequenced"
+
+FRAME_MAGIC = b'AFR1'
+LEGACY_HEADER_STRUCT = struct.Struct('>L')
+SEQUENCED_HEADER_STRUCT = struct.Struct('>4sLdL')  # 20 bytes
+
+RESULT_SEQ_KEY = "frame_seq"
+
+
+def build_frame_header(framing: str, frame_seq: int, capture_ts: float, data_len: int) -> bytes:
+    """ JPEG 앞에 붙일 프레임 헤더 생성 """
+    if framing == FRAMING_SEQUENCED:
+        return SEQUENCED_HEADER_STRUCT.pack(FRAME_MAGIC, frame_seq & 0xFFFFFFFF, capture_ts, data_len)
+    return LEGACY_HEADER_STRUCT.pack(data_len)
+
+
+class InFlightFrame(NamedTuple):
+    """ 결과를 기다리는 전송 완료 프레임 """
+    frame_seq: int
+    capture_ts: float  # 프레임 캡처 시각 (time.time)
+    sent_at: float     # 전송 완료 시각 (time.monotonic)
+
+
+class InFlightWindow:
+    """
+    결과 대기 중인 프레임 윈도우 (송신 스레드 acquire -> 수신 스레드 complete)
+    - 최대 max_in_flight개까지 결과 없이 연속 전송 (서버 지연이 커도 처리량 유지)
+    - 윈도우가 가득 차면 acquire()가 빈 자리가 날 때까지 대기 (timeout 시 False -> 프레임 드롭)
+    - result_timeout 동안 결과가 오지 않은 프레임은 서버가 버린 것으로 보고 만료 처리
+    - 결과 매칭: frame_seq가 있으면 해당 프레임, 없으면 가장 오래된 프레임 (레거시 서버)
+    """
+    EMA_ALPHA = 0.1
+
+    def __init__(self, max_in_flight: int = 4, result_timeout: float = 2.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.result_timeout = result_timeout
+        self._frames = OrderedDict()  # frame_seq -> InFlightFrame (송신 순서)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def acquire(self, frame_seq: int, capture_ts: float, timeout: Optional[float] = None) -> bool:
+        """ (송신 스레드) 전송 전 윈도우 자리 확보. 자리가 없으면 timeout까지 대기 """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._closed:
+                self._expire(time.monotonic())
+                if len(self._frames) < self.max_in_flight:
+                    self._frames[frame_seq] = InFlightFrame(frame_seq, capture_ts, time.monotonic())
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.window_full += 1
+                    return False
+                oldest = next(iter(self._frames.values()))
+                expire_in = oldest.sent_at + self.result_timeout - time.monotonic()
+                self._cond.wait(max(0.0, expire_in if remaining is None else min(remaining, expire_in)))
+            return False
+
+    def release(self, frame_seq: int):
+        """ (송신 스레드) 전송 실패 시 확보한 자리 반환 """
+        with self._cond:
+            if self._frames.pop(frame_seq, None) is not None:
+                self._cond.notify()
+
+    def complete(self, frame_seq: Optional[int] = None) -> Optional[InFlightFrame]:
+        """ (수신 스레드) 결과 수신 - 매칭된 프레임 반환 (없으면 None) """
+        with self._cond:
+            if frame_seq is None:
+                entry = self._frames.popitem(last=False)[1] if self._frames else None
+            else:
+                entry = self._frames.pop(frame_seq, None)
+            if entry is None:
+                self.unmatched += 1
+                return None
+            self.completed += 1
+            now = time.monotonic()
+            self.rtt_ms = self._ema(self.rtt_ms, (now - entry.sent_at) * 1000.0)
+            self.latency_ms = self._ema(self.latency_ms, (time.time() - entry.capture_ts) * 1000.0)
+            self._cond.notify()
+            return entry
+
+    def close(self):
+        """ 연결 종료: 대기 중인 acquire() 해제 및 윈도우 비움 """
+        with self._cond:
+            self._closed = True
+            self._frames.clear()
+            self._cond.notify_all()
+
+    def reopen(self):
+        """ 새 연결 시작 """
+        with self._cond:
+            self._closed = False
+            self._frames.clear()
+
+    def _expire(self, now: float):
+        while self._frames:
+            oldest = next(iter(self._frames.values()))
+            if now - oldest.sent_at < self.result_timeout:
+                break
+            self._frames.popitem(last=False)
+            self.expired += 1
+
+    def _ema(self, prev: float, value: float) -> float:
+        return value if prev == 0.0 else prev + self.EMA_ALPHA * (value - prev)
+
+    def reset_stats(self):
+        self.completed = 0
+        self.expired = 0       # 결과 없이 시간 초과된 프레임
+        self.unmatched = 0     # 대기 프레임과 매칭되지 않은 결과
+        self.window_full = 0   # 윈도우가 가득 차 전송하지 못한 프레임
+        self.rtt_ms = 0.0      # 전송 완료 -> 결과 수신 (EMA)
+        self.latency_ms = 0.0  # 프레임 캡처 -> 결과 수신 (EMA)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._frames),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "expired": self.expired,
+            "unmatched": self.unmatched,
+            "window_full": self.window_full,
+            "rtt_ms": round(self.rtt_ms, 2),
+            "latency_ms": round(self.latency_ms, 2),
+        }
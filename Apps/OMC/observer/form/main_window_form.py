@@ -1,19 +1,25 @@
 import sys
+import time
 import cv2
 import numpy as np
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLineEdit, QPushButton, QGroupBox, QFormLayout, QLabel, QTextEdit,
-    QTabWidget, QGridLayout, QListWidget
+    QTabWidget, QGridLayout, QListWidget, QCheckBox
 )
 from PySide6.QtCore import Slot, QRect, QTimer, Qt
 from PySide6.QtGui import QPixmap, QColor, QImage  # (예시용)
+from PySide6.QtNetwork import QNetworkInformation
 
-from network_thread_observer import NetworkThread
+from multi_robot_transport_observer import MultiRobotTransport
+from telemetry_bridge_observer import TelemetryBridge, TelemetryKind
+from utils.reconnect_scheduler import ReconnectScheduler
 from tracking_video_wiget_observer import TrackingVideoWidget 
 from joystick_thread import JoystickThread
-from video_thread_observer import VideoThread
+from video.video_thread import VideoThread
+from video.frame_metrics import draw_latency_hud
+from video.recorder import StreamRecorder
 from rtsp_img_sender_observer import ImageSender
 from packet_protocol_observer import *
 """
@@ -33,10 +39,13 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("감시장비 통합 제어 시스템 (1, 2호기)")
         self.setGeometry(100, 100, 1920, 700)
         
-        # 1. 네트워크 스레드 2개 생성
-        self.network_thread_1 = NetworkThread(robot_id=1)
-        self.network_thread_2 = NetworkThread(robot_id=2)        
-        self.threads = {1: self.network_thread_1, 2: self.network_thread_2}
+        # 1. 네트워크 통신 (로봇 1, 2호기)
+        #    [!] 모터/추적/전원 정보는 텔레메트리 브리지에 최신값만 기록 (GUI 타이머가 주기적으로 drain)
+        self.telemetry = TelemetryBridge()
+        #    [!] 로봇마다 QThread(NetworkThread)를 만들지 않고 스레드 1개(selectors)로 모든 로봇 소켓 처리
+        #        self.threads[robot_id]는 NetworkThread와 같은 API를 가진 RobotChannel
+        self.transport = MultiRobotTransport(telemetry=self.telemetry)
+        self.threads = {robot_id: self.transport.channel(robot_id) for robot_id in (1, 2)}
          
          # [!] 2. 조이스틱 스레드
         self.joystick_thread = JoystickThread()
@@ -51,6 +60,7 @@ class MainWindow(QMainWindow):
                 
         # [!] 영상 관련 초기화
         self.video_thread = VideoThread()
+        self.recorder = StreamRecorder("recordings", prefix="observer") # [!] 재인코딩 없는 녹화 (PyAV 백엔드 필요)
         self.image_sender = ImageSender()
         self.current_video_source = "EO" # or "IR"
          
@@ -64,10 +74,19 @@ class MainWindow(QMainWindow):
         self.heartbeat_timer = QTimer(self)
         self.heartbeat_timer.timeout.connect(self.send_heartbeats)
         self.heartbeat_timer.start(1000)
+
+        # [!] 텔레메트리 drain 타이머 (30Hz) - 패킷 수와 무관하게 GUI 갱신 주기 고정
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.timeout.connect(self.drain_telemetry)
+        self.telemetry_timer.start(1000 // 30)
         
         # 7. 조이스틱 스레드 시작
         self.joystick_thread.start()
 
+        # [!] 8. OS 네트워크 도달성 변경 시 재연결 대기 중인 모든 소켓을 즉시 재시도
+        if QNetworkInformation.loadDefaultBackend():
+            QNetworkInformation.instance().reachabilityChanged.connect(self.on_network_reachability_changed)
+
     def _init_ui(self):
         main_widget = QWidget()
         main_layout = QHBoxLayout(main_widget)
@@ -113,9 +132,17 @@ class MainWindow(QMainWindow):
         self.btn_view_stop = QPushButton("영상 중지") # [!] 영상 중지 버튼 추가
         self.lbl_video_source = QLabel("소스: N/A")
         self.lbl_video_source.setStyleSheet("color: gray; font-weight: bold;")
+        self.cb_latency_hud = QCheckBox("지연 HUD") # [!] 영상 경로 단계별 지연 표시
+        self.cb_latency_csv = QCheckBox("지연 CSV") # [!] 프레임별 지연 CSV 기록
         source_layout.addWidget(self.btn_view_eo)
         source_layout.addWidget(self.btn_view_ir)
         source_layout.addWidget(self.btn_view_stop) # [!] 레이아웃에 추가
+        source_layout.addWidget(self.cb_latency_hud)
+        source_layout.addWidget(self.cb_latency_csv)
+        self.cb_record = QCheckBox("녹화") # [!] 연속 녹화 (분할/보존 한도)
+        self.btn_save_event = QPushButton("이벤트 저장") # [!] 이전/이후 구간 클립 저장
+        source_layout.addWidget(self.cb_record)
+        source_layout.addWidget(self.btn_save_event)
         source_layout.addWidget(self.lbl_video_source)
  
         # [!] TrackingVideoWidget 사용
@@ -279,14 +306,14 @@ class MainWindow(QMainWindow):
         self.btn_connect_1.clicked.connect(lambda: self.on_connect_clicked(1))
         self.btn_connect_2.clicked.connect(lambda: self.on_connect_clicked(2))
 
-        # 2. 네트워크 스레드 -> GUI (2개 스레드 모두 연결)
-        for thread in self.threads.values():
-            thread.connection_status.connect(self.on_connection_status)
-            thread.log_message.connect(self.log)
-            thread.received_motor_info.connect(self.on_motor_info_update)
-            thread.received_tracking_status.connect(self.on_tracking_status)
-            thread.received_power_status.connect(self.on_power_status_update)
-            thread.received_heartbeat.connect(self.on_heartbeat_received)
+        # 2. 네트워크 통신 스레드 -> GUI (시그널의 robot_id로 로봇 구분)
+        self.transport.connection_status.connect(self.on_connection_status)
+        self.transport.log_message.connect(self.log)
+        self.transport.received_motor_info.connect(self.on_motor_info_update)
+        self.transport.received_motor_info_batch.connect(self.on_motor_info_batch)
+        self.transport.received_tracking_status.connect(self.on_tracking_status)
+        self.transport.received_power_status.connect(self.on_power_status_update)
+        self.transport.received_heartbeat.connect(self.on_heartbeat_received)
 
         # 3. 1호기/2호기 추적 버튼
         self.btn_track_mode_1.clicked.connect(
@@ -363,7 +390,17 @@ class MainWindow(QMainWindow):
         self.btn_view_stop.clicked.connect(self.on_video_stop_clicked) # [!] 중지 버튼 시그널 연결
 
         self.video_thread.change_pixmap_signal.connect(self.update_video_frame)
+        self.video_thread.scaled_frame_signal.connect(self.on_scaled_video_frame) # [!] 영상 스레드에서 축소된 표시용 프레임
+        self.video_thread.set_output("display", self.video_widget.size())
         self.video_thread.connection_lost_signal.connect(self.on_video_connection_lost)
+        self.video_thread.connection_restored_signal.connect(self.on_video_connection_restored) # [!] 자동 재연결 성공
+        self.cb_latency_csv.toggled.connect(self.on_latency_csv_toggled)
+        if self.recorder.attach(self.video_thread):
+            self.cb_record.toggled.connect(self.on_record_toggled)
+            self.btn_save_event.clicked.connect(self.on_save_event_clicked)
+        else:
+            self.cb_record.setEnabled(False)
+            self.btn_save_event.setEnabled(False)
 
         self.image_sender.connection_signal.connect(self.on_server_connection_status)
         self.image_sender.log_signal.connect(self.log)
@@ -373,10 +410,12 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         self.log("프로그램 종료 중... 스레드 정리...")
         self.heartbeat_timer.stop()
-        self.network_thread_1.stop()
-        self.network_thread_2.stop()
+        self.telemetry_timer.stop()
+        self.transport.stop() # [!] 모든 로봇 연결 종료
         self.joystick_thread.stop() # [!] 조이스틱 스레드 종료
         self.video_thread.stop()  # [!] 영상 스레드 종료
+        self.video_thread.latency.stop_csv()
+        self.recorder.detach() # [!] 녹화 파일 닫기
         self.image_sender.disconnect() # [!] 서버 연결 해제
         event.accept()
         
@@ -394,6 +433,28 @@ class MainWindow(QMainWindow):
     def log(self, message: str):
         self.log_edit.append(message)
 
+    @Slot(QNetworkInformation.Reachability)
+    def on_network_reachability_changed(self, reachability):
+        """ 네트워크 복구 힌트 -> 백오프 대기 중인 재연결을 바로 시도 """
+        if reachability in (QNetworkInformation.Reachability.Local,
+                            QNetworkInformation.Reachability.Site,
+                            QNetworkInformation.Reachability.Online):
+            self.log(f"네트워크 상태 변경 감지 ({reachability.name}), 재연결 즉시 시도")
+            ReconnectScheduler.hint_all()
+
+    @Slot()
+    def drain_telemetry(self):
+        """ (30Hz) 텔레메트리 브리지에서 마지막 drain 이후 갱신된 최신값만 GUI에 반영 """
+        for (robot_id, kind), value in self.telemetry.drain().items():
+            if kind == TelemetryKind.MOTOR_INFO_BATCH:
+                self.on_motor_info_batch(robot_id, value)
+            elif kind == TelemetryKind.MOTOR_INFO:
+                self.on_motor_info_update(robot_id, value)
+            elif kind == TelemetryKind.TRACKING_STATUS:
+                self.on_tracking_status(robot_id, value)
+            elif kind == TelemetryKind.POWER_STATUS:
+                self.on_power_status_update(robot_id, value)
+
     @Slot()
     def send_heartbeats(self):
         """ 1초마다 연결된 로봇에게 Heartbeat 전송 """
@@ -566,6 +627,19 @@ class MainWindow(QMainWindow):
         except AttributeError:
             pass # 위젯이 아직 없거나 삭제된 경우
 
+    @Slot(int, object)
+    def on_motor_info_batch(self, robot_id: int, frames):
+        """ 모터 및 카메라 구동 정보 배치 수신 (수신 청크당 1회, 표시는 마지막 프레임 기준) """
+        if len(frames) == 0: return
+        try:
+            lbl = getattr(self, f"lbl_motor_status_{robot_id}")
+            latest = frames[-1]
+            pan = latest['pan'] / 100.0
+            tilt = latest['tilt'] / 100.0
+            lbl.setText(f"Pan: {pan:.2f}°, Tilt: {tilt:.2f}°")
+        except AttributeError:
+            pass # 위젯이 아직 없거나 삭제된 경우
+
     @Slot(int, dict)
     def on_tracking_status(self, robot_id: int, status: dict):
         """ (1Hz) 추적 상태 수신 """
@@ -870,21 +944,49 @@ class MainWindow(QMainWindow):
         self.video_thread.start()
         self.log(f"영상 소스 변경: {source} ({url})")
 
-    @Slot(np.ndarray)
-    def update_video_frame(self, frame_cv):
-        """ VideoThread로부터 받은 프레임을 UI에 표시하고 서버로 전송 """
-        # 1. 표적 처리 서버로 전송
-        self.image_sender.send_frame(frame_cv)
-        
-        # 2. UI 표시를 위해 QPixmap 변환
-        rgb_frame = cv2.cvtColor(frame_cv, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        q_img = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_img)
-        
-        # 3. 위젯에 표시
-        self.video_widget.set_pixmap(pixmap)
+    @Slot(np.ndarray, object)
+    def update_video_frame(self, frame_cv, meta=None):
+        """ VideoThread로부터 받은 원본 프레임을 표적 처리 서버로 전송 """
+        # [!] 수정: 화면 표시는 영상 스레드가 위젯 크기로 축소한 프레임으로 처리 (on_scaled_video_frame)
+        # [!] 캡처 시각은 디코딩 완료 시각 (결과 latency_ms = 디코딩 -> 결과 수신)
+        self.image_sender.send_frame(frame_cv, meta.wall_ts if meta is not None else None)
+
+    @Slot(str, object)
+    def on_scaled_video_frame(self, name, scaled):
+        """ 영상 스레드에서 위젯 크기로 축소된 프레임 표시 (GUI 스레드는 QPixmap 교체만) """
+        overlay = None
+        if self.cb_latency_hud.isChecked():
+            lines = self.video_thread.latency.hud_lines()
+            overlay = lambda image, scale: draw_latency_hud(image, lines)
+        self.video_widget.set_scaled_frame(scaled, overlay)
+        self.video_thread.set_output(name, self.video_widget.size()) # 위젯 크기 변경 시 다음 프레임부터 반영
+
+    @Slot(bool)
+    def on_latency_csv_toggled(self, checked):
+        """ [!] 프레임별 지연 CSV 기록 시작/중지 (실행 폴더에 latency_YYYYmmdd_HHMMSS.csv) """
+        if checked:
+            path = time.strftime("latency_%Y%m%d_%H%M%S.csv")
+            self.video_thread.latency.start_csv(path)
+            self.log(f"영상 지연 CSV 기록 시작: {path}")
+        else:
+            self.video_thread.latency.stop_csv()
+            self.log("영상 지연 CSV 기록 중지")
+
+    @Slot(bool)
+    def on_record_toggled(self, checked):
+        """ [!] 연속 녹화 시작/중지 (다음 키프레임부터 recordings/ 에 분할 저장) """
+        if checked:
+            self.recorder.start_recording()
+            self.log(f"영상 녹화 시작: {self.recorder.output_dir}")
+        else:
+            self.recorder.stop_recording()
+            self.log("영상 녹화 중지")
+
+    @Slot()
+    def on_save_event_clicked(self):
+        """ [!] 이벤트 클립 저장 (이전 pre_event_seconds + 이후 post_event_seconds) """
+        path = self.recorder.save_event(self.current_video_source)
+        self.log(f"이벤트 영상 저장: {path}")
 
     @Slot()
     def on_video_stop_clicked(self):
@@ -903,17 +1005,28 @@ class MainWindow(QMainWindow):
     @Slot()
     def on_video_connection_lost(self):
         #self.log("RTSP 영상 연결이 끊어졌습니다.")
-        self.log(f"RTSP 영상 연결이 끊어졌습니다: {self.current_video_source}")
-        self.lbl_video_source.setText(f"{self.current_video_source} 연결 실패")
+        # [!] 수정: VideoThread가 백오프 후 자동 재연결하므로 소스 상태는 유지 (중지 버튼으로만 중단)
+        self.log(f"RTSP 영상 연결이 끊어졌습니다: {self.current_video_source} (재연결 시도 중)")
+        self.lbl_video_source.setText(f"{self.current_video_source} 연결 실패 - 재연결 중")
         self.lbl_video_source.setStyleSheet("color: red; font-weight: bold;")
         self.video_widget.set_pixmap(self.dummy_pixmap) # [!] 연결 실패 시 검은 화면
-        self.current_video_source = "N/A" # 상태 초기화
+
+    @Slot()
+    def on_video_connection_restored(self):
+        """ [!] VideoThread 자동 재연결 후 첫 프레임 수신 """
+        self.log(f"RTSP 영상 수신 중: {self.current_video_source}")
+        self.lbl_video_source.setText(f"현재 소스: {self.current_video_source}")
+        self.lbl_video_source.setStyleSheet(
+            f"color: {'blue' if self.current_video_source == 'EO' else 'orange'}; font-weight: bold;")
 
     @Slot(dict)
     def on_detection_result(self, result):
         """ 표적 처리 서버로부터 받은 결과 처리 """       
         try:
             msg = f"[{result.get('timestamp', '?')}] {len(result.get('detections', []))} objects detected"
+            if 'latency_ms' in result: # [!] 결과가 속한 프레임 번호 및 캡처 -> 결과 수신 지연
+                msg += f" (frame #{result['frame_seq']}, {result['latency_ms']:.0f} ms)"
+                self.video_thread.latency.record("detect", result['latency_ms'])
             self.detect_list.addItem(msg)
             self.detect_list.scrollToBottom()
             # (결과를 video_widget으로 전달하여 바운딩 박스 그리기)
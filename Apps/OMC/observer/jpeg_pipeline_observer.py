@@ -0,0 +1,274 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+
+class JpegEncodePipeline:
+    """
+    비동기 JPEG 인코딩/송신 파이프라인 (GUI 스레드 블로킹 없음)
+    - submit(): GUI 스레드는 최신 프레임 슬롯에 참조만 넣고 즉시 반환 (이전 미처리 프레임은 드롭)
+    - 인코더 워커 N개: target_fps 간격으로 슬롯에서 프레임을 꺼내 cv2.imencode (GIL 해제 구간)
+    - 송신 스레드 1개: 인코딩 완료 프레임 중 가장 최신 것만 send_func(data, frame_id, capture_ts)로 전송
+    - 적응 제어: 송신이 밀리면(송신 시간 > 프레임 간격, 또는 송신 대기 프레임 드롭)
+      JPEG 품질을 먼저 낮추고, 최저 품질이면 해상도를 줄임. 여유가 생기면 역순으로 복구
+    """
+    SCALE_LEVELS = (1.0, 0.75, 0.5)  # 다운스케일 단계
+    RECOVER_AFTER = 30               # 연속 N프레임 여유 시 한 단계 복구
+    EMA_ALPHA = 0.1                  # 통계 지수이동평균 계수
+
+    def __init__(self, send_func: Callable[[bytes, int, float], None],
+                 target_fps: float = 15.0,
+                 quality: int = 80,
+                 min_quality: int = 40,
+                 quality_step: int = 10,
+                 workers: int = 2,
+                 adaptive: bool = True,
+                 before_send: Optional[Callable[[int, float], bool]] = None):
+        """
+        Args:
+            send_func: 인코딩된 JPEG bytes를 전송하는 함수 (송신 스레드에서 호출, 예외 시 파이프라인 정지)
+            target_fps: 최대 전송 프레임률 (0 이하면 제한 없음)
+            quality: JPEG 품질 (최대값, 적응 제어 시 여기까지 복구)
+            min_quality: 적응 제어 시 최저 JPEG 품질
+            workers: 인코더 워커 스레드 수
+            before_send: 전송 직전 호출 (frame_id, capture_ts), False 반환 시 전송하지 않고 드롭
+                         (예: 결과 대기 윈도우 가득 참, 대기 시간은 송신 시간 측정에서 제외)
+        """
+        self.send_func = send_func
+        self.target_fps = target_fps
+        self.max_quality = quality
+        self.min_quality = min_quality
+        self.quality_step = quality_step
+        self.worker_count = max(1, workers)
+        self.adaptive = adaptive
+        self.before_send = before_send
+
+        # 현재 인코딩 설정 (적응 제어로 변경)
+        self.quality = quality
+        self.scale_index = 0
+
+        self._cond = threading.Condition()
+        self._latest_frame = None     # (frame_id, capture_ts, frame) - GUI 스레드가 덮어씀
+        self._frame_id = 0
+        self._encoded = None          # (frame_id, capture_ts, jpeg bytes) - 송신 대기 (최신만 유지)
+        self._last_sent_id = 0
+        self._next_due = 0.0          # 다음 인코딩 허용 시각 (target_fps 간격)
+        self._is_running = False
+        self._threads = []
+        self._healthy_frames = 0
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+        self.reset_stats()
+
+    # ==========================================================================
+    # 제어
+    # ==========================================================================
+    def start(self):
+        if self._is_running:
+            return
+        self._is_running = True
+        self._threads = [
+            threading.Thread(target=self._encode_worker, name=f"jpeg-encoder-{i}", daemon=True)
+            for i in range(self.worker_count)
+        ]
+        self._threads.append(threading.Thread(target=self._send_worker, name="jpeg-sender", daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._is_running = False
+            self._latest_frame = None
+            self._encoded = None
+            self._cond.notify_all()
+        current = threading.current_thread()
+        for t in self._threads:
+            if t is not current:
+                t.join(timeout)
+        self._threads = []
+
+    def submit(self, frame: np.ndarray, capture_ts: float = None) -> int:
+        """
+        (GUI 스레드) 최신 프레임 등록 - 복사/인코딩 없이 즉시 반환
+        Returns: 프레임 ID (send_func에 그대로 전달됨, 정지 상태면 0)
+        """
+        if capture_ts is None:
+            capture_ts = time.time()
+        with self._cond:
+            if not self._is_running:
+                return 0
+            self._frame_id += 1
+            if self._latest_frame is not None:
+                self.dropped_frames += 1  # 인코더가 가져가기 전에 새 프레임으로 교체
+            self._latest_frame = (self._frame_id, capture_ts, frame)
+            self.submitted_frames += 1
+            self._cond.notify()
+            return self._frame_id
+
+    def set_target_fps(self, fps: float):
+        self.target_fps = fps
+
+    def set_quality(self, quality: int):
+        """ 최대 품질 변경 (적응 제어 상태 초기화) """
+        self.max_quality = quality
+        self.quality = quality
+        self.scale_index = 0
+
+    @property
+    def scale(self) -> float:
+        return self.SCALE_LEVELS[self.scale_index]
+
+    # ==========================================================================
+    # 워커
+    # ==========================================================================
+    def _take_frame(self):
+        """ target_fps 간격이 되면 최신 프레임을 꺼냄 (정지 시 None) """
+        with self._cond:
+            while self._is_running:
+                if self._latest_frame is not None:
+                    now = time.monotonic()
+                    if now >= self._next_due:
+                        item = self._latest_frame
+                        self._latest_frame = None
+                        interval = 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+                        self._next_due = max(self._next_due + interval, now)
+                        return item
+                    self._cond.wait(self._next_due - now)
+                else:
+                    self._cond.wait()
+            return None
+
+    def _encode_worker(self):
+        while True:
+            item = self._take_frame()
+            if item is None:
+                return
+            frame_id, capture_ts, frame = item
+            quality, scale = self.quality, self.scale
+
+            t0 = time.perf_counter()
+            try:
+                if scale != 1.0:
+                    frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                ok, encoded = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+            except cv2.error:
+                ok = False
+            encode_ms = (time.perf_counter() - t0) * 1000.0
+            if not ok:
+                self.encode_errors += 1
+                continue
+
+            data = encoded.tobytes()
+            with self._cond:
+                self.encode_ms = self._ema(self.encode_ms, encode_ms)
+                self.encoded_frames += 1
+                if frame_id <= self._last_sent_id or (self._encoded and self._encoded[0] > frame_id):
+                    self.dropped_frames += 1  # 다른 워커가 더 최신 프레임을 먼저 끝냄
+                    continue
+                if self._encoded is not None:
+                    self.dropped_frames += 1  # 송신이 밀려 대기 중이던 프레임 교체
+                    self._on_backpressure()
+                self._encoded = (frame_id, capture_ts, data)
+                self._cond.notify_all()
+
+    def _send_worker(self):
+        while True:
+            with self._cond:
+                while self._is_running and self._encoded is None:
+                    self._cond.wait()
+                if not self._is_running:
+                    return
+                frame_id, capture_ts, data = self._encoded
+                self._encoded = None
+                self._last_sent_id = frame_id
+
+            if self.before_send is not None and not self.before_send(frame_id, capture_ts):
+                with self._cond:
+                    self.dropped_frames += 1
+                continue
+
+            t0 = time.perf_counter()
+            try:
+                self.send_func(data, frame_id, capture_ts)
+            except Exception as e:
+                with self._cond:
+                    self._is_running = False
+                    self._cond.notify_all()
+                if self.on_error is not None:
+                    self.on_error(e)
+                return
+            send_ms = (time.perf_counter() - t0) * 1000.0
+
+            with self._cond:
+                self.sent_frames += 1
+                self.sent_bytes += len(data)
+                self.bytes_per_frame = self._ema(self.bytes_per_frame, len(data))
+                self.send_ms = self._ema(self.send_ms, send_ms)
+                interval_ms = 1000.0 / self.target_fps if self.target_fps > 0 else 0.0
+                if interval_ms and send_ms > interval_ms:
+                    self._on_backpressure()  # 소켓 송신 버퍼가 가득 차 sendall이 지연됨
+                else:
+                    self._on_healthy()
+
+    # ==========================================================================
+    # 적응 제어 (self._cond 보유 상태에서 호출)
+    # ==========================================================================
+    def _on_backpressure(self):
+        self._healthy_frames = 0
+        if not self.adaptive:
+            return
+        self.backpressure_events += 1
+        if self.quality > self.min_quality:
+            self.quality = max(self.min_quality, self.quality - self.quality_step)
+        elif self.scale_index < len(self.SCALE_LEVELS) - 1:
+            self.scale_index += 1
+
+    def _on_healthy(self):
+        if not self.adaptive:
+            return
+        self._healthy_frames += 1
+        if self._healthy_frames < self.RECOVER_AFTER:
+            return
+        self._healthy_frames = 0
+        if self.scale_index > 0:
+            self.scale_index -= 1
+        elif self.quality < self.max_quality:
+            self.quality = min(self.max_quality, self.quality + self.quality_step)
+
+    # ==========================================================================
+    # 통계
+    # ==========================================================================
+    def _ema(self, prev: float, value: float) -> float:
+        return value if prev == 0.0 else prev + self.EMA_ALPHA * (value - prev)
+
+    def reset_stats(self):
+        self.submitted_frames = 0
+        self.encoded_frames = 0
+        self.sent_frames = 0
+        self.sent_bytes = 0
+        self.dropped_frames = 0
+        self.encode_errors = 0
+        self.backpressure_events = 0
+        self.encode_ms = 0.0        # 프레임당 인코딩 시간 (EMA)
+        self.send_ms = 0.0          # 프레임당 송신 시간 (EMA)
+        self.bytes_per_frame = 0.0  # 프레임당 JPEG 크기 (EMA)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted_frames,
+            "encoded": self.encoded_frames,
+            "sent": self.sent_frames,
+            "sent_bytes": self.sent_bytes,
+            "dropped": self.dropped_frames,
+            "encode_errors": self.encode_errors,
+            "backpressure": self.backpressure_events,
+            "encode_ms": round(self.encode_ms, 2),
+            "send_ms": round(self.send_ms, 2),
+            "bytes_per_frame": int(self.bytes_per_frame),
+            "quality": self.quality,
+            "scale": self.scale,
+            "target_fps": self.target_fps,
+        }
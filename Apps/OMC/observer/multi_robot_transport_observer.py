@@ -0,0 +1,446 @@
+import errno
+import selectors
+import socket
+import time
+from collections import deque
+from enum import IntEnum
+from functools import partial
+from typing import Dict
+
+from PySide6.QtCore import QThread, Signal
+from observer.packet_protocol_observer import (
+    PacketProtocol, ContentTypeMapper, CommandType, ResponseType
+)
+from observer.receive_buffer_observer import PacketReceiver
+from observer.send_queue_observer import CommandQueue
+from observer.telemetry_bridge_observer import TelemetryKind
+from utils.reconnect_scheduler import ReconnectScheduler
+
+# 비동기 connect 진행 중을 의미하는 errno (Windows: WSAEWOULDBLOCK=10035)
+_CONNECT_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}
+
+
+class ChannelState(IntEnum):
+    DISCONNECTED = 0
+    CONNECTING   = 1
+    CONNECTED    = 2
+
+
+class RobotChannel:
+    """
+    MultiRobotTransport 안의 로봇 1대분 연결 상태
+    - NetworkThread와 같은 호출 API(connect_to_server/stop/send_command/isRunning/_is_running)를
+      제공하므로 MainWindow의 self.threads[robot_id] 자리에 그대로 사용 가능
+    - 소켓/수신 버퍼/송신 버퍼는 transport 스레드만 접근 (GUI 스레드는 요청만 전달)
+    """
+
+    def __init__(self, transport: "MultiRobotTransport", robot_id: int):
+        self.transport = transport
+        self.robot_id = robot_id
+        self.host = None
+        self.port = None
+        self._is_running = False  # 사용자 연결 의도 (NetworkThread 호환)
+
+        self.sock = None
+        self.state = ChannelState.DISCONNECTED
+        self.connect_deadline = 0.0  # 연결 시도 타임아웃 시각
+        # 재연결 스케줄러 (지수 백오프 + 지터), 힌트를 받으면 transport 루프를 깨움
+        self.reconnect = ReconnectScheduler(name=f"robot{robot_id}", on_hint=transport._wakeup)
+
+        self.receiver = PacketReceiver(
+            partial(transport._on_packet, self),
+            motor_batch_handler=partial(transport._on_motor_info_batch, self)
+        )
+        self.send_queue = CommandQueue(maxsize=64)
+        self.out_buffer = bytearray()  # 아직 커널로 넘기지 못한 송신 바이트
+        self.tx_sequence_num = 0
+
+        # 통계
+        self.rx_bytes = 0
+        self.rx_packets = 0
+        self.tx_bytes = 0
+        self.tx_build_errors = 0
+
+    # --- NetworkThread 호환 API (GUI 스레드) ---
+    def connect_to_server(self, host: str, port: int):
+        self.transport.connect_robot(self.robot_id, host, port)
+
+    def stop(self):
+        self.transport.disconnect_robot(self.robot_id)
+
+    def send_command(self, cmd_type: CommandType, payload: bytes):
+        self.transport.send_command(self.robot_id, cmd_type, payload)
+
+    def isRunning(self) -> bool:
+        return self.transport.isRunning()
+
+    def is_connected(self) -> bool:
+        return self.state == ChannelState.CONNECTED
+
+    def stats(self) -> dict:
+        stats = self.send_queue.stats()
+        stats.update({
+            "state": self.state.name,
+            "rx_bytes": self.rx_bytes,
+            "rx_packets": self.rx_packets,
+            "tx_bytes": self.tx_bytes,
+            "tx_pending": len(self.out_buffer),
+            "tx_build_errors": self.tx_build_errors,
+            "reconnect": self.reconnect.stats(),
+        })
+        return stats
+
+
+class MultiRobotTransport(QThread):
+    """
+    selectors 기반 다중 로봇 TCP 통신 스레드 (스레드 1개로 N대 처리)
+    - 모든 로봇 소켓을 non-blocking으로 하나의 selector에 등록
+    - 시그널은 NetworkThread와 동일 (robot_id로 구분)
+    - GUI 스레드의 요청(연결/해제/송신)은 요청 큐 + wakeup 소켓으로 transport 스레드에 전달
+    - robot_id는 ContentType ID 하위 4bit를 사용하므로 1~15
+    """
+    connection_status = Signal(int, bool)     # (robot_id, connected)
+    received_motor_info = Signal(int, dict)   # (robot_id, info)
+    received_motor_info_batch = Signal(int, object)  # (robot_id, frames)
+    received_tracking_status = Signal(int, dict) # (robot_id, status)
+    received_heartbeat = Signal(int)        # (robot_id)
+    received_power_status = Signal(int, dict) # (robot_id, info)
+    log_message = Signal(str)
+
+    MAX_SELECT_TIMEOUT = 1.0
+    # 송신 버퍼가 이 크기 미만일 때만 송신 큐에서 명령을 꺼냄
+    # (커널이 못 받는 동안 명령은 유한 큐에 남아 병합/드롭되도록 함)
+    TX_LOW_WATER = 4096
+
+    def __init__(self, parent=None, telemetry=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self._channels: Dict[int, RobotChannel] = {}
+        self._requests = deque()  # GUI 스레드 -> transport 스레드 (callable)
+        self._is_running = False
+
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    # ==========================================================================
+    # GUI 스레드 API
+    # ==========================================================================
+    def channel(self, robot_id: int) -> RobotChannel:
+        """ robot_id의 채널 (없으면 생성) """
+        if not 1 <= robot_id <= 0xF:
+            raise ValueError(f"robot_id는 1~15 범위여야 합니다: {robot_id}")
+        ch = self._channels.get(robot_id)
+        if ch is None:
+            ch = RobotChannel(self, robot_id)
+            self._channels[robot_id] = ch
+        return ch
+
+    def connect_robot(self, robot_id: int, host: str, port: int):
+        ch = self.channel(robot_id)
+        ch.reconnect.reset()
+        self.log_message.emit(f"[감시장비 연결 정보 IP[{host}]/PORT[{port}]")
+        self._call_soon(self._do_connect, ch, host, port)
+        if not self.isRunning():
+            self._is_running = True
+            self.start()
+
+    def disconnect_robot(self, robot_id: int):
+        ch = self._channels.get(robot_id)
+        if ch is not None:
+            ch._is_running = False  # 재연결 중단 의도를 즉시 반영
+            self._call_soon(self._do_disconnect, ch)
+
+    def send_command(self, robot_id: int, cmd_type: CommandType, payload: bytes):
+        """ 송신 큐에 넣고 transport 스레드를 깨움 (블로킹 없음) """
+        ch = self._channels.get(robot_id)
+        if ch is None or ch.state != ChannelState.CONNECTED:
+            self.log_message.emit(f"[로봇 {robot_id}] 연결되지 않아 전송 실패.")
+            return
+        ch.send_queue.put(cmd_type, payload)
+        self._wakeup()
+
+    def stats(self) -> dict:
+        return {robot_id: ch.stats() for robot_id, ch in self._channels.items()}
+
+    def stop(self):
+        """ 모든 연결을 닫고 스레드 종료 """
+        self._is_running = False
+        for ch in list(self._channels.values()):
+            ch._is_running = False
+        self._wakeup()
+        if not self.wait(2000):
+            self.log_message.emit("[Transport] 스레드 강제 종료 (timeout).")
+            self.terminate()
+
+    def _call_soon(self, func, *args):
+        self._requests.append(partial(func, *args))
+        self._wakeup()
+
+    def _wakeup(self):
+        try:
+            self._wake_w.send(b'\x00')
+        except (BlockingIOError, OSError):
+            pass  # 이미 깨울 데이터가 쌓여 있음
+
+    # ==========================================================================
+    # transport 스레드
+    # ==========================================================================
+    def run(self):
+        self.log_message.emit("[Transport] 다중 로봇 통신 스레드 시작")
+        while self._is_running:
+            events = self._selector.select(self._next_timeout())
+            for key, mask in events:
+                ch = key.data
+                if ch is None:
+                    self._drain_wakeup()
+                elif ch.state == ChannelState.CONNECTING:
+                    self._finish_connect(ch)
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self._handle_read(ch)
+                    if mask & selectors.EVENT_WRITE and ch.state == ChannelState.CONNECTED:
+                        self._flush(ch)
+
+            while self._requests:
+                request = self._requests.popleft()
+                try:
+                    request()
+                except Exception as e:
+                    # 요청 1건의 오류로 transport 스레드가 죽지 않도록 해당 요청만 버림
+                    self.log_message.emit(f"[Transport] 요청 처리 중 예외 발생 ({request.func.__name__}): {e}")
+            self._flush_send_queues()
+            self._check_timers()
+
+        # 스레드 완전 종료: 모든 소켓 정리 및 상태 전파
+        for ch in list(self._channels.values()):
+            if ch.state != ChannelState.DISCONNECTED:
+                self._close_channel(ch)
+                self.connection_status.emit(ch.robot_id, False)
+        self.log_message.emit("[Transport] 다중 로봇 통신 스레드가 안전하게 종료되었습니다.")
+
+    def _next_timeout(self) -> float:
+        now = time.monotonic()
+        timeout = self.MAX_SELECT_TIMEOUT
+        for ch in list(self._channels.values()):
+            if ch.state == ChannelState.CONNECTING:
+                timeout = min(timeout, ch.connect_deadline - now)
+            elif ch._is_running:
+                remaining = ch.reconnect.seconds_until_retry(now)
+                if remaining is not None:
+                    timeout = min(timeout, remaining)
+        return max(0.0, timeout)
+
+    def _drain_wakeup(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _check_timers(self):
+        now = time.monotonic()
+        for ch in list(self._channels.values()):
+            if ch.state == ChannelState.CONNECTING and now >= ch.connect_deadline:
+                self.log_message.emit(f"[로봇 {ch.robot_id}] 연결 타임아웃.")
+                self._connection_lost(ch, "연결 타임아웃")
+            elif (ch.state == ChannelState.DISCONNECTED and ch._is_running
+                    and ch.reconnect.retry_due(now)):
+                self._open_connection(ch)
+
+    # --- 연결 관리 ---
+    def _do_connect(self, ch: RobotChannel, host: str, port: int):
+        self._close_channel(ch)
+        ch.host = host
+        ch.port = port
+        ch._is_running = True
+        self._open_connection(ch)
+
+    def _do_disconnect(self, ch: RobotChannel):
+        ch._is_running = False
+        ch.reconnect.cancel()
+        was_connected = ch.state != ChannelState.DISCONNECTED
+        self._close_channel(ch)
+        if was_connected:
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 통신 종료")
+        self.connection_status.emit(ch.robot_id, False)
+
+    def _open_connection(self, ch: RobotChannel):
+        self.log_message.emit(f"[로봇 {ch.robot_id}] {ch.host}:{ch.port} 연결 시도 중...")
+        ch.reconnect.record_attempt()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            err = sock.connect_ex((ch.host, ch.port))
+        except OSError as e:  # 주소 해석 실패 등
+            err = e.errno
+        if err not in _CONNECT_IN_PROGRESS:
+            sock.close()
+            reason = errno.errorcode.get(err, err)
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 소켓 오류: {reason}")
+            ch.reconnect.record_failure(reason)
+            self._schedule_reconnect(ch)
+            return
+        ch.sock = sock
+        ch.state = ChannelState.CONNECTING
+        ch.connect_deadline = time.monotonic() + ch.reconnect.connect_timeout
+        self._selector.register(sock, selectors.EVENT_WRITE, ch)
+
+    def _finish_connect(self, ch: RobotChannel):
+        err = ch.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            reason = errno.errorcode.get(err, err)
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 소켓 오류: {reason}")
+            self._connection_lost(ch, reason)
+            return
+        ch.reconnect.record_success()
+        ch.state = ChannelState.CONNECTED
+        ch.receiver.reset()      # 이전 연결의 잔여 데이터 제거
+        ch.send_queue.clear()    # 이전 연결에서 보내지 못한 명령은 버림
+        ch.out_buffer.clear()
+        self._selector.modify(ch.sock, selectors.EVENT_READ, ch)
+        self.connection_status.emit(ch.robot_id, True)
+        self.log_message.emit(f"[로봇 {ch.robot_id}] 서버 연결 성공.")
+
+    def _connection_lost(self, ch: RobotChannel, reason=None):
+        was_connected = ch.state == ChannelState.CONNECTED
+        ch.reconnect.record_failure(reason)
+        self._close_channel(ch)
+        self.connection_status.emit(ch.robot_id, False)
+        if was_connected and ch._is_running:
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 서버 연결이 끊어졌습니다.")
+        self._schedule_reconnect(ch)
+
+    def _schedule_reconnect(self, ch: RobotChannel):
+        if ch._is_running:
+            delay = ch.reconnect.schedule_retry()
+            self.log_message.emit(f"[로봇 {ch.robot_id}] {delay:.1f}초 후 재연결을 시도합니다...")
+
+    def _close_channel(self, ch: RobotChannel):
+        if ch.sock is not None:
+            try:
+                self._selector.unregister(ch.sock)
+            except (KeyError, ValueError):
+                pass
+            try:
+                ch.sock.close()
+            except OSError:
+                pass
+            ch.sock = None
+        ch.state = ChannelState.DISCONNECTED
+        ch.out_buffer.clear()
+
+    # --- 수신 ---
+    def _handle_read(self, ch: RobotChannel):
+        try:
+            recv_len = ch.receiver.recv_from(ch.sock)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 수신 오류: {e}")
+            self._connection_lost(ch, e)
+            return
+        except Exception as e:
+            self.log_message.emit(f"[로봇 {ch.robot_id}] 파싱 중 예외 발생: {e}")
+            ch.receiver.reset()
+            return
+        if not recv_len:
+            self._connection_lost(ch, "서버가 연결을 종료")
+            return
+        ch.rx_bytes += recv_len
+
+    def _on_packet(self, ch: RobotChannel, content_type_id: int, seq_num: int, data: memoryview):
+        """ PacketReceiver 콜백 (NetworkThread._process_received_packet과 동일한 분기) """
+        ch.rx_packets += 1
+        response_type, robot_id_from_packet = ContentTypeMapper.get_response_type(content_type_id)
+        robot_id = ch.robot_id
+
+        if robot_id_from_packet != robot_id:
+            self.log_message.emit(f"잘못된 로봇 ID 수신! (Expected {robot_id}, Got {robot_id_from_packet})")
+
+        if response_type is None:
+            self.log_message.emit(f"[로봇 {robot_id}] 미처리 응답 ID 수신: 0x{content_type_id:X}")
+            return
+
+        try:
+            if response_type == ResponseType.RES_MOTOR_CAMERA_INFO:
+                info = PacketProtocol.parse_motor_camera_info(data)
+                if "error" not in info:
+                    self._publish(robot_id, TelemetryKind.MOTOR_INFO, info, self.received_motor_info)
+
+            elif response_type == ResponseType.RES_TRACKING_STATUS:
+                status = PacketProtocol.parse_tracking_status(data)
+                if "error" not in status:
+                    self._publish(robot_id, TelemetryKind.TRACKING_STATUS, status, self.received_tracking_status)
+
+            elif response_type == ResponseType.RES_HEARTBEAT_ACK:
+                self.received_heartbeat.emit(robot_id)
+
+            elif response_type == ResponseType.RES_CAMERA_POWER_STATUS:
+                info = PacketProtocol.parse_camera_power_status(data)
+                if "error" not in info:
+                    self._publish(robot_id, TelemetryKind.POWER_STATUS, info, self.received_power_status)
+
+        except Exception as e:
+            self.log_message.emit(f"[로봇 {robot_id}] 파싱 중 예외 발생 (ID: 0x{content_type_id:X}): {e}")
+
+    def _on_motor_info_batch(self, ch: RobotChannel, frames):
+        ch.rx_packets += len(frames)
+        self._publish(ch.robot_id, TelemetryKind.MOTOR_INFO_BATCH, frames, self.received_motor_info_batch)
+
+    def _publish(self, robot_id: int, kind: TelemetryKind, value, signal):
+        if self.telemetry is not None:
+            self.telemetry.publish(robot_id, kind, value)
+        else:
+            signal.emit(robot_id, value)
+
+    # --- 송신 ---
+    def _flush_send_queues(self):
+        """
+        각 로봇 송신 큐의 명령을 패킷으로 만들어 송신 버퍼에 이어 붙이고 송신 시도
+        - 송신 버퍼에 TX_LOW_WATER 이상 남아 있으면 큐에서 꺼내지 않음 (EVENT_WRITE로 비운 뒤 다시 꺼냄)
+        """
+        for ch in list(self._channels.values()):
+            if ch.state != ChannelState.CONNECTED or not len(ch.send_queue):
+                continue
+            if len(ch.out_buffer) >= self.TX_LOW_WATER:
+                continue
+            for cmd_type, payload in ch.send_queue.get_batch(max_items=64, timeout=0):
+                try:
+                    header = PacketProtocol.HEADER_STRUCT.pack(
+                        ContentTypeMapper.get_command_id(ch.robot_id, cmd_type),
+                        len(payload),
+                        (ch.tx_sequence_num + 1) & 0xFFFFFFFF
+                    )
+                except Exception as e:
+                    # 잘못된 명령 1건 때문에 transport 스레드가 죽지 않도록 해당 명령만 버림
+                    ch.tx_build_errors += 1
+                    self.log_message.emit(f"[로봇 {ch.robot_id}] 명령 패킷 생성 실패 ({cmd_type!r}): {e}")
+                    continue
+                ch.tx_sequence_num = (ch.tx_sequence_num + 1) & 0xFFFFFFFF
+                # 헤더/페이로드를 송신 버퍼에 바로 이어 붙임 (header + data 중간 bytes 생성 없음)
+                ch.out_buffer += header
+                ch.out_buffer += payload
+            self._flush(ch)
+
+    def _flush(self, ch: RobotChannel):
+        """ 송신 버퍼를 send() 1회로 전송, 남은 바이트가 있으면 EVENT_WRITE 등록 """
+        if ch.out_buffer:
+            try:
+                sent = ch.sock.send(ch.out_buffer)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                self.log_message.emit(f"[로봇 {ch.robot_id}] 소켓 데이터 전송 실패: {e}")
+                self._connection_lost(ch, e)
+                return
+            del ch.out_buffer[:sent]
+            ch.tx_bytes += sent
+
+        events = selectors.EVENT_READ
+        if ch.out_buffer:
+            events |= selectors.EVENT_WRITE
+        if self._selector.get_key(ch.sock).events != events:
+            self._selector.modify(ch.sock, events, ch)
@@ -6,21 +6,32 @@ from PySide6.QtCore import QThread, Signal
 from observer.packet_protocol_observer import (
     PacketProtocol, ContentTypeMapper, CommandType, ResponseType
 )
+from observer.receive_buffer_observer import PacketReceiver
+from observer.telemetry_bridge_observer import TelemetryKind
+from observer.send_queue_observer import CommandQueue, CommandWriter
+from utils.reconnect_scheduler import ReconnectScheduler
 
 class NetworkThread(QThread):
     """
     TCP 소켓 통신을 담당하는 백그라운드 스레드
     이제 'robot_id'를 인스턴스 변수로 가짐
+    [!] 메인 윈도우는 MultiRobotTransport(selectors, 스레드 1개로 N대 처리)를 사용함
+        이 클래스는 로봇 1대 전용 대체 경로(단일 로봇 fallback)로만 유지
+        - 호출 API(connect_to_server/stop/send_command/isRunning)와 시그널은 RobotChannel/MultiRobotTransport와 동일
+        - 송신 예외 처리는 CommandWriter가 담당 (명령 1건 생성 오류는 로그 후 버림, 소켓 오류는 연결 종료)
     """
     # [!] 수신 시 'robot_id'를 함께 전달
     connection_status = Signal(int, bool)     # (robot_id, connected)
     received_motor_info = Signal(int, dict)   # (robot_id, info)
+    # [!] 수신 청크 1개당 1회: 모터 및 카메라 구동 정보 NumPy 구조화 배열
+    #     (PacketProtocol.MOTOR_CAMERA_INFO_FRAME_DTYPE, 최소 1개 프레임)
+    received_motor_info_batch = Signal(int, object)  # (robot_id, frames)
     received_tracking_status = Signal(int, dict) # (robot_id, status)
     received_heartbeat = Signal(int)        # (robot_id)
     received_power_status = Signal(int, dict) # (robot_id, info)
     log_message = Signal(str)            
 
-    def __init__(self, robot_id: int, parent=None):
+    def __init__(self, robot_id: int, parent=None, telemetry=None):
         super().__init__(parent)
         self.host = None
         self.port = None
@@ -28,22 +39,36 @@ class NetworkThread(QThread):
         self._is_running = False
         self.sock = None
         self.client_socket = None
-        self._buffer = b''
+        # [!] 수신 버퍼: 고정 크기 bytearray + recv_into (bytes += 재할당 제거)
+        #     모터 정보 프레임은 배치 디코딩 후 청크당 시그널 1회
+        self._receiver = PacketReceiver(self._on_packet, motor_batch_handler=self._on_motor_info_batch)
         
-        # [!] 송신 시퀀스 번호 카운터
+        # [!] 송신 시퀀스 번호 카운터 (송신 스레드에서 증가)
         self.tx_sequence_num = 0
+        # [!] 송신 큐 + 전용 송신 스레드 (GUI 스레드에서 sendall 하지 않음)
+        self._send_queue = CommandQueue(maxsize=64)
+        self._writer = None
+
+        # [!] 텔레메트리 브리지 (TelemetryBridge)
+        #     지정 시 모터/추적/전원 정보는 시그널 대신 최신값 슬롯에 기록 (GUI 타이머가 drain)
+        self.telemetry = telemetry
+
+        # [!] 재연결 스케줄러 (지수 백오프 + 지터, 네트워크 변경 힌트 시 즉시 재시도)
+        self._reconnect = ReconnectScheduler(name=f"robot{robot_id}")
 
     def connect_to_server(self, host: str, port: int):
         self.host = host
         self.port = port        
         self._is_running = True
-        self.client_socket = socket.socket(socket.AF_INET,socket.SOCK_STREAM)  
-        host_info = (self.host, self.port)   
         self.log_message.emit(f"[감시장비 연결 정보 IP[{self.host}]/PORT[{self.port}]")
-        self.client_socket.connect(host_info)
-        self.log_message.emit(f"[로봇 {self.robot_id}] 스레드 시작...")
+        # [!] 수정: GUI 스레드에서 connect하지 않음 (연결은 run()에서 타임아웃과 함께 수행)
         if not self.isRunning():
+            self._reconnect.reset()
+            self.log_message.emit(f"[로봇 {self.robot_id}] 스레드 시작...")
             self.start()
+        else:
+            # 재연결 대기 중이면 사용자 요청으로 즉시 재시도
+            self._reconnect.hint()
 
     def stop(self):
         """스레드를 안전하게 종료합니다."""
@@ -59,7 +84,8 @@ class NetworkThread(QThread):
             except OSError:
                 pass # 이미 닫혔을 수 있음
             
-                # 3. [!] msleep()을 중단시키기 위해 exit() 호출
+        # 3. [!] 재연결 대기(wait)를 중단
+        self._reconnect.cancel()
         self.exit() 
         
         # 4. 스레드가 완전히 종료될 때까지 최대 2초 대기
@@ -78,51 +104,62 @@ class NetworkThread(QThread):
 
     def send_command(self, cmd_type: CommandType, payload: bytes):
         """
-        GUI로부터 받은 '명령 타입'과 '페이로드'를 조합하여
-        '로봇ID'에 맞는 '실제 패킷'을 전송합니다.
-        """
-        """
-        [!] 수정: 시퀀스 번호를 증가시키고 build_packet 호출
+        GUI로부터 받은 '명령 타입'과 '페이로드'를 송신 큐에 넣습니다.
+        [!] 수정: 실제 패킷 생성(시퀀스 번호 부여)과 전송은 CommandWriter 스레드가 수행
+            - GUI 스레드는 블로킹되지 않음 (상대가 느려도 UI 멈춤 없음)
+            - 같은 CommandType의 대기 중인 모터/Heartbeat 명령은 최신값으로 병합
         """
         #if not self.sock or not self._is_running:
-        if not self.client_socket or not self._is_running:
+        if not self.client_socket or not self._is_running or self._writer is None:
             self.log_message.emit(f"[로봇 {self.robot_id}] 연결되지 않아 전송 실패.")
             return          
-        
-        try:
-            '''
-            # 1. 실제 ContentType ID 생성 (ContentTypeMapper가 수정됨)
-            content_id = ContentTypeMapper.get_command_id(self.robot_id, cmd_type)
-            
-            # 2. 완전한 패킷 생성
-            packet = PacketProtocol.build_packet(content_id, payload)
-            '''
-            # 1. 시퀀스 번호 증가 (0부터 시작하면 1, 1이면 1)
-            # (32bit uint 최대값 근처에서 오버플로우 방지)
-            self.tx_sequence_num = (self.tx_sequence_num + 1) & 0xFFFFFFFF 
-            
-            # 2. 실제 ContentType ID 생성
-            content_id = ContentTypeMapper.get_command_id(self.robot_id, cmd_type)
-            
-            # 3. 완전한 패킷 생성 (ID, Sequence, Payload 전달)
-            packet = PacketProtocol.build_packet(
-                content_id, 
-                self.tx_sequence_num, 
-                payload
-            )
-            # 4. 전송
-            #self.sock.sendall(packet)    
-            self.client_socket.sendall(packet)
-        except socket.error as e:
-            # ...
-            self.log_message.emit(f"[로봇 {self.robot_id}] 소켓 데이터 전송 실패: {e}")
-            self._handle_disconnect()
-        except Exception as e:
-            # ...
-            self.log_message.emit(f"[로봇 {self.robot_id}] 소켓 패킷 생성 오류: {e}")
-            
+
+        self._send_queue.put(cmd_type, payload)
+
+    def reconnect_stats(self) -> dict:
+        """ 연결 시도/성공/실패 통계 """
+        return self._reconnect.stats()
+
+    def send_stats(self) -> dict:
+        """ 송신 큐 깊이/병합/드롭 및 송신 스레드 통계 """
+        stats = self._send_queue.stats()
+        if self._writer is not None:
+            stats.update(self._writer.stats())
+        return stats
+
+    def _next_sequence(self) -> int:
+        """ (송신 스레드) 시퀀스 번호 증가 - 32bit uint 오버플로우 방지 """
+        self.tx_sequence_num = (self.tx_sequence_num + 1) & 0xFFFFFFFF
+        return self.tx_sequence_num
+
+    def _start_writer(self):
+        self._stop_writer()
+        self._send_queue.clear() # 이전 연결에서 보내지 못한 명령은 버림
+        self._writer = CommandWriter(
+            self.robot_id, self.client_socket, self._send_queue,
+            self._next_sequence, self._on_send_error,
+            on_log=self.log_message.emit
+        )
+        self._writer.start()
+
+    def _stop_writer(self):
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+
+    def _on_send_error(self, error: Exception):
+        """ (송신 스레드) 송신 실패 시 소켓을 shutdown하여 수신 루프가 재연결하도록 함 """
+        self.log_message.emit(f"[로봇 {self.robot_id}] 소켓 데이터 전송 실패: {error}")
+        sock = self.client_socket
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
     def _handle_disconnect(self):
         """ 연결 종료 처리 """
+        self._stop_writer()
         if self.client_socket:
             try:
                 self.client_socket.close()
@@ -138,55 +175,37 @@ class NetworkThread(QThread):
 
     def _parse_buffer(self):
         """
-        [!] 수정: 새로운 8바이트 헤더 기반, Suffix 검증 없는 다중 패킷 파서
+        [!] 수정: 링 버퍼 기반 다중 패킷 파서
+        버퍼에 쌓인 완성 패킷을 오프셋으로 순회하며 처리하고,
+        처리된 만큼은 오프셋 이동(필요 시 in-place compaction)으로만 제거합니다.
         """
-        while True: # 버퍼에 있는 모든 패킷을 처리할 때까지 반복            
-            # 1. 최소 헤더 길이(8바이트) 확인
-            if len(self._buffer) < PacketProtocol.HEADER_SIZE:
-                break # 데이터가 부족, 다음 recv() 대기
+        self._receiver.parse()
 
-            # 2. 헤더 파싱 (ID, Length, Sequence)
-            try:
-                header_data = self._buffer[:PacketProtocol.HEADER_SIZE]
-                content_type_id, data_len, seq_num = struct.unpack(
-                    PacketProtocol.HEADER_FORMAT, header_data
-                )
-            except struct.error as e:
-                self.log_message.emit(f"[로봇 {self.robot_id}] 헤더 파싱 오류: {e}. 버퍼 초기화.")
-                self._buffer = b'' # 동기화 깨짐
-                break
-                
-            total_packet_size = PacketProtocol.HEADER_SIZE + data_len
+    def _on_packet(self, content_type_id: int, seq_num: int, packet_data: memoryview):
+        """ PacketReceiver 콜백: 헤더가 분리된 데이터(memoryview)를 그대로 전달 """
+        """
+        self.log_message.emit(
+            f"[RX {self.robot_id}] ID: 0x{content_type_id:X}, "
+            f"Seq: {seq_num}, Len: {len(packet_data)}, "
+            f"Data: {packet_data.hex(' ', 8)}..." # 8바이트만 표시
+        )
+        """
+        self._process_received_packet(content_type_id, packet_data)
 
-            # 3. 패킷 완성 여부 확인 (헤더 + 데이터)
-            if len(self._buffer) < total_packet_size:
-                # 아직 데이터가 덜 왔음
-                break 
-            # 4. [!] Suffix 검증 제거
-            
-            # 5. 데이터 추출
-            packet_data = self._buffer[PacketProtocol.HEADER_SIZE : total_packet_size]
+    def _on_motor_info_batch(self, frames):
+        """ PacketReceiver 배치 콜백: 한 청크의 모터 정보 프레임을 한 번에 GUI로 전달 """
+        robot_id_from_packet = int(frames['id'][-1]) & 0x000F
+        if robot_id_from_packet != self.robot_id:
+            self.log_message.emit(f"잘못된 로봇 ID 수신! (Expected {self.robot_id}, Got {robot_id_from_packet})")
+        if self.telemetry is not None:
+            self.telemetry.publish(self.robot_id, TelemetryKind.MOTOR_INFO_BATCH, frames)
+        else:
+            self.received_motor_info_batch.emit(self.robot_id, frames)
 
-            # 6. 로그 출력 (수신 패킷 구성)
-            """
-            self.log_message.emit(
-                f"[RX {self.robot_id}] ID: 0x{content_type_id:X}, "
-                f"Seq: {seq_num}, Len: {data_len}, "
-                f"Data: {packet_data.hex(' ', 8)}..." # 8바이트만 표시
-            )
-            """
-                
-            # 7. 패킷 처리 (파싱 및 시그널 전송)
-            self._process_received_packet(content_type_id, packet_data)
-            
-            # 8. 처리된 패킷만큼 버퍼에서 제거
-            self._buffer = self._buffer[total_packet_size:]
-            
-            # (버퍼에 남은 데이터가 있으면 while 루프 계속)
-            
-    def _process_received_packet(self, content_type_id: int, data: bytes):     
+    def _process_received_packet(self, content_type_id: int, data: memoryview):     
         """
         [!] 수정: RES_CAMERA_POWER_STATUS (0x307x) 처리 추가
+        data는 수신 버퍼의 zero-copy 조각이므로 이 함수 밖으로 보관하지 않습니다.
         """
         response_type, robot_id_from_packet = ContentTypeMapper.get_response_type(content_type_id)
         
@@ -201,12 +220,12 @@ class NetworkThread(QThread):
             if response_type == ResponseType.RES_MOTOR_CAMERA_INFO: # 0x308x (10Hz)
                 info = PacketProtocol.parse_motor_camera_info(data)
                 if "error" not in info:
-                    self.received_motor_info.emit(self.robot_id, info)
+                    self._publish(TelemetryKind.MOTOR_INFO, info, self.received_motor_info)
             
             elif response_type == ResponseType.RES_TRACKING_STATUS: # 0x30Ax (1Hz)
                 status = PacketProtocol.parse_tracking_status(data)
                 if "error" not in status:
-                    self.received_tracking_status.emit(self.robot_id, status)
+                    self._publish(TelemetryKind.TRACKING_STATUS, status, self.received_tracking_status)
                     
             elif response_type == ResponseType.RES_HEARTBEAT_ACK: # 0x305x (1Hz)
                 self.received_heartbeat.emit(self.robot_id) 
@@ -214,20 +233,31 @@ class NetworkThread(QThread):
             elif response_type == ResponseType.RES_CAMERA_POWER_STATUS: # 0x307x (1Hz)
                 info = PacketProtocol.parse_camera_power_status(data)
                 if "error" not in info:
-                    self.received_power_status.emit(self.robot_id, info)
+                    self._publish(TelemetryKind.POWER_STATUS, info, self.received_power_status)
                 
         except Exception as e:
             self.log_message.emit(f"[로봇 {self.robot_id}] 파싱 중 예외 발생 (ID: 0x{content_type_id:X}): {e}")
 
+    def _publish(self, kind: TelemetryKind, info: dict, signal):
+        """ 브리지가 있으면 최신값 슬롯에 기록, 없으면 기존처럼 시그널 emit """
+        if self.telemetry is not None:
+            self.telemetry.publish(self.robot_id, kind, info)
+        else:
+            signal.emit(self.robot_id, info)
+
     def run(self):
         """ QThread의 메인 루프 (start() 호출 시 실행) """
         while self._is_running:
             try:
                 self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.client_socket.settimeout(3.0) 
+                self.client_socket.settimeout(self._reconnect.connect_timeout) 
                 self.log_message.emit(f"[로봇 {self.robot_id}] {self.host}:{self.port} 연결 시도 중...")
+                self._reconnect.record_attempt()
                 self.client_socket.connect((self.host, self.port))
                 self.client_socket.settimeout(None)
+                self._reconnect.record_success()
+                self._receiver.reset() # 이전 연결의 잔여 데이터 제거
+                self._start_writer()
                 self.connection_status.emit(self.robot_id, True)
                 self.log_message.emit(f"[로봇 {self.robot_id}] 서버 연결 성공.")
 
@@ -235,19 +265,19 @@ class NetworkThread(QThread):
                 while self._is_running:
                     try:
                         #recv_data = self.sock.recv(4096) 
-                        recv_data = self.client_socket.recv(4096) 
-                        if not recv_data:
+                        # [!] 수신 버퍼에 직접 recv_into 후 완성 패킷 파싱
+                        recv_len = self._receiver.recv_from(self.client_socket)
+                        if not recv_len:
                             #self._handle_disconnect() # 서버가 연결 종료 대기
+                            self._reconnect.record_failure("서버가 연결을 종료")
                             break # 내부 루프 탈출
                         
-                        self._buffer += recv_data
-                        self._parse_buffer()
-                        
                     except socket.error as e:
                         # (stop()에서 shutdown() 호출 시 여기로 진입)
                         if self._is_running:
                             # 의도치 않은 종료
                             self.log_message.emit(f"[로봇 {self.robot_id}] 수신 오류: {e}")
+                            self._reconnect.record_failure(e)
                         else:
                             # 의도된 종료
                             self.log_message.emit(f"[로봇 {self.robot_id}] 연결 수동 종료 중...")
@@ -256,22 +286,29 @@ class NetworkThread(QThread):
                         break # 내부 루프 탈출
                     except Exception as e:
                         self.log_message.emit(f"[로봇 {self.robot_id}] 파싱 중 예외 발생: {e}")
-                        self._buffer = b''
+                        self._receiver.reset()
             
-            except socket.timeout:
+            except socket.timeout as e:
                 if self._is_running:
                     self.log_message.emit(f"[로봇 {self.robot_id}] 연결 타임아웃.")
+                self._reconnect.record_failure(e)
                 self.connection_status.emit(self.robot_id, False)
             except socket.error as e:
                 if self._is_running:
                     self.log_message.emit(f"[로봇 {self.robot_id}] 소켓 오류: {e}")
+                self._reconnect.record_failure(e)
                 self.connection_status.emit(self.robot_id, False)
             
+            # 송신 스레드 정리 (수신 루프를 벗어난 연결은 더 이상 사용하지 않음)
+            self._stop_writer()
+
             # 재연결 로직
             if self._is_running:
-                self.log_message.emit(f"[로봇 {self.robot_id}] 5초 후 재연결을 시도합니다...")
-                # [!] 수정: time.sleep 대신 self.msleep 사용
-                self.msleep(5000) 
+                # [!] 수정: 고정 5초 대신 지수 백오프 + 지터 (힌트/stop() 시 즉시 깨어남)
+                delay = self._reconnect.schedule_retry()
+                self.log_message.emit(f"[로봇 {self.robot_id}] {delay:.1f}초 후 재연결을 시도합니다...")
+                if not self._reconnect.wait():
+                    break
         
         # 스레드 완전 종료 (while self._is_running == False)
         self._handle_disconnect() # 마지막으로 소켓 정리 및 상태 전파
@@ -1,6 +1,7 @@
 import struct
 from enum import IntEnum
-from typing import Tuple  # [!] 튜플 타입 힌트를 위해 임포트
+import numpy as np
+from typing import Tuple, NamedTuple  # [!] 튜플 타입 힌트를 위해 임포트
 # ==============================================================================
 # Python 3.9+ 버전부터는 (ResponseType, int)와 같은 튜플 타입 힌팅(type hinting) 구문이 
 # 비표준으로 간주되며, Pylance 같은 린터(linter)가 오류.
@@ -157,6 +158,28 @@ class PacketProtocol:
     HEADER_FORMAT = '<H H L'  # ContentTypeID, DataLength, SequenceNumber
     HEADER_SIZE = struct.calcsize(HEADER_FORMAT) # 8 bytes
 
+    # [!] 미리 컴파일된 struct.Struct (호출마다 포맷 문자열을 다시 해석하지 않음)
+    HEADER_STRUCT            = struct.Struct(HEADER_FORMAT)
+    MOTOR_CONTROL_STRUCT     = struct.Struct('<H H H h H H h H')  # 16 bytes
+    EO_CAMERA_CONTROL_STRUCT = struct.Struct('<H H H H H H H H')  # 16 bytes
+    IR_CAMERA_CONTROL_STRUCT = struct.Struct('<H H')              # 4 bytes
+    TRACKING_SET_STRUCT      = struct.Struct('<H H H H H H')      # 12 bytes
+    MOTOR_CAMERA_INFO_STRUCT = struct.Struct('<h h H H')          # 8 bytes
+    CAMERA_POWER_STRUCT      = struct.Struct('<H H')              # 4 bytes
+    TRACKING_STATUS_STRUCT   = struct.Struct('<H H')              # 4 bytes
+
+    # [!] 모터 및 카메라 구동 정보 프레임 (헤더 8 + 데이터 8 = 16 bytes) 배치 디코딩용 dtype
+    MOTOR_CAMERA_INFO_FRAME_DTYPE = np.dtype([
+        ('id',   '<u2'),  # ContentTypeID (0x308x)
+        ('len',  '<u2'),  # DataLength (8)
+        ('seq',  '<u4'),  # SequenceNumber
+        ('pan',  '<i2'),  # 방위각정보 (short, deg*100)
+        ('tilt', '<i2'),  # 고각정보 (short, deg*100)
+        ('zoom', '<u2'),  # EO 줌위치정보 (Ushort)
+        ('mode', '<u2'),  # 장비구동모드 (Ushort)
+    ])
+    MOTOR_CAMERA_INFO_FRAME_SIZE = MOTOR_CAMERA_INFO_FRAME_DTYPE.itemsize  # 16 bytes
+
     # --- 3.1. 기본 패킷 생성기 (Static Method) ---
     @staticmethod
     def build_packet(content_type_id: int, sequence_num: int, data: bytes = b'') -> bytes:
@@ -166,8 +189,7 @@ class PacketProtocol:
         data_len = len(data)
         try:
             # 1. 헤더 패킹 (ID, Length, Sequence)
-            header = struct.pack(
-                PacketProtocol.HEADER_FORMAT,
+            header = PacketProtocol.HEADER_STRUCT.pack(
                 content_type_id,
                 data_len,
                 sequence_num
@@ -218,6 +240,26 @@ class PacketProtocol:
     ) -> bytes:
         """
          1. 모터 구동명령 페이로드 [길이 16bytes]
+        """
+        return PacketProtocol.MOTOR_CONTROL_STRUCT.pack(
+            *PacketProtocol.motor_control_values(
+                mode, pan_control, pan_speed_dps, pan_position_deg,
+                tilt_control, tilt_speed_dps, tilt_position_deg
+            )
+        )
+
+    @staticmethod
+    def motor_control_values(
+        mode: MotorMode,
+        pan_control: MotorPanControl,
+        pan_speed_dps: float,
+        pan_position_deg: float,
+        tilt_control: MotorTiltControl,
+        tilt_speed_dps: float,
+        tilt_position_deg: float
+    ) -> tuple:
+        """
+        모터 구동명령 필드값(스케일링 적용) 튜플 생성 - MOTOR_CONTROL_STRUCT 순서
         Args:
             pan_speed_dps: 방위각 속도 (0~30 deg/s)
             pan_position_deg: 방위각 위치 (-180~179 deg)
@@ -243,8 +285,7 @@ class PacketProtocol:
             
         # [구조체] 16 bytes
         # 7개 항목 (14 bytes) + 1개 reserve (2 bytes) = 16 bytes
-        data = struct.pack(
-            '<H H H h H H h H',  # 8 * 2 = 16 bytes
+        return (
             mode.value,                 # 구동제어모드 (Ushort)
             pan_control.value,          # 방위각 속도제어 (Ushort)
             pan_speed_scaled,           # 방위각 속도 (Ushort)
@@ -254,7 +295,6 @@ class PacketProtocol:
             tilt_pos_scaled,            # 고각 위치제어 (short)
             0                           # reserve (Ushort)
         )
-        return data
 
     '''
     @staticmethod
@@ -294,8 +334,7 @@ class PacketProtocol:
         2. EO카메라 명령 페이로드 [길이 16bytes]
         (reserve3 필드 추가됨)
         """
-        data = struct.pack(
-            '<H H H H H H H H', # 8 * 2 = 16 bytes
+        data = PacketProtocol.EO_CAMERA_CONTROL_STRUCT.pack( # 8 * 2 = 16 bytes
             zoom_mode.value,      # Field 1
             zoom_control.value,   # Field 2
             reserve3,               # reserve3 [!] Field 3 (예: 0xFFFF or 0)
@@ -312,8 +351,7 @@ class PacketProtocol:
         """
         3. IR카메라 명령 페이로드 [길이 4bytes]
         """
-        data = struct.pack(
-            '<H H', # 2 * 2 = 4 bytes
+        data = PacketProtocol.IR_CAMERA_CONTROL_STRUCT.pack( # 2 * 2 = 4 bytes
             zoom_mode.value,      # 줌 제어모드 (Ushort)
             0                     # reserve (Ushort)
         )
@@ -327,8 +365,7 @@ class PacketProtocol:
         """
         5. 추적 설정 [길이 12bytes] - (수정됨)
         """
-        data = struct.pack(
-            '<H H H H H H', # 6 * 2 = 12 bytes
+        data = PacketProtocol.TRACKING_SET_STRUCT.pack( # 6 * 2 = 12 bytes
             x,              # 추적 박스 X축 (Ushort)
             y,              # 추적 박스 Y축 (Ushort)
             width,          # 추적박스 Width (Ushort)
@@ -354,7 +391,7 @@ class PacketProtocol:
             return {"error": f"Invalid length: expected 8, got {len(data)}"}
         
         try:
-            pan_scaled, tilt_scaled, eo_zoom_pos, mode = struct.unpack('<h h H H', data)
+            pan_scaled, tilt_scaled, eo_zoom_pos, mode = PacketProtocol.MOTOR_CAMERA_INFO_STRUCT.unpack(data)
             
             # 스케일링된 정수 값을 실제 물리 값 (float)으로 변환
             info = {
@@ -367,6 +404,28 @@ class PacketProtocol:
         except struct.error as e:
             return {"error": f"Parsing error: {e}"}
 
+    @staticmethod
+    def parse_motor_camera_info_batch(buffer) -> np.ndarray:
+        """
+        [!] 신규: 모터 및 카메라 구동 정보 프레임 배치 디코딩 - 수신
+        buffer(헤더 포함 원본 바이트) 앞쪽부터 연속된 완성 프레임(16 bytes)을
+        NumPy 구조화 배열 (id, len, seq, pan, tilt, zoom, mode) 하나로 변환합니다.
+        - 다른 종류의 패킷이나 잘린 프레임을 만나면 그 앞까지만 디코딩
+        - 소비한 바이트 수 = len(반환 배열) * MOTOR_CAMERA_INFO_FRAME_SIZE
+        - 반환 배열은 복사본이므로 수신 버퍼가 재사용되어도 안전
+        """
+        dtype = PacketProtocol.MOTOR_CAMERA_INFO_FRAME_DTYPE
+        count = len(buffer) // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+
+        frames = np.frombuffer(buffer, dtype=dtype, count=count)
+        valid = ((frames['id'] & 0xFFF0) == int(ResponseType.RES_MOTOR_CAMERA_INFO)) & (frames['len'] == 8)
+        if not valid.all():
+            # 첫 번째 비정상 프레임 이후는 프레임 경계가 어긋나므로 버림
+            frames = frames[:int(valid.argmin())]
+        return frames.copy()
+
     @staticmethod
     def parse_camera_power_status(data: bytes) -> dict:
         """
@@ -376,7 +435,7 @@ class PacketProtocol:
             return {"error": f"Invalid length: expected 4, got {len(data)}"}
         
         try:
-            eo_power, ir_power = struct.unpack('<H H', data)
+            eo_power, ir_power = PacketProtocol.CAMERA_POWER_STRUCT.unpack(data)
             info = {
                 "eo_power": eo_power,  # 0: Off, 1: On
                 "ir_power": ir_power   # 0: Off, 1: On
@@ -392,7 +451,7 @@ class PacketProtocol:
             return {"error": f"Invalid length: expected 4, got {len(data)}"}
 
         try:
-            channel, status = struct.unpack('<H H', data)
+            channel, status = PacketProtocol.TRACKING_STATUS_STRUCT.unpack(data)
             info = {
                 "channel": channel,  # 추적 채널 (Ushort, 1=EO, 2=IR)
                 "status": status     # 추적 상태 (Ushort, 0=미추적, 1=추적중)
@@ -405,4 +464,53 @@ class PacketProtocol:
     def parse_connection_status(data: bytes) -> dict:
         """ 7. 감시장비 연결상태정보 (HeartBeat 응답) - 수신 (이전과 동일) """
         ...
-        return {"connected": True}
\ No newline at end of file
+        return {"connected": True}
+
+
+# ==============================================================================
+# 4. Codec (경량 레코드)
+# ==============================================================================
+class MotorCameraInfo(NamedTuple):
+    """
+    모터 및 카메라 구동 정보 레코드 (parse_motor_camera_info의 dict 대체)
+    - 수신 원본값(deg*100)을 그대로 보관하고 각도는 속성으로 변환
+    """
+    pan_scaled: int        # 방위각정보 (short, deg*100)
+    tilt_scaled: int       # 고각정보 (short, deg*100)
+    eo_zoom_position: int  # EO 줌위치정보 (Ushort)
+    drive_mode: int        # 장비구동모드 (Ushort)
+
+    @property
+    def pan_angle(self) -> float:
+        return self.pan_scaled / 100.0
+
+    @property
+    def tilt_angle(self) -> float:
+        return self.tilt_scaled / 100.0
+
+    def to_dict(self) -> dict:
+        return {
+            "pan_angle": self.pan_scaled / 100.0,
+            "tilt_angle": self.tilt_scaled / 100.0,
+            "eo_zoom_position": self.eo_zoom_position,
+            "drive_mode": self.drive_mode,
+        }
+
+# 레코드 생성은 tuple.__new__를 직접 사용 (NamedTuple.__new__의 파이썬 호출 비용 회피)
+_tuple_new = tuple.__new__
+_MOTOR_CAMERA_INFO_UNPACK = PacketProtocol.MOTOR_CAMERA_INFO_STRUCT.unpack
+
+class PacketCodec:
+    """
+    고빈도 수신 경로용 레코드 디코딩
+    - decode_motor_camera_info: 10~20Hz 모터 및 카메라 구동 정보를 NamedTuple 레코드로 (dict 생성 없음)
+    (송신은 헤더만 HEADER_STRUCT로 pack하고 페이로드는 결합 없이 그대로 송신 - CommandWriter/MultiRobotTransport)
+    """
+
+    @staticmethod
+    def decode_motor_camera_info(data) -> MotorCameraInfo:
+        """
+        모터 및 카메라 구동 정보 레코드 디코딩 (10~20Hz 수신 경로용, 분기 없음)
+        길이가 8 bytes가 아니면 struct.error 발생
+        """
+        return _tuple_new(MotorCameraInfo, _MOTOR_CAMERA_INFO_UNPACK(data))
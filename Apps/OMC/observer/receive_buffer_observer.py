@@ -0,0 +1,155 @@
+import struct
+from typing import Callable, Optional
+
+import numpy as np
+
+from observer.packet_protocol_observer import PacketProtocol, ResponseType
+
+
+class ReceiveRingBuffer:
+    """
+    소켓 수신용 고정 크기 버퍼 (bytearray + memoryview)
+    - recv_into()로 버퍼 빈 공간에 바로 수신 (중간 bytes 객체 생성 없음)
+    - read/write 오프셋으로 미처리 구간을 관리
+    - 뒤쪽 여유 공간이 부족할 때만 미처리 바이트를 앞으로 당김 (in-place compaction)
+    """
+    # 뒤쪽 여유 공간이 이보다 작으면 compaction 수행
+    MIN_RECV_SPACE = 4096
+
+    def __init__(self, capacity: int = 128 * 1024):
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._read = 0   # 미처리 데이터 시작 위치
+        self._write = 0  # 다음 수신 데이터가 기록될 위치
+
+    def __len__(self) -> int:
+        """ 아직 처리되지 않은 바이트 수 """
+        return self._write - self._read
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def recv_into(self, sock) -> int:
+        """
+        소켓에서 버퍼의 빈 공간으로 직접 수신합니다.
+        반환값 0은 상대방이 연결을 종료했음을 의미합니다.
+        """
+        if len(self._buf) - self._write < self.MIN_RECV_SPACE:
+            self.compact()
+        free = len(self._buf) - self._write
+        if free == 0:
+            raise BufferError("수신 버퍼가 가득 찼습니다 (미처리 패킷이 버퍼 크기 초과)")
+        n = sock.recv_into(self._view[self._write:], free)
+        self._write += n
+        return n
+
+    def write(self, data) -> int:
+        """ (테스트/리플레이용) 외부 바이트를 버퍼 뒤에 복사 """
+        n = len(data)
+        if len(self._buf) - self._write < n:
+            self.compact()
+        if len(self._buf) - self._write < n:
+            raise BufferError("수신 버퍼 용량 초과")
+        self._view[self._write:self._write + n] = data
+        self._write += n
+        return n
+
+    def view(self) -> memoryview:
+        """ 미처리 구간의 zero-copy 뷰 (다음 recv_into/compact 전까지만 유효) """
+        return self._view[self._read:self._write]
+
+    def consume(self, n: int):
+        """ 처리 완료된 n 바이트를 버림 (오프셋만 이동) """
+        self._read += n
+        if self._read >= self._write:
+            # 모두 처리되었으면 복사 없이 처음부터 다시 사용
+            self._read = 0
+            self._write = 0
+
+    def compact(self):
+        """ 미처리 바이트를 버퍼 앞쪽으로 이동 (남은 조각 크기만큼만 복사) """
+        pending = self._write - self._read
+        if self._read and pending:
+            self._view[:pending] = self._view[self._read:self._write]
+        self._read = 0
+        self._write = pending
+
+    def clear(self):
+        self._read = 0
+        self._write = 0
+
+
+class PacketReceiver:
+    """
+    감시장비 패킷(8바이트 헤더 + 데이터) 수신 엔진
+    - ReceiveRingBuffer에 수신 후 오프셋 기반으로 패킷 경계를 찾음
+    - 완성된 패킷마다 handler(content_type_id, seq_num, data)를 호출
+      (data는 버퍼를 가리키는 memoryview 조각이므로 handler 내부에서만 사용할 것)
+    - motor_batch_handler가 있으면 모터 및 카메라 구동 정보(16 bytes 고정) 프레임은
+      NumPy 구조화 배열로 일괄 디코딩하여 parse() 1회당 한 번만 전달
+    """
+    HEADER = struct.Struct(PacketProtocol.HEADER_FORMAT)
+    MOTOR_INFO_BASE_ID = int(ResponseType.RES_MOTOR_CAMERA_INFO)
+    MOTOR_INFO_DATA_LEN = PacketProtocol.MOTOR_CAMERA_INFO_STRUCT.size  # 8 bytes
+
+    def __init__(self, handler: Callable[[int, int, memoryview], None],
+                 capacity: int = 128 * 1024,
+                 motor_batch_handler: Optional[Callable[[np.ndarray], None]] = None):
+        # 최대 패킷(헤더 + 0xFFFF 데이터)이 항상 들어갈 수 있도록 보장
+        capacity = max(capacity, self.HEADER.size + 0xFFFF + ReceiveRingBuffer.MIN_RECV_SPACE)
+        self.buffer = ReceiveRingBuffer(capacity)
+        self.handler = handler
+        self.motor_batch_handler = motor_batch_handler
+
+    def reset(self):
+        self.buffer.clear()
+
+    def recv_from(self, sock) -> int:
+        """ 소켓에서 한 번 수신하고 완성된 패킷을 모두 처리합니다. 수신 바이트 수 반환 """
+        n = self.buffer.recv_into(sock)
+        if n:
+            self.parse()
+        return n
+
+    def parse(self) -> int:
+        """ 버퍼에 있는 완성된 패킷을 모두 처리하고 처리한 패킷 수를 반환 """
+        header = self.HEADER
+        header_size = header.size
+        batch_handler = self.motor_batch_handler
+        view = self.buffer.view()
+        end = len(view)
+        offset = 0
+        count = 0
+        batches = []
+        try:
+            while end - offset >= header_size:
+                content_type_id, data_len, seq_num = header.unpack_from(view, offset)
+                total = header_size + data_len
+                if end - offset < total:
+                    break  # 아직 데이터가 덜 왔음
+                if (batch_handler is not None
+                        and (content_type_id & 0xFFF0) == self.MOTOR_INFO_BASE_ID
+                        and data_len == self.MOTOR_INFO_DATA_LEN):
+                    # [!] 연속된 모터 정보 프레임은 패킷 단위 루프 없이 한 번에 디코딩
+                    frames = PacketProtocol.parse_motor_camera_info_batch(view[offset:end])
+                    batches.append(frames)
+                    offset += len(frames) * total
+                    count += len(frames)
+                    continue
+                start = offset + header_size
+                self.handler(content_type_id, seq_num, view[start:offset + total])
+                offset += total
+                count += 1
+        finally:
+            self.buffer.consume(offset)
+
+        if batches:
+            # 수신 청크 1개당 배치 1회 전달 (사이에 다른 패킷이 끼어 있어도 하나로 합침)
+            batch_handler(batches[0] if len(batches) == 1 else np.concatenate(batches))
+        return count
+
+    def feed(self, data: bytes) -> int:
+        """ (테스트/리플레이용) 외부 바이트를 버퍼에 넣고 파싱 """
+        self.buffer.write(data)
+        return self.parse()
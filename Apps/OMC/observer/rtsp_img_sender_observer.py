@@ -4,7 +4,20 @@ import json
 import numpy as np
 import cv2
 import threading
+import time
 from PySide6.QtCore import QObject, Signal, Slot
+from utils.reconnect_scheduler import ReconnectScheduler
+from observer.jpeg_pipeline_observer import JpegEncodePipeline
+from observer.detection_framing_observer import (
+    FRAMING_LEGACY, FRAMING_SEQUENCED, RESULT_SEQ_KEY, InFlightWindow, build_frame_header
+)
+
+
+class _SendFailed(ConnectionError):
+    """ 파이프라인 송신 실패 (실패한 소켓을 on_error까지 함께 전달) """
+    def __init__(self, sock, error):
+        super().__init__(str(error))
+        self.sock = sock
 
 class ImageSender(QObject):
     """
@@ -13,8 +26,17 @@ class ImageSender(QObject):
     detection_result_signal = Signal(dict) # 탐지 결과 전달
     log_signal = Signal(str)
     connection_signal = Signal(bool)
+    encoder_stats_signal = Signal(dict) # (1초마다) 인코딩 시간/프레임 크기/드롭/현재 품질
+
+    STATS_INTERVAL = 1.0
 
-    def __init__(self):
+    def __init__(self, target_fps: float = 15.0, jpeg_quality: int = 80, encoder_workers: int = 2,
+                 framing: str = FRAMING_LEGACY, max_in_flight: int = 4):
+        """
+        Args:
+            framing: 프레임 전송 규격 (FRAMING_LEGACY: 길이+JPEG, FRAMING_SEQUENCED: 시퀀스/캡처 시각 포함)
+            max_in_flight: 결과를 기다리지 않고 연속 전송할 수 있는 최대 프레임 수 (FRAMING_SEQUENCED만 적용)
+        """
         super().__init__()
         self.server_ip = ""
         self.server_port = 0
@@ -23,87 +45,241 @@ class ImageSender(QObject):
         self._send_thread = None
         self._recv_thread = None
         self._latest_frame = None
-        self._lock = threading.Lock()
+        self._lock = threading.Lock() # 연결 상태(sock) 교체/정리 및 재연결 스레드 시작 보호
+        # [!] 재연결 스케줄러 (지수 백오프 + 지터), 연결 시도는 GUI 스레드가 아닌 연결 스레드에서 수행
+        self._reconnect = ReconnectScheduler(name="image_sender")
+        self._want_connected = False # 사용자 연결 의도 (disconnect() 호출 전까지 재연결 유지)
+        self._connect_thread = None
+        # [!] 비동기 JPEG 인코딩/송신 파이프라인 (GUI 스레드에서 imencode/sendall 하지 않음)
+        self._pipeline = JpegEncodePipeline(
+            self._send_jpeg, target_fps=target_fps, quality=jpeg_quality, workers=encoder_workers
+        )
+        self._pipeline.on_error = self._on_pipeline_error
+        # [!] 결과 대기 프레임 윈도우 (탐지 결과를 프레임 시퀀스와 매칭, 프레임별 종단 지연 측정)
+        #     FRAMING_LEGACY는 결과에 frame_seq가 없어 매칭이 불확실하므로 윈도우 없이 기존처럼 전송
+        self.framing = framing
+        self._in_flight = None
+        if framing == FRAMING_SEQUENCED:
+            self._in_flight = InFlightWindow(max_in_flight)
+            self._pipeline.before_send = self._acquire_in_flight
+        self._last_stats_time = 0.0
 
     def connect_to_server(self, ip, port):
         self.server_ip = ip
         self.server_port = port
+        self._want_connected = True
+        self._reconnect.reset()
+        if self._connect_thread and self._connect_thread.is_alive():
+            self._reconnect.hint() # 재연결 대기 중이면 즉시 재시도
+            return
+        self._connect_thread = threading.Thread(target=self._connect_worker, daemon=True)
+        self._connect_thread.start()
+
+    def _connect_worker(self):
+        """ 연결될 때까지 시도 (실패 시 백오프 대기, disconnect() 시 중단) """
+        while self._want_connected:
+            if self._open():
+                return
+            delay = self._reconnect.schedule_retry()
+            self.log_signal.emit(f"{delay:.1f}초 후 표적 처리 서버 재연결을 시도합니다...")
+            if not self._reconnect.wait():
+                return
+
+    def _open(self) -> bool:
+        """ 연결 1회 시도 """
+        self._reconnect.record_attempt()
+        sock = None
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(5.0)
-            self.sock.connect((self.server_ip, self.server_port))
-            self.sock.settimeout(None) # 블로킹 모드로 변경
-            self._is_running = True
-            
-            # 수신 스레드 시작
-            self._recv_thread = threading.Thread(target=self._receive_worker, daemon=True)
-            self._recv_thread.start()
-            
-            self.connection_signal.emit(True)
-            self.log_signal.emit(f"표적 처리 서버 연결 성공: {ip}:{port}")
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self._reconnect.connect_timeout)
+            sock.connect((self.server_ip, self.server_port))
+            sock.settimeout(None) # 블로킹 모드로 변경
         except Exception as e:
+            if sock:
+                sock.close()
+            self._reconnect.record_failure(e)
             self.log_signal.emit(f"서버 연결 실패: {e}")
             self.connection_signal.emit(False)
+            return False
+
+        with self._lock:
+            if not self._want_connected: # 연결 중에 disconnect() 된 경우
+                sock.close()
+                return False
+            self._reconnect.record_success()
+            self.sock = sock
+            self._is_running = True
+            if self._in_flight is not None:
+                self._in_flight.reopen()
+            self._pipeline.start()
+
+            # 수신 스레드 시작
+            self._recv_thread = threading.Thread(target=self._receive_worker, args=(sock,), daemon=True)
+            self._recv_thread.start()
+
+        self.connection_signal.emit(True)
+        self.log_signal.emit(f"표적 처리 서버 연결 성공: {self.server_ip}:{self.server_port}")
+        return True
 
     def disconnect(self):
+        """ 사용자 연결 해제 (재연결 중단) """
+        self._want_connected = False
+        self._reconnect.cancel()
+        with self._lock:
+            self._close()
+        self.connection_signal.emit(False)
+        self.log_signal.emit("서버 연결 해제됨")
+
+    def _close(self):
+        """ 현재 연결 정리 (self._lock 보유 상태에서 호출) """
         self._is_running = False
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR) # 파이프라인 송신 스레드의 sendall 블로킹 해제
+            except OSError:
+                pass
+        if self._in_flight is not None:
+            self._in_flight.close() # 윈도우 대기 중인 송신 스레드 해제
+        self._pipeline.stop()
         if self.sock:
             try:
                 self.sock.close()
             except:
                 pass
             self.sock = None
+
+    def _handle_connection_lost(self, sock, error):
+        """
+        송수신 오류로 연결이 끊긴 경우: 연결 의도가 남아 있으면 재연결
+        [!] 수신 스레드와 파이프라인 송신 스레드가 동시에 호출할 수 있으므로
+            확인/정리/재연결 스레드 시작을 self._lock 안에서 수행 (먼저 들어온 스레드만 처리)
+        """
+        with self._lock:
+            if sock is None or sock is not self.sock: # 이미 정리되었거나 새 연결로 교체됨
+                return
+            self._close()
+            reconnect = self._want_connected
+            if reconnect:
+                self._reconnect.record_failure(error)
+                self._connect_thread = threading.Thread(target=self._connect_worker, daemon=True)
+                self._connect_thread.start()
         self.connection_signal.emit(False)
-        self.log_signal.emit("서버 연결 해제됨")
+        if reconnect:
+            self.log_signal.emit("표적 처리 서버 연결 끊김, 재연결 대기")
 
-    def send_frame(self, frame: np.ndarray):
-        """ 최신 프레임을 저장 (실제 전송은 별도 워커가 처리하거나 직접 호출) """
+    def reconnect_stats(self) -> dict:
+        """ 연결 시도/성공/실패 통계 """
+        return self._reconnect.stats()
+
+    def send_frame(self, frame: np.ndarray, capture_ts: float = None) -> int:
+        """
+        최신 프레임을 인코딩 파이프라인에 등록하고 즉시 반환 (GUI 스레드 블로킹 없음)
+        [!] 수정: JPEG 인코딩/전송은 파이프라인 워커가 target_fps에 맞춰 처리하며,
+            처리 전에 새 프레임이 오면 이전 프레임은 드롭 (latest-frame-wins)
+        Args:
+            capture_ts: 프레임 캡처 시각 (time.time, 생략 시 현재 시각)
+        Returns:
+            frame_seq (탐지 결과의 "frame_seq"와 매칭, 미연결 시 0)
+        """
         if not self._is_running or self.sock is None:
-            return
-            
-        # 너무 빈번한 호출 방지를 위해 바로 전송
-        # (성능 문제 시 별도 스레드로 분리 가능)
+            return 0
+        return self._pipeline.submit(frame, capture_ts)
+
+    def set_encoder_options(self, target_fps: float = None, jpeg_quality: int = None):
+        """ 전송 FPS / JPEG 품질(최대값) 변경 """
+        if target_fps is not None:
+            self._pipeline.set_target_fps(target_fps)
+        if jpeg_quality is not None:
+            self._pipeline.set_quality(jpeg_quality)
+
+    def encoder_stats(self) -> dict:
+        """ 인코딩 시간, 프레임당 바이트, 드롭 프레임, 현재 품질/스케일, 결과 대기 윈도우/지연 """
+        stats = self._pipeline.stats()
+        if self._in_flight is not None:
+            stats.update(self._in_flight.stats())
+        return stats
+
+    def _acquire_in_flight(self, frame_seq: int, capture_ts: float) -> bool:
+        """ (파이프라인 송신 스레드) 결과 대기 윈도우 자리 확보, 1프레임 간격 내에 못 얻으면 드롭 """
+        interval = 1.0 / self._pipeline.target_fps if self._pipeline.target_fps > 0 else None
+        return self._in_flight.acquire(frame_seq, capture_ts, timeout=interval) # 실패 시 다음(더 최신) 프레임에 자리를 양보
+
+    def _release_in_flight(self, frame_seq: int):
+        """ 전송하지 못한 프레임의 윈도우 자리 반환 """
+        if self._in_flight is not None:
+            self._in_flight.release(frame_seq)
+
+    def _send_jpeg(self, data: bytes, frame_seq: int, capture_ts: float):
+        """ (파이프라인 송신 스레드) 프레임 헤더 + JPEG 전송 """
+        sock = self.sock
+        if sock is None:
+            self._release_in_flight(frame_seq)
+            raise ConnectionError("표적 처리 서버 미연결")
         try:
-            # JPEG 인코딩
-            _, img_encoded = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-            data = img_encoded.tobytes()
-            size = len(data)
-            
-            # 헤더(4바이트 길이) + 데이터 전송
-            self.sock.sendall(struct.pack('>L', size) + data)
-            
-        except Exception as e:
-            self.log_signal.emit(f"이미지 전송 실패: {e}")
-            self.disconnect()
+            sock.sendall(build_frame_header(self.framing, frame_seq, capture_ts, len(data)) + data)
+        except OSError as e:
+            self._release_in_flight(frame_seq)
+            raise _SendFailed(sock, e) from e
+
+        now = time.monotonic()
+        if now - self._last_stats_time >= self.STATS_INTERVAL:
+            self._last_stats_time = now
+            self.encoder_stats_signal.emit(self.encoder_stats())
 
-    def _receive_worker(self):
+    def _on_pipeline_error(self, error: Exception):
+        self.log_signal.emit(f"이미지 전송 실패: {error}")
+        # 송신 중이던 소켓 기준으로 처리 (그 사이 새 연결로 교체되었으면 무시)
+        self._handle_connection_lost(getattr(error, "sock", None), error)
+
+    def _receive_worker(self, sock):
         """ 서버로부터 탐지 결과를 수신하는 워커 """
-        while self._is_running and self.sock:
+        error = "서버가 연결을 종료"
+        while self._is_running and self.sock is sock:
             try:
                 # 1. 헤더(길이) 수신
-                header = self._recv_exact(4)
+                header = self._recv_exact(4, sock)
                 if not header: break
                 data_len = struct.unpack('>L', header)[0]
                 
                 # 2. 데이터(JSON) 수신
-                json_data = self._recv_exact(data_len)
+                json_data = self._recv_exact(data_len, sock)
                 if not json_data: break
                 
                 # 3. 파싱 및 시그널 전달
                 result = json.loads(json_data.decode('utf-8'))
+                self._attach_frame_info(result)
                 self.detection_result_signal.emit(result)
                 
             except (socket.error, json.JSONDecodeError, struct.error) as e:
-                self.log_signal.emit(f"데이터 수신 오류: {e}")
+                if self._is_running:
+                    self.log_signal.emit(f"데이터 수신 오류: {e}")
+                error = e
                 break
                 
-        self.disconnect()
+        self._handle_connection_lost(sock, error)
+
+    def _attach_frame_info(self, result: dict):
+        """
+        탐지 결과를 전송 프레임과 매칭하여 프레임 정보 추가
+        - frame_seq: 결과가 속한 프레임 (send_frame() 반환값)
+        - capture_ts: 프레임 캡처 시각, latency_ms: 캡처 -> 결과 수신 지연
+        (FRAMING_LEGACY는 윈도우가 없으므로 결과를 그대로 전달)
+        """
+        if self._in_flight is None:
+            return
+        frame_seq = result.get(RESULT_SEQ_KEY)
+        entry = self._in_flight.complete(frame_seq if isinstance(frame_seq, int) else None)
+        if entry is None:
+            return
+        result[RESULT_SEQ_KEY] = entry.frame_seq
+        result["capture_ts"] = entry.capture_ts
+        result["latency_ms"] = round((time.time() - entry.capture_ts) * 1000.0, 1)
 
-    def _recv_exact(self, n):
+    def _recv_exact(self, n, sock):
         """ 정확히 n 바이트를 수신하는 헬퍼 함수 """
         data = b''
         while len(data) < n:
-            packet = self.sock.recv(n - len(data))
+            packet = sock.recv(n - len(data))
             if not packet: return None
             data += packet
         return data
\ No newline at end of file
@@ -0,0 +1,185 @@
+import socket
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from observer.packet_protocol_observer import PacketProtocol, ContentTypeMapper, CommandType
+
+# 최신 명령만 의미가 있는 명령 (큐에 이미 있으면 페이로드를 최신값으로 교체)
+# - 모터 구동: 마지막 조이스틱 HAT 방향이 최종 상태
+# - Heartbeat: 여러 개가 밀려 있어도 1개면 충분
+# (IR 줌 단계 변경, 추적 설정은 이산 명령이므로 병합하지 않음)
+# (EO 카메라는 건드리지 않는 필드를 NO_OP로 보내는 부분 갱신 패킷이므로 병합하지 않음
+#  - 병합하면 대기 중인 줌/포커스 STOP이 뒤따른 AF 등 다른 EO 명령에 덮여 렌즈가 계속 움직임)
+DEFAULT_COALESCE_TYPES = frozenset({
+    CommandType.CMD_MOTOR_CONTROL,
+    CommandType.CMD_HEARTBEAT,
+})
+
+
+class CommandQueue:
+    """
+    감시장비 송신 명령 큐 (GUI 스레드 put -> 송신 스레드 get_batch)
+    - 크기 제한: 가득 차면 가장 오래된 명령을 버림 (최신 명령 우선)
+    - 병합: coalesce_types에 속한 명령은 큐에 대기 중인 같은 CommandType 항목의 페이로드를 교체
+    - put()은 절대 블로킹되지 않음
+    """
+
+    def __init__(self, maxsize: int = 64, coalesce_types=DEFAULT_COALESCE_TYPES):
+        self.maxsize = maxsize
+        self.coalesce_types = frozenset(coalesce_types)
+        self._queue = deque()  # [cmd_type, payload] 항목 (병합 시 payload만 교체)
+        self._pending: Dict[CommandType, list] = {}  # 병합 대상 CommandType -> 대기 중 항목
+        self._cond = threading.Condition()
+        # 통계
+        self.enqueued_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, cmd_type: CommandType, payload: bytes):
+        with self._cond:
+            self.enqueued_count += 1
+            entry = self._pending.get(cmd_type)
+            if entry is not None:
+                # 아직 송신되지 않은 이전 명령을 최신 페이로드로 교체 (큐 위치 유지)
+                entry[1] = payload
+                self.coalesced_count += 1
+                return
+
+            if len(self._queue) >= self.maxsize:
+                dropped = self._queue.popleft()
+                if self._pending.get(dropped[0]) is dropped:
+                    del self._pending[dropped[0]]
+                self.dropped_count += 1
+
+            entry = [cmd_type, payload]
+            self._queue.append(entry)
+            if cmd_type in self.coalesce_types:
+                self._pending[cmd_type] = entry
+            self._cond.notify()
+
+    def get_batch(self, max_items: int = 32, timeout: Optional[float] = None) -> List[Tuple[CommandType, bytes]]:
+        """ 대기 중인 명령을 최대 max_items개 꺼냄 (없으면 timeout까지 대기, 시간 초과 시 빈 리스트) """
+        with self._cond:
+            if not self._queue:
+                self._cond.wait(timeout)
+            batch = []
+            while self._queue and len(batch) < max_items:
+                entry = self._queue.popleft()
+                if self._pending.get(entry[0]) is entry:
+                    del self._pending[entry[0]]
+                batch.append((entry[0], entry[1]))
+            return batch
+
+    def wakeup(self):
+        """ get_batch() 대기 중인 송신 스레드를 깨움 (종료 시) """
+        with self._cond:
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._queue.clear()
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._queue),
+            "enqueued": self.enqueued_count,
+            "coalesced": self.coalesced_count,
+            "dropped": self.dropped_count,
+        }
+
+
+class CommandWriter:
+    """
+    CommandQueue를 비우는 전용 송신 스레드
+    - 꺼낸 명령에 시퀀스 번호를 붙인 헤더를 만들고 [헤더, 페이로드, ...]를 sendmsg() 1회로 묶어서 송신
+      (헤더 + 페이로드 bytes 결합 없음, sendmsg가 없는 플랫폼(Windows)은 합쳐서 sendall)
+    - 송신 오류 시 on_error(exception) 호출 후 스레드 종료
+    - 패킷 생성 오류(알 수 없는 CommandType 등)는 해당 명령만 버리고 on_log로 기록 (스레드 유지)
+    """
+    MAX_BATCH = 32
+
+    def __init__(self, robot_id: int, sock: socket.socket, queue: CommandQueue,
+                 next_sequence: Callable[[], int],
+                 on_error: Callable[[Exception], None],
+                 on_log: Optional[Callable[[str], None]] = None):
+        self.robot_id = robot_id
+        self.sock = sock
+        self.queue = queue
+        self.next_sequence = next_sequence
+        self.on_error = on_error
+        self.on_log = on_log or print
+        self._is_running = False
+        self._thread = None
+        # 통계
+        self.sent_packets = 0
+        self.sent_batches = 0
+        self.sent_bytes = 0
+        self.build_errors = 0
+
+    def start(self):
+        self._is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._is_running = False
+        self.queue.wakeup()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while self._is_running:
+            batch = self.queue.get_batch(self.MAX_BATCH, timeout=0.5)
+            if not batch or not self._is_running:
+                continue
+            parts = []
+            for cmd_type, payload in batch:
+                try:
+                    header = PacketProtocol.HEADER_STRUCT.pack(
+                        ContentTypeMapper.get_command_id(self.robot_id, cmd_type),
+                        len(payload),
+                        self.next_sequence()
+                    )
+                except Exception as e:
+                    # 잘못된 명령 1건 때문에 송신 스레드가 죽지 않도록 해당 명령만 버림
+                    self.build_errors += 1
+                    self.on_log(f"[로봇 {self.robot_id}] 명령 패킷 생성 실패 ({cmd_type!r}): {e}")
+                    continue
+                parts.append(header)
+                parts.append(payload)
+            if not parts:
+                continue
+            try:
+                self._send_packets(parts)
+            except (OSError, socket.error) as e:
+                self._is_running = False
+                self.on_error(e)
+                return
+
+    def _send_packets(self, parts: List[bytes]):
+        """ parts: [헤더, 페이로드, 헤더, 페이로드, ...] """
+        total = sum(len(p) for p in parts)
+        if hasattr(self.sock, "sendmsg"):
+            sent = self.sock.sendmsg(parts)
+            if sent < total:
+                # 송신 버퍼가 가득 차 일부만 전송된 경우 나머지를 이어서 전송
+                self.sock.sendall(b''.join(parts)[sent:])
+        else:
+            self.sock.sendall(b''.join(parts))
+        self.sent_packets += len(parts) // 2
+        self.sent_batches += 1
+        self.sent_bytes += total
+
+    def stats(self) -> dict:
+        return {
+            "sent_packets": self.sent_packets,
+            "sent_batches": self.sent_batches,
+            "sent_bytes": self.sent_bytes,
+            "build_errors": self.build_errors,
+        }
@@ -0,0 +1,55 @@
+from enum import IntEnum
+from typing import Any, Dict, Tuple
+
+
+class TelemetryKind(IntEnum):
+    """
+    브리지로 전달되는 텔레메트리 종류 (종류별로 최신값 1개만 유지)
+    """
+    MOTOR_INFO       = 1  # dict (parse_motor_camera_info)
+    MOTOR_INFO_BATCH = 2  # np.ndarray (MOTOR_CAMERA_INFO_FRAME_DTYPE)
+    TRACKING_STATUS  = 3  # dict (parse_tracking_status)
+    POWER_STATUS     = 4  # dict (parse_camera_power_status)
+
+
+class TelemetryBridge:
+    """
+    NetworkThread -> GUI 최신값 병합(coalescing) 브리지
+    - 네트워크 스레드: publish()로 (로봇 ID, 종류)별 슬롯에 최신값을 덮어씀
+    - GUI 스레드: 고정 주기 타이머(예: 30Hz)에서 drain()으로 변경된 값만 가져감
+    - 패킷 수와 상관없이 슬롯 수(로봇 수 x 종류 수)만큼만 메모리를 사용하고,
+      GUI가 멈춰도 Qt 이벤트 큐에 시그널이 쌓이지 않음
+    - dict의 단일 대입/pop은 GIL 하에서 원자적이므로 별도 Lock을 사용하지 않음
+    """
+
+    def __init__(self):
+        self._slots: Dict[Tuple[int, int], Any] = {}
+        # 통계 (publish는 네트워크 스레드, drain은 GUI 스레드에서만 갱신)
+        self.published_count = 0
+        self.delivered_count = 0
+
+    def publish(self, robot_id: int, kind: TelemetryKind, value: Any):
+        """ (네트워크 스레드) 최신값 기록 - 이전 값이 아직 전달 전이면 덮어씀 """
+        self._slots[(robot_id, kind)] = value
+        self.published_count += 1
+
+    def drain(self) -> Dict[Tuple[int, int], Any]:
+        """ (GUI 스레드) 마지막 drain 이후 갱신된 슬롯을 꺼내 반환 """
+        drained = {}
+        for key in list(self._slots):
+            value = self._slots.pop(key, None)
+            if value is not None:
+                drained[key] = value
+        self.delivered_count += len(drained)
+        return drained
+
+    @property
+    def coalesced_count(self) -> int:
+        """ 최신값으로 덮어써져 GUI에 전달되지 않은 갱신 수 (통계용 근사치) """
+        return self.published_count - self.delivered_count - len(self._slots)
+
+    def clear(self, robot_id: int = None):
+        """ 슬롯 비우기 (robot_id 지정 시 해당 로봇만) """
+        for key in list(self._slots):
+            if robot_id is None or key[0] == robot_id:
+                self._slots.pop(key, None)
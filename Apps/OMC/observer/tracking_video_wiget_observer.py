@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import QLabel, QApplication
-from PySide6.QtCore import Signal, QRect, QPoint, Qt
+from PySide6.QtCore import Signal, QRect, QPoint, QSize, Qt
 from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap
+from utils.frame_presenter import FramePresenter
 
 class TrackingVideoWidget(QLabel):
     """
@@ -22,14 +23,32 @@ class TrackingVideoWidget(QLabel):
         self.end_pos = QPoint()
         
         self.current_pixmap = None # 현재 비디오 프레임
+        self.presenter = FramePresenter() # [!] BGR 프레임 -> 위젯 크기 QPixmap (1회 축소)
+        self.source_size = None # 원본 영상 크기 (width, height) - 화면 좌표 -> 원본 좌표 변환용
 
     def set_pixmap(self, pixmap: QPixmap):
         """ 외부(RTSP 스레드)에서 비디오 프레임을 업데이트할 때 호출 """
         self.current_pixmap = pixmap
+        self.source_size = (pixmap.width(), pixmap.height())
         # 위젯 크기에 맞게 스케일링하여 표시 (원본 좌표 유지를 위해)
         scaled_pixmap = pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
         super().setPixmap(scaled_pixmap)
 
+    def set_frame(self, frame):
+        """
+        BGR 프레임(np.ndarray)을 위젯 크기로 1회 축소하여 표시 (RGB 변환, 원본 크기 QPixmap 생성 없음)
+        추적 영역 좌표 변환은 원본 프레임 크기 기준으로 유지
+        """
+        super().setPixmap(self.presenter.present(frame, self.size()))
+        self.current_pixmap = None
+        self.source_size = self.presenter.source_size
+
+    def set_scaled_frame(self, scaled, overlay=None):
+        """ 영상 스레드에서 위젯 크기로 미리 축소된 프레임(ScaledFrame) 표시 (overlay: 지연 HUD 등) """
+        super().setPixmap(self.presenter.present_scaled(scaled, overlay))
+        self.current_pixmap = None
+        self.source_size = scaled.source_size
+
     def set_tracking_mode(self, enabled: bool):
         """ '추적 설정' 버튼 클릭 시 호출 """
         self._tracking_enabled = enabled
@@ -111,11 +130,11 @@ class TrackingVideoWidget(QLabel):
         화면에 그려진 QRect를 원본 Pixmap (예: 1920x1080) 좌표로 변환합니다.
         (RTSP 영상이 위젯 크기에 맞게 스케일링 되었기 때문)
         """
-        if self.current_pixmap is None or self.current_pixmap.isNull():
+        if not self.source_size or not self.source_size[0] or not self.source_size[1]:
             return QRect() # 비디오 없음
             
         widget_size = self.size()
-        pixmap_size = self.current_pixmap.size()
+        pixmap_size = QSize(*self.source_size)
         
         if widget_size.width() == 0 or widget_size.height() == 0:
             return QRect()
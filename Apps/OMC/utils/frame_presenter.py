@@ -0,0 +1,184 @@
+"""
+filename: frame_presenter.py
+
+영상 프레임 표시 공용 모듈 (VideoController / MainForm / VideoDialog / 감시장비 제어 UI 공용)
+- BGR 프레임을 RGB로 변환하지 않고 QImage.Format_BGR888로 바로 감쌈 (변환/복사 없음)
+- 표시 크기(KeepAspectRatio)로 cv2.resize 1회 -> QPixmap.scaled(SmoothTransformation) 불필요
+- 축소 버퍼는 표시 크기가 바뀌지 않는 한 프레임 간 재사용
+- 프레임당 전체 크기 할당: QPixmap.fromImage 1회 (표시 크기 기준)
+- FrameOutputs: 영상 스레드가 소비자(메인/서브 라벨, 확대 다이얼로그 등)별 표시 크기로 미리 축소
+  -> GUI 스레드는 present_scaled()로 QPixmap 교체만 수행
+- ScaledFrame.meta(FrameMeta)가 있으면 present_scaled()가 표시 시작/완료 시각을 기록 (지연 통계)
+"""
+import threading
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPixmap
+
+SizeLike = Union[QSize, Tuple[int, int], None]
+
+# overlay(image, scale): 축소된 표시 버퍼에 직접 그리는 콜백 (scale = 표시 크기 / 원본 크기)
+OverlayFunc = Callable[[np.ndarray, float], None]
+
+
+def fit_size(frame_width: int, frame_height: int, target: SizeLike) -> Tuple[int, int]:
+    """원본 비율을 유지하며 target 안에 들어가는 최대 크기 (KeepAspectRatio)"""
+    if target is None:
+        return frame_width, frame_height
+    if isinstance(target, QSize):
+        target = (target.width(), target.height())
+    target_w, target_h = target
+    if target_w <= 0 or target_h <= 0:
+        return frame_width, frame_height
+    scale = min(target_w / frame_width, target_h / frame_height)
+    return max(1, int(frame_width * scale)), max(1, int(frame_height * scale))
+
+
+def bgr_to_qimage(frame: np.ndarray) -> QImage:
+    """
+    BGR(또는 Gray) ndarray를 복사 없이 QImage로 감쌈
+    [!] 반환된 QImage는 frame 메모리를 참조하므로 frame이 유지되는 동안만 유효
+        (QPixmap.fromImage()로 바로 변환하는 용도)
+    """
+    if not frame.flags['C_CONTIGUOUS']:
+        frame = np.ascontiguousarray(frame)
+    height, width = frame.shape[:2]
+    if frame.ndim == 2:
+        return QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_Grayscale8)
+    return QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+
+
+class FramePresenter:
+    """
+    표시 대상(라벨/다이얼로그) 1개당 1개 사용하는 프레임 -> QPixmap 변환기
+    - present(): 원본 프레임은 수정하지 않음 (감지/전송 스레드가 같은 프레임을 참조할 수 있음)
+    """
+
+    def __init__(self, interpolation_down: int = cv2.INTER_AREA, interpolation_up: int = cv2.INTER_LINEAR):
+        self.interpolation_down = interpolation_down
+        self.interpolation_up = interpolation_up
+        self._buffer: Optional[np.ndarray] = None
+        self.source_size = (0, 0)  # 마지막 원본 프레임 크기 (width, height) - 화면 좌표 -> 원본 좌표 변환용
+        self.scale = 1.0           # 마지막 표시 배율 (표시 크기 / 원본 크기)
+
+    def resize(self, frame: np.ndarray, target: SizeLike) -> np.ndarray:
+        """
+        표시 크기로 축소/확대한 프레임 (재사용 버퍼, 다음 호출 시 덮어씀)
+        원본과 크기가 같아도 버퍼로 복사하므로 반환값에 오버레이를 그려도 원본은 안전
+        """
+        height, width = frame.shape[:2]
+        out_w, out_h = fit_size(width, height, target)
+        shape = (out_h, out_w) + frame.shape[2:]
+        if self._buffer is None or self._buffer.shape != shape or self._buffer.dtype != frame.dtype:
+            self._buffer = np.empty(shape, dtype=frame.dtype)
+
+        if (out_w, out_h) == (width, height):
+            np.copyto(self._buffer, frame)
+        else:
+            interpolation = self.interpolation_down if out_w < width else self.interpolation_up
+            cv2.resize(frame, (out_w, out_h), dst=self._buffer, interpolation=interpolation)
+
+        self.source_size = (width, height)
+        self.scale = out_w / width
+        return self._buffer
+
+    def present(self, frame: np.ndarray, target: SizeLike = None, overlay: Optional[OverlayFunc] = None) -> QPixmap:
+        """
+        BGR 프레임 -> 표시 크기 QPixmap
+        Args:
+            target: 표시 영역 크기 (QSize 또는 (w, h)), None이면 원본 크기
+            overlay: 축소된 버퍼에 그릴 콜백 (감지 박스 등)
+        """
+        height, width = frame.shape[:2]
+        if overlay is None and fit_size(width, height, target) == (width, height):
+            # 크기 변경/오버레이가 없으면 원본을 그대로 감쌈 (fromImage가 유일한 복사)
+            self.source_size, self.scale = (width, height), 1.0
+            return QPixmap.fromImage(bgr_to_qimage(frame))
+
+        image = self.resize(frame, target)
+        if overlay is not None:
+            overlay(image, self.scale)
+        return QPixmap.fromImage(bgr_to_qimage(image))
+
+    def present_scaled(self, scaled: "ScaledFrame", overlay: Optional[OverlayFunc] = None) -> QPixmap:
+        """
+        영상 스레드에서 이미 표시 크기로 축소된 프레임 -> QPixmap (GUI 스레드는 감싸기/교체만 수행)
+        scaled.image는 해당 출력 전용 버퍼이므로 오버레이를 직접 그림
+        """
+        started_at = time.monotonic()
+        self.source_size, self.scale = scaled.source_size, scaled.scale
+        if overlay is not None:
+            overlay(scaled.image, scaled.scale)
+        pixmap = QPixmap.fromImage(bgr_to_qimage(scaled.image))
+        if scaled.meta is not None:
+            scaled.meta.mark_presented(started_at, time.monotonic())
+        return pixmap
+
+
+class ScaledFrame(NamedTuple):
+    """영상 스레드가 출력(소비자)별로 미리 축소한 프레임"""
+    image: np.ndarray               # 표시 크기 BGR 프레임 (출력 전용, 수정 가능)
+    scale: float                    # 표시 크기 / 원본 크기
+    source_size: Tuple[int, int]    # 원본 프레임 크기 (width, height)
+    meta: Any = None                # FrameMeta (video/frame_metrics.py), 없으면 None
+
+
+class FrameOutputs:
+    """
+    영상 스레드의 출력(소비자)별 표시 크기 등록 (스레드 안전)
+    - GUI 스레드: set_output()/set_enabled()로 출력 크기/사용 여부 지정 (크기가 같으면 무시)
+    - 영상 스레드: render()로 활성 출력마다 축소 프레임 생성 (비활성 출력은 건너뜀)
+    """
+
+    def __init__(self, interpolation: int = cv2.INTER_AREA):
+        self.interpolation = interpolation
+        self._lock = threading.Lock()
+        self._outputs = {}  # name -> [(width, height), enabled]
+
+    def set_output(self, name: str, size: SizeLike, enabled: bool = None):
+        if isinstance(size, QSize):
+            size = (size.width(), size.height())
+        with self._lock:
+            entry = self._outputs.get(name)
+            if entry is None:
+                self._outputs[name] = [size, True if enabled is None else enabled]
+                return
+            entry[0] = size
+            if enabled is not None:
+                entry[1] = enabled
+
+    def set_enabled(self, name: str, enabled: bool):
+        with self._lock:
+            if name in self._outputs:
+                self._outputs[name][1] = enabled
+
+    def remove_output(self, name: str):
+        with self._lock:
+            self._outputs.pop(name, None)
+
+    def has_outputs(self) -> bool:
+        with self._lock:
+            return any(enabled for _, enabled in self._outputs.values())
+
+    def render(self, frame: np.ndarray, meta: Any = None) -> List[Tuple[str, ScaledFrame]]:
+        """(영상 스레드) 활성 출력별 축소 프레임 (meta는 모든 출력이 공유)"""
+        with self._lock:
+            targets = [(name, size) for name, (size, enabled) in self._outputs.items() if enabled and size]
+        if not targets:
+            return []
+
+        height, width = frame.shape[:2]
+        results = []
+        for name, size in targets:
+            out_w, out_h = fit_size(width, height, size)
+            if (out_w, out_h) == (width, height):
+                image = frame.copy()
+            else:
+                interpolation = self.interpolation if out_w < width else cv2.INTER_LINEAR
+                image = cv2.resize(frame, (out_w, out_h), interpolation=interpolation)
+            results.append((name, ScaledFrame(image, out_w / width, (width, height), meta)))
+        return results
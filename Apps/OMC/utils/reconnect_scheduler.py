@@ -0,0 +1,194 @@
+"""
+filename: reconnect_scheduler.py
+
+소켓 재연결 스케줄러 (NetworkThread / MultiRobotTransport / RobotClient / ImageSender 공용)
+- 지수 백오프 + 지터: 연속 실패할수록 대기 시간을 늘리고, 여러 장비가 동시에 재접속하지 않도록 분산
+- 즉시 재시도 힌트: 네트워크 변경(링크 복구 등) 감지 시 대기 중인 재연결을 바로 깨움
+- 연결 시도 통계: 시도/성공/실패 횟수, 연속 실패, 마지막 오류/대기 시간/연결 소요 시간
+"""
+
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+
+class ReconnectScheduler:
+    """
+    재연결 대기 시간 계산 및 대기 (스레드 안전)
+    - 블로킹 사용 (전용 스레드): wait()으로 다음 시도 시각까지 대기 (힌트/취소 시 즉시 반환)
+    - 논블로킹 사용 (selector 루프): schedule_retry() 후 retry_due()/seconds_until_retry()로 확인
+    """
+    # 생성된 모든 스케줄러 (hint_all()로 한 번에 깨우기 위함)
+    _instances = weakref.WeakSet()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, name: str = "",
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 multiplier: float = 2.0,
+                 jitter: float = 0.5,
+                 connect_timeout: float = 3.0,
+                 on_hint: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            base_delay: 첫 실패 후 대기 시간 (초)
+            max_delay: 최대 대기 시간 (초)
+            multiplier: 연속 실패 1회당 대기 시간 배수
+            jitter: 대기 시간 무작위 감소 비율 (0.5 -> 계산값의 50~100% 사이)
+            connect_timeout: 연결 시도 1회의 타임아웃 (초)
+            on_hint: 즉시 재시도 힌트를 받았을 때 호출 (논블로킹 사용자가 루프를 깨울 때)
+        """
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.connect_timeout = connect_timeout
+        self.on_hint = on_hint
+
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._hint = False
+        self._cancelled = False
+        self.retry_at = None  # 다음 재시도 시각 (time.monotonic 기준)
+        self._attempt_started = None
+
+        # 통계
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.hints = 0
+        self.last_error = None
+        self.last_delay = 0.0
+        self.last_connect_time = None  # 마지막 성공한 연결 시도 소요 시간 (초)
+        self.connected_since = None    # 현재 연결 시작 시각 (time.time)
+
+        with self._instances_lock:
+            self._instances.add(self)
+
+    # --- 연결 시도 기록 ---
+    def record_attempt(self):
+        """ 연결 시도 시작 """
+        with self._lock:
+            self.attempts += 1
+            self._attempt_started = time.monotonic()
+            self._hint = False
+            self.retry_at = None
+
+    def record_success(self):
+        """ 연결 성공 - 백오프 초기화 """
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self._attempt_started is not None:
+                self.last_connect_time = time.monotonic() - self._attempt_started
+            self._attempt_started = None
+            self.connected_since = time.time()
+
+    def record_failure(self, error=None):
+        """ 연결 실패 또는 연결 끊김 - 다음 대기 시간 증가 """
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error) if error is not None else None
+            self._attempt_started = None
+            self.connected_since = None
+
+    # --- 대기 시간 계산 ---
+    def next_delay(self) -> float:
+        """ 연속 실패 횟수 기준 다음 대기 시간 (지터 적용) """
+        with self._lock:
+            exponent = max(0, self.consecutive_failures - 1)
+            delay = min(self.max_delay, self.base_delay * (self.multiplier ** exponent))
+            return delay * (1.0 - self.jitter * random.random())
+
+    def schedule_retry(self) -> float:
+        """ (논블로킹) 다음 재시도 시각을 정하고 대기 시간(초)을 반환 """
+        delay = 0.0 if self._hint else self.next_delay()
+        with self._lock:
+            self.last_delay = delay
+            self.retry_at = time.monotonic() + delay
+        return delay
+
+    def retry_due(self, now: float = None) -> bool:
+        """ (논블로킹) 재시도할 시각이 되었는지 (힌트가 있으면 즉시 True) """
+        if self._hint:
+            return True
+        if self.retry_at is None:
+            return False
+        return (time.monotonic() if now is None else now) >= self.retry_at
+
+    def seconds_until_retry(self, now: float = None) -> Optional[float]:
+        """ (논블로킹) 다음 재시도까지 남은 시간, 예정이 없으면 None """
+        if self._hint:
+            return 0.0
+        if self.retry_at is None:
+            return None
+        return max(0.0, self.retry_at - (time.monotonic() if now is None else now))
+
+    def wait(self) -> bool:
+        """
+        (블로킹) 다음 재시도 시각까지 대기합니다. (schedule_retry()를 먼저 호출하지 않았으면 여기서 호출)
+        힌트를 받으면 즉시 반환하고, cancel() 되었으면 False 반환
+        """
+        if self.retry_at is None:
+            self.schedule_retry()
+        while not self._cancelled:
+            remaining = self.seconds_until_retry()
+            if remaining is None or remaining <= 0:
+                break
+            self._event.wait(remaining)
+            self._event.clear()
+        return not self._cancelled
+
+    # --- 힌트 / 취소 ---
+    def hint(self):
+        """ 즉시 재시도 힌트 (네트워크 변경, 사용자 재연결 요청 등) - 연결 중이면 무시 """
+        with self._lock:
+            if self.connected_since is not None:
+                return
+            self._hint = True
+            self.hints += 1
+            self.consecutive_failures = 0
+        self._event.set()
+        if self.on_hint is not None:
+            self.on_hint()
+
+    @classmethod
+    def hint_all(cls):
+        """ 모든 스케줄러에 즉시 재시도 힌트 (예: OS 네트워크 도달성 변경) """
+        with cls._instances_lock:
+            schedulers = list(cls._instances)
+        for scheduler in schedulers:
+            scheduler.hint()
+
+    def cancel(self):
+        """ 대기 중인 wait()를 중단 (스레드 종료 시) """
+        self._cancelled = True
+        self._event.set()
+
+    def reset(self):
+        """ 취소/힌트/백오프 상태 초기화 (새 연결 요청 시) """
+        with self._lock:
+            self._cancelled = False
+            self._hint = False
+            self.consecutive_failures = 0
+            self.retry_at = None
+        self._event.clear()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "hints": self.hints,
+            "last_error": self.last_error,
+            "last_delay": self.last_delay,
+            "last_connect_time": self.last_connect_time,
+            "connected_since": self.connected_since,
+        }
@@ -0,0 +1,354 @@
+"""
+filename: decode_backend.py
+
+영상 디코드 백엔드 (VideoThread 공용)
+- DecodeBackend: open() / read() -> DecodedFrame / close() 공통 인터페이스
+- PyAVDecodeBackend: PyAV(FFmpeg) 직접 사용 - 디코더 스레드 수, skip_frame 정책, 프레임별 PTS 제공
+  (RTSP 저지연 옵션: tcp, nobuffer, low_delay / SLICE 스레딩으로 프레임 스레드 지연 없음)
+- OpenCVDecodeBackend: 기존 cv2.VideoCapture(CAP_FFMPEG) 경로 (PyAV 미설치 시 대체)
+- create_decode_backend("auto"): PyAV가 있으면 PyAV, 없으면 OpenCV
+"""
+import abc
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+try:
+    import av  # (선택) PyAV
+except ImportError:
+    av = None
+
+BACKEND_AUTO = "auto"
+BACKEND_PYAV = "pyav"
+BACKEND_OPENCV = "opencv"
+
+# skip_frame 정책 (FFmpeg AVDiscard)
+SKIP_NONE = "none"      # 모든 프레임 디코딩
+SKIP_NONREF = "nonref"  # 참조되지 않는 프레임(B 프레임 등) 버림
+SKIP_NONKEY = "nonkey"  # 키프레임만 디코딩
+SKIP_AUTO = "auto"      # 디코딩이 밀리면 none -> nonref -> nonkey 순으로 올리고, 여유가 생기면 복구
+SKIP_LEVELS = (SKIP_NONE, SKIP_NONREF, SKIP_NONKEY)
+
+# RTSP 저지연 옵션 (기존 OPENCV_FFMPEG_CAPTURE_OPTIONS와 동일한 의미)
+DEFAULT_RTSP_OPTIONS = {
+    "rtsp_transport": "tcp",
+    "fflags": "nobuffer",
+    "flags": "low_delay",
+    "max_delay": "0",
+}
+# OpenCV 경로의 소켓 타임아웃 (PyAV는 av.open(timeout=)으로 지정)
+OPENCV_TIMEOUT_OPTION = "stimeout;2000000"  # 2초 (us)
+
+
+class DecodedFrame(NamedTuple):
+    image: np.ndarray          # BGR 프레임
+    pts: Optional[float]       # 스트림 표시 시각 (초, 스트림 time_base 기준), 알 수 없으면 None
+    decode_ms: float           # 디코딩 + BGR 변환 시간 (OpenCV 백엔드는 수신 대기 포함)
+    keyframe: bool
+
+
+class DecodeBackend(abc.ABC):
+    """디코드 백엔드 공통 인터페이스 (open/read/close/is_opened는 백엔드별 구현 필수)"""
+    name = ""
+
+    def __init__(self, thread_count: int = 0, skip_policy: str = SKIP_NONE,
+                 options: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            thread_count: 디코더 스레드 수 (0 = 코덱 자동)
+            skip_policy: SKIP_NONE / SKIP_NONREF / SKIP_NONKEY / SKIP_AUTO
+            options: FFmpeg 입력 옵션 (기본: rtsp:// 주소면 DEFAULT_RTSP_OPTIONS, 파일 등은 없음)
+        """
+        self.thread_count = thread_count
+        self.skip_policy = skip_policy
+        self.options = None if options is None else dict(options)
+        self.url = ""
+        self.frames = 0
+        self.skip_level_changes = 0
+
+    @abc.abstractmethod
+    def open(self, url: str) -> bool:
+        """url 열기 (성공 시 True)"""
+
+    def input_options(self, url: str) -> Dict[str, str]:
+        """ url에 적용할 FFmpeg 입력 옵션 (nobuffer 등은 파일 입력에서 프레임을 읽지 못하게 함) """
+        if self.options is not None:
+            return self.options
+        return dict(DEFAULT_RTSP_OPTIONS) if url.lower().startswith("rtsp") else {}
+
+    @abc.abstractmethod
+    def read(self) -> Optional[DecodedFrame]:
+        """다음 프레임 (실패/스트림 종료 시 None)"""
+
+    def skip(self) -> bool:
+        """
+        스트림을 한 단위 진행하되 프레임을 만들지 않음 (표시하지 않는 스트림 일시정지용, 실패 시 False)
+        연결은 유지되므로 재개 시 재연결 지연이 없음
+        """
+        return self.read() is not None
+
+    @abc.abstractmethod
+    def close(self):
+        """디코더/입력 해제 (여러 번 호출해도 안전해야 함)"""
+
+    @abc.abstractmethod
+    def is_opened(self) -> bool:
+        """read() 가능한 상태인지"""
+
+    def set_skip_policy(self, policy: str):
+        self.skip_policy = policy
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "frames": self.frames, "skip_policy": self.skip_policy}
+
+
+class OpenCVDecodeBackend(DecodeBackend):
+    """
+    cv2.VideoCapture(CAP_FFMPEG) 백엔드 (기존 경로)
+    - FFmpeg 옵션은 OPENCV_FFMPEG_CAPTURE_OPTIONS 환경 변수로만 전달 가능 (설정되어 있지 않을 때만 지정)
+    - thread_count / skip_frame은 지원하지 않음, PTS는 CAP_PROP_POS_MSEC
+    """
+    name = BACKEND_OPENCV
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cap = None
+
+    def open(self, url: str) -> bool:
+        self.close()
+        self.url = url
+        options = self.input_options(url)
+        if options:
+            os.environ.setdefault(
+                "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+                "|".join([f"{key};{value}" for key, value in options.items()] + [OPENCV_TIMEOUT_OPTION])
+            )
+        self._cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+        try:
+            self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except cv2.error:
+            pass
+        return self._cap.isOpened()
+
+    def read(self) -> Optional[DecodedFrame]:
+        if self._cap is None:
+            return None
+        t0 = time.perf_counter()
+        ret, image = self._cap.read()
+        if not ret or image is None:
+            return None
+        decode_ms = (time.perf_counter() - t0) * 1000.0
+        pos_ms = self._cap.get(cv2.CAP_PROP_POS_MSEC)
+        self.frames += 1
+        return DecodedFrame(image, pos_ms / 1000.0 if pos_ms > 0 else None, decode_ms, False)
+
+    def skip(self) -> bool:
+        """ grab()만 수행 (BGR 변환/복사 생략) """
+        return self._cap is not None and self._cap.grab()
+
+    def close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def is_opened(self) -> bool:
+        return self._cap is not None and self._cap.isOpened()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["skip_policy"] = SKIP_NONE  # 미지원
+        return stats
+
+
+class PyAVDecodeBackend(DecodeBackend):
+    """
+    PyAV(FFmpeg) 백엔드
+    - thread_count: 디코더 스레드 수, SLICE 스레딩 사용 (FRAME 스레딩은 스레드 수만큼 프레임 지연 발생)
+    - skip_frame: SKIP_AUTO면 디코딩이 프레임 간격을 SLOW_AFTER 프레임 연속 넘을 때 nonref -> nonkey로 올리고
+      RECOVER_AFTER 프레임 연속 여유가 있으면 한 단계씩 복구 (일시적인 느린 프레임 1개로 GOP를 버리지 않음)
+    - on_packet: 디먹스된 압축 패킷 콜백 (재인코딩 없는 녹화 등)
+    - skip(): 패킷만 디먹스(on_packet 호출)하고 디코딩하지 않음 -> 재개 시 다음 키프레임부터 디코딩
+    """
+    name = BACKEND_PYAV
+    SLOW_AFTER = 5
+    RECOVER_AFTER = 60
+    OPEN_TIMEOUT = 5.0  # 초
+    READ_TIMEOUT = 2.0  # 초
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if av is None:
+            raise RuntimeError("PyAV(av) 패키지가 설치되어 있지 않습니다.")
+        self._container = None
+        self._stream = None
+        self._packets = None
+        self._frames_iter = None
+        self._await_keyframe = False
+        self._skip_index = 0
+        self._healthy = 0
+        self._slow = 0
+        self._frame_interval = 1.0 / 30.0
+        self._decode_s = 0.0  # 현재 프레임까지의 디코딩 시간 (수신 대기 제외)
+        self.on_packet = None  # callback(packet, stream)
+
+    def open(self, url: str) -> bool:
+        self.close()
+        self.url = url
+        try:
+            self._container = av.open(url, options=self.input_options(url),
+                                      timeout=(self.OPEN_TIMEOUT, self.READ_TIMEOUT))
+            self._stream = self._container.streams.video[0]
+        except (av.FFmpegError, IndexError, OSError) as e:
+            print(f"[PyAVDecodeBackend] open failed: {url} ({e})")
+            self.close()
+            return False
+
+        codec = self._stream.codec_context
+        codec.thread_type = "SLICE"
+        if self.thread_count:
+            codec.thread_count = self.thread_count
+        rate = self._stream.average_rate or self._stream.guessed_rate
+        if rate:
+            self._frame_interval = 1.0 / float(rate)
+        self._skip_index = 0
+        self._slow = self._healthy = 0
+        self._apply_skip()
+        self._packets = self._container.demux(self._stream)
+        self._frames_iter = self._decode_frames()
+        self._await_keyframe = False
+        return True
+
+    def _next_packet(self):
+        packet = next(self._packets)
+        if self.on_packet is not None and packet.size:
+            self.on_packet(packet, self._stream)
+        return packet
+
+    def _decode_frames(self):
+        while True:
+            try:
+                packet = self._next_packet()
+            except StopIteration:  # 스트림 종료 (제너레이터 안에서는 그대로 전파할 수 없음)
+                return
+            if self._await_keyframe:
+                if not packet.is_keyframe:
+                    continue
+                self._await_keyframe = False
+            t0 = time.perf_counter()
+            frames = packet.decode()
+            self._decode_s += time.perf_counter() - t0
+            for frame in frames:
+                yield frame
+
+    def read(self) -> Optional[DecodedFrame]:
+        if self._frames_iter is None:
+            return None
+        self._decode_s = 0.0
+        try:
+            frame = next(self._frames_iter)
+            t0 = time.perf_counter()
+            image = frame.to_ndarray(format="bgr24")
+        except (StopIteration, av.FFmpegError, OSError) as e:
+            if not isinstance(e, StopIteration):
+                print(f"[PyAVDecodeBackend] read failed: {e}")
+            self._frames_iter = None
+            return None
+        decode_s = self._decode_s + (time.perf_counter() - t0)
+        pts = float(frame.pts * frame.time_base) if frame.pts is not None and frame.time_base else None
+        self.frames += 1
+        if self.skip_policy == SKIP_AUTO:
+            self._adapt_skip(decode_s)
+        return DecodedFrame(image, pts, decode_s * 1000.0, bool(frame.key_frame))
+
+    def skip(self) -> bool:
+        if self._frames_iter is None:
+            return False
+        try:
+            self._next_packet()
+        except (StopIteration, av.FFmpegError, OSError) as e:
+            if not isinstance(e, StopIteration):
+                print(f"[PyAVDecodeBackend] read failed: {e}")
+            self._frames_iter = None
+            return False
+        self._await_keyframe = True
+        return True
+
+    def _adapt_skip(self, decode_s: float):
+        """ 디코딩 시간(수신 대기 제외)이 SLOW_AFTER 프레임 연속 프레임 간격을 넘으면 버리는 프레임 단계를 올림 """
+        if decode_s > self._frame_interval * 1.5:
+            self._healthy = 0
+            self._slow += 1
+            if self._slow >= self.SLOW_AFTER and self._skip_index < len(SKIP_LEVELS) - 1:
+                self._skip_index += 1
+                self._slow = 0
+                self._apply_skip()
+            return
+        self._slow = 0
+        if decode_s < self._frame_interval * 0.5:
+            self._healthy += 1
+            if self._healthy >= self.RECOVER_AFTER and self._skip_index > 0:
+                self._skip_index -= 1
+                self._healthy = 0
+                self._apply_skip()
+
+    def _apply_skip(self):
+        if self._stream is None:
+            return
+        level = SKIP_LEVELS[self._skip_index] if self.skip_policy == SKIP_AUTO else self.skip_policy
+        self._stream.codec_context.skip_frame = {
+            SKIP_NONE: "DEFAULT", SKIP_NONREF: "NONREF", SKIP_NONKEY: "NONKEY",
+        }.get(level, "DEFAULT")
+        self.skip_level_changes += 1
+
+    def set_skip_policy(self, policy: str):
+        super().set_skip_policy(policy)
+        self._skip_index = 0
+        self._slow = self._healthy = 0
+        self._apply_skip()
+
+    def close(self):
+        self._frames_iter = None
+        self._packets = None
+        self._stream = None
+        if self._container is not None:
+            try:
+                self._container.close()
+            except av.FFmpegError:
+                pass
+            self._container = None
+
+    def is_opened(self) -> bool:
+        return self._container is not None and self._frames_iter is not None
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        if self._stream is not None:
+            codec = self._stream.codec_context
+            stats.update({
+                "codec": codec.name,
+                "thread_count": codec.thread_count,
+                "skip_frame": str(codec.skip_frame),
+                "skip_level_changes": self.skip_level_changes,
+            })
+        return stats
+
+
+def pyav_available() -> bool:
+    return av is not None
+
+
+def create_decode_backend(backend: str = BACKEND_AUTO, **kwargs) -> DecodeBackend:
+    """
+    디코드 백엔드 생성
+    Args:
+        backend: "auto"(PyAV 우선) / "pyav" / "opencv"
+        kwargs: thread_count, skip_policy, options
+    """
+    if backend in (BACKEND_AUTO, BACKEND_PYAV) and av is not None:
+        return PyAVDecodeBackend(**kwargs)
+    if backend == BACKEND_PYAV:
+        print("[decode_backend] PyAV 미설치 - OpenCV 백엔드로 대체합니다.")
+    return OpenCVDecodeBackend(**kwargs)
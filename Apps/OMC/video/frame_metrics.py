@@ -0,0 +1,265 @@
+"""
+filename: frame_metrics.py
+
+영상 경로 프레임별 시각 기록 및 지연 통계
+- FrameMeta: 프레임 1장의 시각 정보 (VideoThread가 디코딩 직후 생성 -> change_pixmap_signal /
+  ScaledFrame.meta로 표시/감지/전송 소비자까지 전달)
+- FrameLatencyStats: 단계별 지연 히스토그램 (스레드 안전) + CSV 기록
+  단계 (ms, time.monotonic 기준)
+  - buffer : RTSP/네트워크 버퍼링 추정 - (수신 경과 시간 - PTS 경과 시간), 스트림 시작 대비 누적 지연
+  - decode : 디코딩 + BGR 변환
+  - queue  : 디코딩 완료 -> 영상 스레드 전달 시작 (최신 프레임 슬롯 대기)
+  - scale  : 출력별 축소
+  - deliver: 시그널 발생 -> GUI 스레드 표시 시작 (Qt 이벤트 큐)
+  - paint  : QPixmap 변환/교체
+  - total  : 디코딩 완료 -> 표시 완료
+  - detect : 디코딩 완료 -> 감지 결과 수신
+- draw_latency_hud(): 표시 버퍼에 단계별 p50/p95 텍스트 (오버레이 콜백용)
+"""
+import bisect
+import csv
+import threading
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+STAGES = ("buffer", "decode", "queue", "scale", "deliver", "paint", "total", "detect")
+
+# 히스토그램 구간 상한 (ms), 마지막 구간은 그 이상 전부
+HISTOGRAM_EDGES_MS = (1, 2, 3, 5, 8, 12, 16, 20, 25, 33, 40, 50, 66, 80, 100, 150, 200, 300, 500, 1000, 2000)
+
+CSV_COLUMNS = ("event", "seq", "pts", "wall_ts", "buffer_ms", "decode_ms", "queue_ms", "scale_ms",
+               "deliver_ms", "paint_ms", "total_ms", "detect_ms")
+
+
+class FrameMeta:
+    """프레임 1장의 시각 정보 (모든 시각은 time.monotonic, wall_ts만 time.time)"""
+    __slots__ = ("seq", "pts", "wall_ts", "decoded_at", "decode_ms", "buffer_ms",
+                 "queue_ms", "scale_ms", "emitted_at", "_stats")
+
+    def __init__(self, seq: int, pts: Optional[float], decode_ms: float,
+                 stats: Optional["FrameLatencyStats"] = None):
+        self.seq = seq
+        self.pts = pts                      # 스트림 PTS (초), 알 수 없으면 None
+        self.wall_ts = time.time()          # 캡처 시각 대용 (감지/전송 서버 capture_ts)
+        self.decoded_at = time.monotonic()
+        self.decode_ms = decode_ms
+        self.buffer_ms = None
+        self.queue_ms = None
+        self.scale_ms = None
+        self.emitted_at = None
+        self._stats = stats
+
+    def mark_presented(self, started_at: float, finished_at: float):
+        """ (GUI 스레드) 표시 시작/완료 시각 기록 - 출력마다 호출 """
+        if self._stats is not None:
+            self._stats.record_presented(self, started_at, finished_at)
+
+    def mark_detected(self, detected_at: float = None):
+        """ (감지 워커) 이 프레임의 감지 결과 수신 """
+        if self._stats is not None:
+            self._stats.record_detected(self, time.monotonic() if detected_at is None else detected_at)
+
+    def age_ms(self) -> float:
+        return (time.monotonic() - self.decoded_at) * 1000.0
+
+
+class LatencyHistogram:
+    """고정 구간 지연 히스토그램 (백분위는 구간 상한으로 근사)"""
+
+    def __init__(self, edges=HISTOGRAM_EDGES_MS):
+        self.edges = tuple(edges)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.edges, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = p / 100.0 * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= rank and n:
+                return float(self.edges[i]) if i < len(self.edges) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(self.max, 2),
+        }
+
+
+class FrameLatencyStats:
+    """
+    단계별 지연 통계 (VideoThread 1개당 1개)
+    - 최근 window초 구간 2개(현재/이전)를 유지해 summary()는 최근 window~2*window초를 반영
+    - start_csv(path): 표시/감지 이벤트마다 CSV 1행 기록 (오프라인 분석용)
+    """
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self._lock = threading.Lock()
+        self._current = {stage: LatencyHistogram() for stage in STAGES}
+        self._previous = {stage: LatencyHistogram() for stage in STAGES}
+        self._rotated_at = time.monotonic()
+        self._pts_origin = None  # (decoded_at, pts) - buffer 단계 기준점
+        self._csv_file = None
+        self._csv_writer = None
+        self._csv_flushed_at = 0.0
+
+    # ==========================================================================
+    # 기록
+    # ==========================================================================
+    def record_decoded(self, meta: FrameMeta):
+        """ (Reader 스레드) 디코딩 완료 """
+        with self._lock:
+            if meta.pts is not None:
+                if self._pts_origin is None or meta.pts < self._pts_origin[1]:
+                    self._pts_origin = (meta.decoded_at, meta.pts)  # 첫 프레임 또는 PTS 되돌아감(재연결)
+                origin_at, origin_pts = self._pts_origin
+                meta.buffer_ms = max(0.0, (meta.decoded_at - origin_at) - (meta.pts - origin_pts)) * 1000.0
+                self._add("buffer", meta.buffer_ms)
+            self._add("decode", meta.decode_ms)
+
+    def record_emitted(self, meta: FrameMeta):
+        """ (영상 스레드) 시그널 발생 직전 (queue / scale 단계) """
+        with self._lock:
+            if meta.queue_ms is not None:
+                self._add("queue", meta.queue_ms)
+            if meta.scale_ms is not None:
+                self._add("scale", meta.scale_ms)
+
+    def record_presented(self, meta: FrameMeta, started_at: float, finished_at: float):
+        """ (GUI 스레드) 표시 시작/완료 """
+        deliver_ms = (started_at - meta.emitted_at) * 1000.0 if meta.emitted_at else None
+        paint_ms = (finished_at - started_at) * 1000.0
+        total_ms = (finished_at - meta.decoded_at) * 1000.0
+        with self._lock:
+            if deliver_ms is not None:
+                self._add("deliver", deliver_ms)
+            self._add("paint", paint_ms)
+            self._add("total", total_ms)
+            self._write_csv("present", meta, deliver_ms=deliver_ms, paint_ms=paint_ms, total_ms=total_ms)
+
+    def record_detected(self, meta: FrameMeta, detected_at: float):
+        """ (감지 워커) 감지 결과 수신 """
+        detect_ms = (detected_at - meta.decoded_at) * 1000.0
+        with self._lock:
+            self._add("detect", detect_ms)
+            self._write_csv("detect", meta, detect_ms=detect_ms)
+
+    def record(self, stage: str, value_ms: float):
+        """ 외부에서 측정한 단계 지연 (예: 전송 서버 결과의 latency_ms) """
+        with self._lock:
+            self._add(stage, value_ms)
+
+    def _add(self, stage: str, value_ms: float):
+        now = time.monotonic()
+        if now - self._rotated_at >= self.window:
+            self._previous, self._current = self._current, self._previous
+            for histogram in self._current.values():
+                histogram.reset()
+            self._rotated_at = now
+        self._current[stage].add(value_ms)
+
+    # ==========================================================================
+    # 조회
+    # ==========================================================================
+    def summary(self) -> Dict[str, dict]:
+        """ 단계별 최근 지연 요약 (count, mean, p50, p95, p99, max) """
+        with self._lock:
+            result = {}
+            for stage in STAGES:
+                merged = LatencyHistogram()
+                merged.merge(self._previous[stage])
+                merged.merge(self._current[stage])
+                result[stage] = merged.summary()
+            return result
+
+    def hud_lines(self) -> List[str]:
+        lines = []
+        for stage, s in self.summary().items():
+            if s["count"]:
+                lines.append(f"{stage:<7} p50 {s['p50']:>5.0f}  p95 {s['p95']:>5.0f} ms")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            for histogram in list(self._current.values()) + list(self._previous.values()):
+                histogram.reset()
+            self._pts_origin = None
+
+    # ==========================================================================
+    # CSV
+    # ==========================================================================
+    def start_csv(self, path: str):
+        """ CSV 기록 시작 (기존 파일은 덮어씀) """
+        self.stop_csv()
+        with self._lock:
+            self._csv_file = open(path, "w", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(CSV_COLUMNS)
+
+    def stop_csv(self):
+        with self._lock:
+            if self._csv_file is not None:
+                self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+
+    @property
+    def csv_enabled(self) -> bool:
+        return self._csv_writer is not None
+
+    def _write_csv(self, event: str, meta: FrameMeta, deliver_ms=None, paint_ms=None, total_ms=None,
+                   detect_ms=None):
+        if self._csv_writer is None:
+            return
+        values = (meta.buffer_ms, meta.decode_ms, meta.queue_ms, meta.scale_ms, deliver_ms, paint_ms, total_ms, detect_ms)
+        self._csv_writer.writerow([event, meta.seq, meta.pts, f"{meta.wall_ts:.6f}"] +
+                                  ["" if v is None else f"{v:.3f}" for v in values])
+        now = time.monotonic()
+        if now - self._csv_flushed_at >= 1.0:
+            self._csv_file.flush()
+            self._csv_flushed_at = now
+
+
+def draw_latency_hud(image: np.ndarray, lines: List[str], origin=(8, 8), font_scale: float = 0.45):
+    """ 표시 버퍼 좌상단에 지연 요약 텍스트 (검은 배경 + 흰 글자, 이미지에 직접 그림) """
+    if not lines:
+        return image
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (_, text_h), baseline = cv2.getTextSize("0", font, font_scale, 1)
+    line_h = text_h + baseline + 4
+    width = max(cv2.getTextSize(line, font, font_scale, 1)[0][0] for line in lines) + 8
+    x0, y0 = origin
+    x1 = min(image.shape[1], x0 + width)
+    y1 = min(image.shape[0], y0 + line_h * len(lines) + 4)
+    image[y0:y1, x0:x1] = 0
+    for i, line in enumerate(lines):
+        cv2.putText(image, line, (x0 + 4, y0 + (i + 1) * line_h), font, font_scale, (255, 255, 255), 1, cv2.LINE_AA)
+    return image
@@ -0,0 +1,347 @@
+"""
+filename: recorder.py
+
+RTSP 영상 녹화 (재인코딩 없는 패킷 리먹스)
+- VideoThread(PyAV 디코드 백엔드)가 디먹스한 H.264/H.265 압축 패킷을 그대로 MP4/MKV에 기록
+  (디코딩된 ndarray를 다시 인코딩하지 않으므로 CPU 부하는 패킷 복사/파일 쓰기 정도)
+- 연속 녹화: segment_seconds마다 키프레임에서 새 파일, max_segments/max_bytes 초과 시 오래된 파일 삭제
+- 이벤트 저장: 최근 pre_event_seconds 패킷을 링 버퍼에 유지 -> save_event() 시 링 버퍼 + 이후 post_seconds를 별도 파일로 저장
+- 파일 쓰기는 전용 스레드에서 수행 (디코드 스레드는 패킷 복사 후 큐에 넣기만 함)
+- 영상 스트림 일시정지(VideoStreamManager) 중에도 디먹스는 계속되므로 녹화 유지
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+try:
+    import av  # (선택) PyAV - 없으면 녹화 불가
+except ImportError:
+    av = None
+
+FORMAT_MP4 = "mp4"
+FORMAT_MKV = "mkv"
+_MUXER_NAMES = {FORMAT_MP4: "mp4", FORMAT_MKV: "matroska"}
+
+
+class StoredPacket(NamedTuple):
+    """디코더와 분리된 압축 패킷 복사본"""
+    data: bytes
+    pts: Optional[int]
+    dts: Optional[int]
+    time_base: object        # fractions.Fraction
+    is_keyframe: bool
+    received_at: float       # time.monotonic
+
+
+class _ClipWriter:
+    """출력 파일 1개 (첫 패킷 dts 기준으로 타임스탬프를 0부터 다시 매김)"""
+
+    def __init__(self, path: str, file_format: str, template_stream):
+        self.path = path
+        self.container = av.open(path, "w", format=_MUXER_NAMES[file_format])
+        if hasattr(self.container, "add_stream_from_template"):
+            self.stream = self.container.add_stream_from_template(template_stream)
+        else:  # PyAV 13 이하
+            self.stream = self.container.add_stream(template=template_stream)
+        self.base = None
+        self.started_at = None
+        self.packets = 0
+        self.end_at = None  # 이벤트 클립 종료 시각 (time.monotonic)
+
+    def write(self, stored: StoredPacket):
+        first_ts = stored.dts if stored.dts is not None else stored.pts
+        if self.base is None:
+            self.base = first_ts
+            self.started_at = stored.received_at
+        packet = av.Packet(stored.data)
+        packet.pts = None if stored.pts is None else stored.pts - self.base
+        packet.dts = None if stored.dts is None else stored.dts - self.base
+        packet.time_base = stored.time_base
+        packet.is_keyframe = stored.is_keyframe
+        packet.stream = self.stream
+        self.container.mux(packet)
+        self.packets += 1
+
+    def close(self):
+        try:
+            self.container.close()
+        except av.FFmpegError as e:
+            print(f"[StreamRecorder] close failed: {self.path} ({e})")
+
+
+class StreamRecorder:
+    """
+    패킷 리먹스 녹화기 (VideoThread 1개에 연결)
+    사용:
+        recorder = StreamRecorder("recordings", prefix="eo")
+        recorder.attach(video_thread)   # PyAV 백엔드가 아니면 False
+        recorder.start_recording()      # 연속 녹화 (분할/보존 기간)
+        recorder.save_event("alert")    # 이전 pre_event_seconds + 이후 post_seconds 클립
+    """
+    QUEUE_SIZE = 2048  # 쓰기 대기 패킷 최대 수 (초과 시 드롭)
+
+    def __init__(self, output_dir: str = "recordings",
+                 file_format: str = FORMAT_MP4,
+                 prefix: str = "cam",
+                 segment_seconds: float = 60.0,
+                 max_segments: int = 60,
+                 max_bytes: int = 0,
+                 pre_event_seconds: float = 10.0,
+                 post_event_seconds: float = 10.0):
+        """
+        Args:
+            file_format: "mp4" / "mkv" (mkv는 비정상 종료 시에도 기록된 부분까지 재생 가능)
+            segment_seconds: 연속 녹화 파일 분할 간격 (다음 키프레임에서 분할)
+            max_segments / max_bytes: 연속 녹화 보존 한도 (0 = 제한 없음, 이벤트 클립은 삭제하지 않음)
+            pre_event_seconds: 이벤트 저장 시 포함할 이전 구간 (링 버퍼 크기)
+        """
+        if file_format not in _MUXER_NAMES:
+            raise ValueError(f"지원하지 않는 녹화 형식: {file_format}")
+        self.output_dir = output_dir
+        self.event_dir = os.path.join(output_dir, "events")
+        self.file_format = file_format
+        self.prefix = prefix
+        self.segment_seconds = segment_seconds
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self.pre_event_seconds = pre_event_seconds
+        self.post_event_seconds = post_event_seconds
+
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._thread = None
+        self._video_thread = None
+        self._is_running = False
+
+        # 쓰기 스레드 전용 상태
+        self._template = None
+        self._ring = deque()
+        self._segment: Optional[_ClipWriter] = None
+        self._segments: List[str] = []
+        self._clips: List[_ClipWriter] = []
+        self._recording = False
+
+        self.reset_stats()
+
+    @staticmethod
+    def available() -> bool:
+        return av is not None
+
+    # ==========================================================================
+    # 연결
+    # ==========================================================================
+    def attach(self, video_thread) -> bool:
+        """ VideoThread 디코드 백엔드의 패킷 콜백에 연결 (PyAV 백엔드가 아니면 False) """
+        if av is None or not video_thread.set_packet_sink(self._on_packet):
+            print("[StreamRecorder] 패킷 녹화는 PyAV 디코드 백엔드에서만 지원됩니다.")
+            return False
+        self._video_thread = video_thread
+        self._start_writer()
+        return True
+
+    def detach(self):
+        """ 패킷 콜백 해제 및 열린 파일 모두 닫기 """
+        if self._video_thread is not None:
+            self._video_thread.set_packet_sink(None)
+            self._video_thread = None
+        if self._thread is not None:
+            self._is_running = False
+            self._queue.put(("stop", None))
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _start_writer(self):
+        if self._thread is not None:
+            return
+        self._is_running = True
+        self._thread = threading.Thread(target=self._writer_worker, name="stream-recorder", daemon=True)
+        self._thread.start()
+
+    # ==========================================================================
+    # 제어 (GUI 스레드)
+    # ==========================================================================
+    def start_recording(self):
+        self._command("record", True)
+
+    def stop_recording(self):
+        self._command("record", False)
+
+    def save_event(self, label: str = "event", post_seconds: float = None) -> str:
+        """
+        이벤트 클립 저장 요청 (링 버퍼 + 이후 post_seconds)
+        Returns: 저장될 파일 경로
+        """
+        path = os.path.join(self.event_dir, f"{self.prefix}_{label}_{time.strftime('%Y%m%d_%H%M%S')}.{self.file_format}")
+        post = self.post_event_seconds if post_seconds is None else post_seconds
+        self._command("event", (path, post))
+        return path
+
+    @property
+    def recording(self) -> bool:
+        return self._recording
+
+    def _command(self, name: str, arg):
+        try:
+            self._queue.put((name, arg), timeout=1.0)
+        except queue.Full:
+            print(f"[StreamRecorder] command dropped: {name}")
+
+    # ==========================================================================
+    # 디코드 스레드 콜백
+    # ==========================================================================
+    def _on_packet(self, packet, stream):
+        """ (디코드 스레드) 압축 패킷 복사 후 큐에 넣기만 함 """
+        stored = StoredPacket(bytes(packet), packet.pts, packet.dts, packet.time_base,
+                              packet.is_keyframe, time.monotonic())
+        try:
+            self._queue.put_nowait(("packet", (stored, stream)))
+        except queue.Full:
+            self.dropped_packets += 1
+
+    # ==========================================================================
+    # 쓰기 스레드
+    # ==========================================================================
+    def _writer_worker(self):
+        while self._is_running:
+            try:
+                name, arg = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                if name == "packet":
+                    self._handle_packet(*arg)
+                elif name == "record":
+                    self._recording = arg
+                    if not arg:
+                        self._close_segment()
+                elif name == "event":
+                    self._open_clip(*arg)
+            except (av.FFmpegError, OSError, ValueError) as e:
+                self.write_errors += 1
+                print(f"[StreamRecorder] write failed: {e}")
+                self._close_segment()
+        self._close_segment()
+        for clip in self._clips:
+            clip.close()
+        self._clips = []
+        self._recording = False
+
+    def _handle_packet(self, stored: StoredPacket, stream):
+        if stored.pts is None and stored.dts is None:
+            return
+        if stream is not self._template:
+            # 재연결 등으로 입력 스트림이 바뀜 -> 열린 파일은 닫고 새 스트림 키프레임부터 다시 시작
+            self._close_segment()
+            for clip in self._clips:
+                clip.close()
+            self._clips = []
+            self._ring.clear()
+            self._template = stream
+
+        self._ring.append(stored)
+        if stored.is_keyframe:
+            self._trim_ring(stored.received_at)
+
+        # 연속 녹화 (키프레임에서 시작/분할)
+        if self._recording:
+            if self._segment is not None and stored.is_keyframe and \
+                    stored.received_at - self._segment.started_at >= self.segment_seconds:
+                self._close_segment()
+            if self._segment is None and stored.is_keyframe:
+                self._segment = self._open_writer(self.output_dir, f"{self.prefix}_{time.strftime('%Y%m%d_%H%M%S')}")
+            if self._segment is not None:
+                self._segment.write(stored)
+                self.recorded_packets += 1
+
+        # 이벤트 클립
+        for clip in list(self._clips):
+            clip.write(stored)
+            if stored.received_at >= clip.end_at:
+                clip.close()
+                self._clips.remove(clip)
+                self.saved_events += 1
+                print(f"[StreamRecorder] event saved: {clip.path}")
+
+    def _trim_ring(self, now: float):
+        """ pre_event_seconds 이전 구간 중 가장 최근 키프레임부터만 유지 (클립이 키프레임으로 시작하도록) """
+        horizon = now - self.pre_event_seconds
+        keep_from = 0
+        for i, stored in enumerate(self._ring):
+            if stored.received_at > horizon:
+                break
+            if stored.is_keyframe:
+                keep_from = i
+        for _ in range(keep_from):
+            self._ring.popleft()
+
+    def _open_writer(self, directory: str, stem: str) -> _ClipWriter:
+        os.makedirs(directory, exist_ok=True)
+        path, n = os.path.join(directory, f"{stem}.{self.file_format}"), 1
+        while os.path.exists(path):  # 같은 초에 분할된 경우
+            n += 1
+            path = os.path.join(directory, f"{stem}_{n}.{self.file_format}")
+        return _ClipWriter(path, self.file_format, self._template)
+
+    def _open_clip(self, path: str, post_seconds: float):
+        if self._template is None:
+            print("[StreamRecorder] 수신된 영상이 없어 이벤트를 저장할 수 없습니다.")
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        clip = _ClipWriter(path, self.file_format, self._template)
+        started = False
+        for stored in self._ring:
+            started = started or stored.is_keyframe
+            if started:
+                clip.write(stored)
+        clip.end_at = time.monotonic() + post_seconds
+        self._clips.append(clip)
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        self._segment.close()
+        self._segments.append(self._segment.path)
+        self._segment = None
+        self._apply_retention()
+
+    def _apply_retention(self):
+        """ 연속 녹화 파일 보존 한도 적용 (오래된 파일부터 삭제) """
+        def total_bytes():
+            return sum(os.path.getsize(p) for p in self._segments if os.path.exists(p))
+
+        while len(self._segments) > 1 and (
+                (self.max_segments and len(self._segments) > self.max_segments) or
+                (self.max_bytes and total_bytes() > self.max_bytes)):
+            oldest = self._segments.pop(0)
+            try:
+                os.remove(oldest)
+                self.deleted_segments += 1
+            except OSError as e:
+                print(f"[StreamRecorder] retention delete failed: {oldest} ({e})")
+
+    # ==========================================================================
+    # 통계
+    # ==========================================================================
+    def reset_stats(self):
+        self.recorded_packets = 0
+        self.dropped_packets = 0    # 쓰기 큐가 가득 차 버린 패킷
+        self.write_errors = 0
+        self.saved_events = 0
+        self.deleted_segments = 0
+
+    def stats(self) -> dict:
+        return {
+            "recording": self._recording,
+            "segment": self._segment.path if self._segment is not None else None,
+            "segments": len(self._segments),
+            "open_events": len(self._clips),
+            "ring_packets": len(self._ring),
+            "queue": self._queue.qsize(),
+            "recorded_packets": self.recorded_packets,
+            "dropped_packets": self.dropped_packets,
+            "write_errors": self.write_errors,
+            "saved_events": self.saved_events,
+            "deleted_segments": self.deleted_segments,
+        }
@@ -0,0 +1,254 @@
+"""
+filename: stream_manager.py
+
+영상 스트림 관리자 (URL당 RTSP 세션 1개)
+- subscribe(url, consumer): 같은 URL은 VideoThread 1개(디코드 1회)를 공유하고 구독자 수를 참조 카운트
+  (마지막 구독 해제 시 세션 종료)
+- 팬아웃: 구독마다 VideoThread 출력(표시 크기)을 1개씩 등록 -> StreamSubscription.frame_ready로 전달
+  원본 프레임이 필요한 구독(감지/전송)이 있을 때만 full_frame_ready 전달
+- 디코더 예산
+  - max_decode_threads: 활성 스트림들이 나눠 쓰는 전체 디코더 스레드 수 (스트림별 다음 연결부터 적용)
+  - max_active_streams: 동시에 디코딩하는 최대 스트림 수 (priority가 낮은 값부터 우선)
+  - 보이는 구독이 없고 원본 프레임 구독도 없는 스트림은 연결만 유지하고 디코딩 일시정지
+"""
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot
+
+from video.decode_backend import BACKEND_AUTO
+from video.video_thread import VideoThread
+
+
+class StreamSubscription(QObject):
+    """
+    스트림 구독 핸들 (소비자 1개)
+    - frame_ready: 이 구독의 표시 크기로 축소된 프레임 (ScaledFrame, GUI 스레드)
+    - full_frame_ready: 원본 해상도 프레임 + FrameMeta (full_frames=True인 구독만)
+    - latency: 세션 VideoThread의 단계별 지연 통계 (FrameLatencyStats)
+    """
+    frame_ready = Signal(object)
+    full_frame_ready = Signal(np.ndarray, object)
+    connection_lost = Signal()
+    connection_restored = Signal()
+
+    def __init__(self, session: "_StreamSession", output_name: str, consumer: str,
+                 visible: bool, full_frames: bool, priority: int):
+        super().__init__()
+        self._session = session
+        self.url = session.url
+        self.output_name = output_name  # VideoThread 출력 이름 (URL 내에서 고유)
+        self.consumer = consumer
+        self.visible = visible
+        self.full_frames = full_frames
+        self.priority = priority
+
+    @property
+    def latency(self):
+        return self._session.thread.latency if self._session is not None else None
+
+    @property
+    def active(self) -> bool:
+        """ 구독이 해제되지 않았는지 """
+        return self._session is not None
+
+    def set_size(self, size):
+        """ 표시 크기 변경 (같은 크기면 무시, 다음 프레임부터 적용) """
+        if self._session is not None:
+            self._session.thread.set_output(self.output_name, size, self.visible)
+
+    def set_visible(self, visible: bool, size=None):
+        """ 표시 여부 변경 (보이지 않으면 축소 생략, 스트림 전체가 보이지 않으면 디코딩 일시정지) """
+        if self._session is None:
+            return
+        if size is not None:
+            self._session.thread.set_output(self.output_name, size, visible)
+        if visible != self.visible:
+            self.visible = visible
+            self._session.thread.set_output_enabled(self.output_name, visible)
+            self._session.manager.rebalance()
+
+    def set_full_frames(self, enabled: bool):
+        """ 원본 프레임 전달 여부 (감지 서버 연결/해제 등) """
+        if self._session is not None and enabled != self.full_frames:
+            self.full_frames = enabled
+            self._session.update_full_frames()
+            self._session.manager.rebalance()
+
+    def release(self):
+        """ 구독 해제 (마지막 구독이면 세션 종료) """
+        if self._session is not None:
+            self._session.manager.unsubscribe(self)
+
+
+class _StreamSession(QObject):
+    """ URL 1개의 VideoThread와 구독 목록 (GUI 스레드 객체 -> 영상 스레드 시그널은 큐로 전달됨) """
+
+    def __init__(self, manager: "VideoStreamManager", url: str, thread: VideoThread):
+        super().__init__()
+        self.manager = manager
+        self.url = url
+        self.thread = thread
+        self.subscriptions: Dict[str, StreamSubscription] = {}  # output_name -> 구독
+        thread.set_full_frame_enabled(False)
+        thread.scaled_frame_signal.connect(self._on_scaled_frame)
+        thread.change_pixmap_signal.connect(self._on_full_frame)
+        thread.connection_lost_signal.connect(self._on_connection_lost)
+        thread.connection_restored_signal.connect(self._on_connection_restored)
+
+    def wants_decode(self) -> bool:
+        return any(s.visible or s.full_frames for s in self.subscriptions.values())
+
+    def priority(self) -> int:
+        return min((s.priority for s in self.subscriptions.values()), default=0)
+
+    def update_full_frames(self):
+        self.thread.set_full_frame_enabled(any(s.full_frames for s in self.subscriptions.values()))
+
+    @Slot(str, object)
+    def _on_scaled_frame(self, name, scaled):
+        subscription = self.subscriptions.get(name)
+        if subscription is not None:
+            subscription.frame_ready.emit(scaled)
+
+    @Slot(np.ndarray, object)
+    def _on_full_frame(self, frame, meta):
+        for subscription in list(self.subscriptions.values()):
+            if subscription.full_frames:
+                subscription.full_frame_ready.emit(frame, meta)
+
+    @Slot()
+    def _on_connection_lost(self):
+        for subscription in list(self.subscriptions.values()):
+            subscription.connection_lost.emit()
+
+    @Slot()
+    def _on_connection_restored(self):
+        for subscription in list(self.subscriptions.values()):
+            subscription.connection_restored.emit()
+
+
+class VideoStreamManager(QObject):
+    """URL별 영상 세션 공유 및 디코더 예산 관리 (GUI 스레드에서 사용)"""
+
+    def __init__(self, max_decode_threads: int = 0, max_active_streams: int = 0,
+                 decoder: str = BACKEND_AUTO):
+        """
+        Args:
+            max_decode_threads: 전체 디코더 스레드 예산 (0 = CPU 코어 수)
+            max_active_streams: 동시에 디코딩하는 최대 스트림 수 (0 = 제한 없음)
+            decoder: VideoThread 디코드 백엔드 ("auto" / "pyav" / "opencv")
+        """
+        super().__init__()
+        self.max_decode_threads = max_decode_threads or os.cpu_count() or 1
+        self.max_active_streams = max_active_streams
+        self.decoder = decoder
+        self._sessions: Dict[str, _StreamSession] = {}
+
+    # ==========================================================================
+    # 구독
+    # ==========================================================================
+    def subscribe(self, url: str, consumer: str, size=None, visible: bool = True,
+                  full_frames: bool = False, priority: int = 0) -> StreamSubscription:
+        """
+        스트림 구독 (같은 URL의 세션이 있으면 공유, 없으면 VideoThread 시작)
+        Args:
+            consumer: 소비자 이름 ("main", "zoom", "detector" 등, 같은 URL에서 중복 시 번호를 붙임)
+            size: 표시 크기 (None이면 축소 프레임 없음 - 원본 프레임 전용 구독, visible 무시)
+            visible: 표시 중인지 (False면 축소 생략)
+            full_frames: 원본 해상도 프레임 필요 여부
+            priority: 디코더 예산 우선순위 (작을수록 우선)
+        """
+        session = self._sessions.get(url)
+        created = session is None
+        if created:
+            session = _StreamSession(self, url, VideoThread(url, decoder=self.decoder))
+            self._sessions[url] = session
+
+        if size is None:
+            visible = False  # 표시 출력이 없는 구독은 디코딩 유지 조건에서 제외 (full_frames만 반영)
+        output_name, n = consumer, 1
+        while output_name in session.subscriptions:
+            n += 1
+            output_name = f"{consumer}#{n}"
+        subscription = StreamSubscription(session, output_name, consumer, visible, full_frames, priority)
+        session.subscriptions[output_name] = subscription
+        if size is not None:
+            session.thread.set_output(output_name, size, enabled=visible)
+        session.update_full_frames()
+
+        self.rebalance()
+        if created:
+            session.thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: StreamSubscription):
+        session = subscription._session
+        if session is None:
+            return
+        subscription._session = None
+        session.subscriptions.pop(subscription.output_name, None)
+        session.thread.outputs.remove_output(subscription.output_name)
+        if session.subscriptions:
+            session.update_full_frames()
+        else:
+            self._sessions.pop(session.url, None)
+            session.thread.stop()
+        self.rebalance()
+
+    # ==========================================================================
+    # 디코더 예산
+    # ==========================================================================
+    def rebalance(self):
+        """ 디코딩할 스트림 선택(우선순위 순) 및 스트림별 디코더 스레드 수 배분 """
+        wanted = sorted((s for s in self._sessions.values() if s.wants_decode()), key=lambda s: s.priority())
+        if self.max_active_streams > 0:
+            active = wanted[:self.max_active_streams]
+        else:
+            active = wanted
+        threads_per_stream = max(1, self.max_decode_threads // max(1, len(active)))
+        for session in self._sessions.values():
+            is_active = session in active
+            session.thread.set_paused(not is_active)
+            if is_active:
+                session.thread.set_decode_threads(threads_per_stream)
+
+    # ==========================================================================
+    # 조회 / 종료
+    # ==========================================================================
+    def stream(self, url: str) -> Optional[VideoThread]:
+        session = self._sessions.get(url)
+        return session.thread if session is not None else None
+
+    def urls(self) -> List[str]:
+        return list(self._sessions)
+
+    def stats(self) -> dict:
+        return {
+            url: {
+                "subscribers": [s.output_name for s in session.subscriptions.values()],
+                "visible": [s.output_name for s in session.subscriptions.values() if s.visible],
+                **session.thread.stats(),
+            }
+            for url, session in self._sessions.items()
+        }
+
+    def shutdown(self):
+        """ 모든 세션 종료 (프로그램 종료 시) """
+        for session in list(self._sessions.values()):
+            for subscription in list(session.subscriptions.values()):
+                subscription._session = None
+            session.thread.stop()
+        self._sessions.clear()
+
+
+_default_manager: Optional[VideoStreamManager] = None
+
+
+def get_stream_manager() -> VideoStreamManager:
+    """ 프로세스 공용 스트림 관리자 (GUI 스레드에서 최초 호출 시 생성) """
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = VideoStreamManager()
+    return _default_manager
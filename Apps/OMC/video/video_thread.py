@@ -0,0 +1,324 @@
+"""
+filename: video_thread.py
+
+RTSP 영상 수신 스레드 (탐지 UI(mainForm/VideoController) / 감시장비 제어 UI 공용)
+- Reader 스레드(디코드) -> 최신 프레임 슬롯(1개) -> QThread 루프(축소/시그널 전달)
+  (디코더는 표시/축소가 느려도 계속 스트림을 비우고, 표시는 항상 최신 프레임만 사용)
+- 자동 재연결: 열기 실패/읽기 실패/정체(stall) 시 디코더를 닫고 ReconnectScheduler 백오프 후 다시 열기
+- 정체 감지: 연결 상태에서 마지막 프레임 이후 stall_timeout이 지나면 재연결
+- 통계(stats_signal, 1초 주기): fps, 디코딩 시간, 큐 대기 시간, 재연결/정체 횟수 등
+- 일시정지(set_paused): 연결은 유지하고 디코딩만 생략 (보이지 않는 스트림, VideoStreamManager가 제어)
+- 프레임별 FrameMeta(PTS/디코딩/전달/축소 시각)를 change_pixmap_signal과 ScaledFrame.meta로 전달,
+  단계별 지연은 self.latency(FrameLatencyStats)에 누적
+"""
+import threading
+import time
+
+import numpy as np
+from PySide6.QtCore import QThread, Signal
+
+from utils.frame_presenter import FrameOutputs
+from utils.reconnect_scheduler import ReconnectScheduler
+from video.decode_backend import BACKEND_AUTO, SKIP_AUTO, create_decode_backend
+from video.frame_metrics import FrameLatencyStats, FrameMeta
+
+
+class VideoThread(QThread):
+    """
+    RTSP 비디오 스트림을 처리하는 스레드
+    - change_pixmap_signal: 원본 해상도 프레임 + FrameMeta (감지 서버/전송 등, 프레임만 받는 슬롯도 연결 가능)
+    - scaled_frame_signal: set_output()으로 등록한 소비자별 표시 크기 프레임 (이 스레드에서 축소)
+    - connection_lost_signal / connection_restored_signal: 연결 끊김(1회) / 재연결 후 첫 프레임
+    - stats_signal: 1초 주기 통계 dict
+    """
+    change_pixmap_signal = Signal(np.ndarray, object)  # (프레임, FrameMeta)
+    scaled_frame_signal = Signal(str, object)  # (출력 이름, ScaledFrame)
+    connection_lost_signal = Signal()
+    connection_restored_signal = Signal()
+    stats_signal = Signal(dict)
+
+    STATS_INTERVAL = 1.0  # 초
+    EMA_ALPHA = 0.1
+
+    def __init__(self, rtsp_url: str = "",
+                 decoder: str = BACKEND_AUTO,
+                 decode_threads: int = 0,
+                 skip_policy: str = SKIP_AUTO,
+                 stall_timeout: float = 3.0,
+                 reconnect_base_delay: float = 0.5,
+                 reconnect_max_delay: float = 10.0):
+        """
+        Args:
+            decoder: "auto"(PyAV 우선) / "pyav" / "opencv"
+            decode_threads: 디코더 스레드 수 (0 = 자동, PyAV 전용)
+            skip_policy: 부하 시 버릴 프레임 정책 (none/nonref/nonkey/auto, PyAV 전용)
+            stall_timeout: 연결 상태에서 이 시간(초) 동안 프레임이 없으면 재연결
+            reconnect_base_delay / reconnect_max_delay: 재연결 백오프 (초)
+        """
+        super().__init__()
+        self.rtsp_url = rtsp_url
+        self.stall_timeout = stall_timeout
+        self._decoder = create_decode_backend(decoder, thread_count=decode_threads, skip_policy=skip_policy)
+        self._reconnect = ReconnectScheduler(name="video", base_delay=reconnect_base_delay,
+                                             max_delay=reconnect_max_delay)
+        self._run_flag = False
+        self._paused = False
+        self._reader_thread = None
+        self._reader_gen = 0             # run()마다 증가, 이전 run()의 Reader는 세대가 다르면 종료
+
+        # 최신 프레임 슬롯 (Reader -> QThread 루프)
+        self._cond = threading.Condition()
+        self._latest = None              # (frame, pts, decoded_at)
+        self._reopen_requested = False   # 정체 감지 시 QThread 루프 -> Reader 재연결 요청
+        self.connected = False
+        self.last_frame_at = 0.0         # 마지막 프레임 디코딩 완료 시각 (time.monotonic)
+        self.last_pts = None             # 마지막 프레임 PTS (초)
+
+        self.outputs = FrameOutputs()
+        self.emit_full_frames = True
+        self.latency = FrameLatencyStats()
+        self._frame_seq = 0
+        self.reset_stats()
+
+    def set_url(self, url: str):
+        """ 다음 start()부터 적용 """
+        self.rtsp_url = url
+
+    # ==========================================================================
+    # 제어
+    # ==========================================================================
+    def run(self):
+        """ QThread 루프: 최신 프레임을 꺼내 축소/시그널 전달, 정체 감지, 통계 """
+        if not self.rtsp_url or self.rtsp_url == "N/A":
+            self.connection_lost_signal.emit()
+            return
+        self._run_flag = True
+        # [!] 이전 run()의 Reader가 join 타임아웃 후에도 남아 있으면 종료될 때까지 대기
+        #     (빠르게 재시작해도 같은 디코더를 두 Reader가 동시에 사용하지 않도록)
+        self._join_previous_reader()
+        self._reconnect.reset()
+        with self._cond:
+            self._latest = None
+            self._reopen_requested = False
+        self.reset_stats()
+        self.latency.reset()
+
+        self._reader_thread = threading.Thread(target=self._reader_worker, args=(self._reader_gen,),
+                                               name="video-reader", daemon=True)
+        self._reader_thread.start()
+
+        next_stats = time.monotonic() + self.STATS_INTERVAL
+        while self._run_flag:
+            with self._cond:
+                if self._latest is None:
+                    self._cond.wait(min(0.5, max(0.0, next_stats - time.monotonic())))
+                item, self._latest = self._latest, None
+
+            now = time.monotonic()
+            if item is not None:
+                frame, meta = item
+                meta.queue_ms = (now - meta.decoded_at) * 1000.0
+                self.queue_age_ms = self._ema(self.queue_age_ms, meta.queue_ms)
+                self._emit_frame(frame, meta)
+                self._frames_in_interval += 1
+            elif self.connected and self.last_frame_at and now - self.last_frame_at > self.stall_timeout:
+                # Reader가 read()에서 블로킹 중일 수 있으므로 디코더는 Reader가 반환 후 직접 닫음
+                print(f"[VideoThread] Stream stalled ({now - self.last_frame_at:.1f}s without frames), reconnecting")
+                self.stalls += 1
+                with self._cond:
+                    self._reopen_requested = True
+                self.connected = False
+                self.connection_lost_signal.emit()
+
+            if now >= next_stats:
+                self._emit_stats(now - next_stats + self.STATS_INTERVAL)
+                next_stats = now + self.STATS_INTERVAL
+
+        if self._reader_thread is not None:
+            self._reader_thread.join(timeout=self._decoder_timeout())
+            if not self._reader_thread.is_alive():
+                self._reader_thread = None  # 살아 있으면 다음 run()에서 종료를 기다림
+
+    def stop(self):
+        """ 스레드 안전 종료 (Reader 스레드가 디코더를 닫고 종료할 때까지 대기) """
+        self._run_flag = False
+        self._reconnect.cancel()
+        with self._cond:
+            self._cond.notify_all()
+        self.wait()
+
+    def set_paused(self, paused: bool):
+        """ 디코딩 일시정지/재개 (연결 유지, 재개 시 다음 키프레임부터 표시) """
+        self._paused = paused
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def set_decode_threads(self, thread_count: int):
+        """ 디코더 스레드 수 (다음 연결부터 적용) """
+        self._decoder.thread_count = thread_count
+
+    def set_packet_sink(self, callback) -> bool:
+        """
+        디먹스된 압축 패킷 콜백 등록 (None이면 해제, Reader 스레드에서 호출됨)
+        Returns: 디코드 백엔드가 패킷 콜백을 지원하는지 (PyAV만 지원, OpenCV는 False)
+        """
+        if not hasattr(self._decoder, "on_packet"):
+            return False
+        self._decoder.on_packet = callback
+        return True
+
+    def _join_previous_reader(self):
+        """ (영상 스레드) 이전 Reader 종료 대기 - 세대를 올려 _run_flag가 다시 True여도 종료되게 함 """
+        self._reader_gen += 1
+        reader, self._reader_thread = self._reader_thread, None
+        if reader is not None and reader.is_alive():
+            print("[VideoThread] Waiting for previous reader to stop")
+            reader.join()
+
+    def _decoder_timeout(self) -> float:
+        """ 디코더 read()가 블로킹될 수 있는 최대 시간 + 여유 """
+        return getattr(self._decoder, "READ_TIMEOUT", 2.0) + 1.0
+
+    # ==========================================================================
+    # Reader (디코드) 스레드
+    # ==========================================================================
+    def _reader_worker(self, gen: int):
+        print(f"[VideoThread] Reader started: {self.rtsp_url} ({self._decoder.name})")
+        while self._run_flag and gen == self._reader_gen:
+            if not self._decoder.is_opened() and not self._open_decoder():
+                continue
+
+            if self._paused:
+                if self._decoder.skip():
+                    self.last_frame_at = time.monotonic()
+                else:
+                    self._on_stream_lost("read failed")
+                continue
+
+            decoded = None
+            try:
+                decoded = self._decoder.read()
+            except Exception as e:  # 디코더 내부 오류도 재연결로 처리
+                print(f"[VideoThread] Decode error: {e}")
+
+            with self._cond:
+                reopen, self._reopen_requested = self._reopen_requested, False
+            if decoded is None or reopen:
+                self._on_stream_lost("stalled" if reopen else "read failed")
+                continue
+
+            self._frame_seq += 1
+            meta = FrameMeta(self._frame_seq, decoded.pts, decoded.decode_ms, self.latency)
+            self.latency.record_decoded(meta)
+            self.last_frame_at = meta.decoded_at
+            self.last_pts = decoded.pts
+            self.decode_ms = self._ema(self.decode_ms, decoded.decode_ms)
+            if not self.connected:
+                self.connected = True
+                self._reconnect.record_success()
+                self.connection_restored_signal.emit()
+            with self._cond:
+                if self._latest is not None:
+                    self.dropped_frames += 1  # 표시가 밀려 이전 프레임 교체
+                self._latest = (decoded.image, meta)
+                self._cond.notify()
+
+        self._decoder.close()
+        print("[VideoThread] Reader stopped")
+
+    def _open_decoder(self) -> bool:
+        """ 백오프 대기 후 디코더 열기 (첫 시도는 즉시) """
+        if self._reconnect.consecutive_failures and not self._reconnect.wait():
+            return False  # stop()으로 취소
+        if not self._run_flag:
+            return False
+        print(f"[VideoThread] Connecting to RTSP: {self.rtsp_url}")
+        self._reconnect.record_attempt()
+        if self._decoder.open(self.rtsp_url):
+            return True
+        print(f"[VideoThread] Failed to open RTSP: {self.rtsp_url}")
+        self._reconnect.record_failure("open failed")
+        if self.connected or self._reconnect.consecutive_failures == 1:
+            self.connected = False
+            self.connection_lost_signal.emit()
+        return False
+
+    def _on_stream_lost(self, reason: str):
+        print(f"[VideoThread] Stream lost ({reason}), reopening")
+        self._decoder.close()
+        self.reconnects += 1
+        self._reconnect.record_failure(reason)
+        if self.connected:
+            self.connected = False
+            self.connection_lost_signal.emit()
+
+    # ==========================================================================
+    # 출력(소비자)별 축소 프레임
+    # ==========================================================================
+    def set_output(self, name: str, size, enabled: bool = None):
+        """ 소비자별 표시 크기 등록/변경 (GUI 스레드에서 호출, 크기 변경 시 다음 프레임부터 적용) """
+        self.outputs.set_output(name, size, enabled)
+
+    def set_output_enabled(self, name: str, enabled: bool):
+        """ 보이지 않는 소비자(닫힌 확대 다이얼로그 등)는 축소를 건너뜀 """
+        self.outputs.set_enabled(name, enabled)
+
+    def set_full_frame_enabled(self, enabled: bool):
+        """ 원본 해상도 프레임(change_pixmap_signal) 전달 여부 (감지/전송 소비자가 없으면 False) """
+        self.emit_full_frames = enabled
+
+    def _emit_frame(self, frame, meta: FrameMeta):
+        """ (영상 스레드) 원본 프레임 및 출력별 축소 프레임 전달 """
+        t0 = time.monotonic()
+        outputs = self.outputs.render(frame, meta)
+        meta.emitted_at = time.monotonic()
+        if outputs:
+            meta.scale_ms = (meta.emitted_at - t0) * 1000.0
+        self.latency.record_emitted(meta)
+        if self.emit_full_frames:
+            self.change_pixmap_signal.emit(frame, meta)
+        for name, scaled in outputs:
+            self.scaled_frame_signal.emit(name, scaled)
+
+    # ==========================================================================
+    # 통계
+    # ==========================================================================
+    def _ema(self, prev: float, value: float) -> float:
+        return value if prev == 0.0 else prev + self.EMA_ALPHA * (value - prev)
+
+    def reset_stats(self):
+        self.fps = 0.0
+        self.decode_ms = 0.0       # 프레임당 디코딩 시간 (EMA)
+        self.queue_age_ms = 0.0    # 디코딩 완료 -> 전달 시작 (EMA, 분포는 self.latency)
+        self.dropped_frames = 0    # 전달 전에 새 프레임으로 교체된 프레임
+        self.reconnects = 0        # 연결 후 끊김/정체로 다시 연 횟수
+        self.stalls = 0
+        self._frames_in_interval = 0
+
+    def _emit_stats(self, elapsed: float):
+        self.fps = self._frames_in_interval / elapsed if elapsed > 0 else 0.0
+        self._frames_in_interval = 0
+        self.stats_signal.emit(self.stats())
+
+    def stats(self) -> dict:
+        frame_age = time.monotonic() - self.last_frame_at if self.last_frame_at else None
+        return {
+            "url": self.rtsp_url,
+            "connected": self.connected,
+            "paused": self._paused,
+            "fps": round(self.fps, 1),
+            "decode_ms": round(self.decode_ms, 2),
+            "queue_age_ms": round(self.queue_age_ms, 2),
+            "frame_age_ms": None if frame_age is None else round(frame_age * 1000.0, 1),
+            "dropped": self.dropped_frames,
+            "reconnects": self.reconnects,
+            "stalls": self.stalls,
+            "consecutive_failures": self._reconnect.consecutive_failures,
+            "decoder": self._decoder.stats(),
+        }
+
+    def decoder_stats(self) -> dict:
+        """ 디코드 백엔드 상태 (백엔드 이름, 스레드 수, 현재 skip_frame 등) """
+        return self._decoder.stats()
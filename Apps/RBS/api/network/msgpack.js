@@ -0,0 +1,139 @@
+// #############################
+// ## filename : msgpack.js
+// ## 설명 : PUSH_BIN 바디용 MessagePack 인코더 (외부 패키지 없이 필요한 타입만)
+// #############################
+//
+// 바디 구조: [cmd, data, rest, keyed]
+//  - cmd   : 문자열 (예: "robot_update")
+//  - data  : 협상된 키 사전(cmd별 키 목록)과 키 구성이 같으면 값 배열(사전 순서), 아니면 원래 값 그대로
+//  - rest  : cmd/data 외 필드(token, req_id 등) map, 없으면 nil
+//  - keyed : data가 키 사전 값 배열이면 true (원래 배열인 data와 구분, 디코더는 길이로 추측하지 않음)
+// JSON.stringify와 같은 규칙으로 변환 (undefined/함수 제외, NaN/Infinity -> nil, toJSON() 사용)
+
+import { Buffer } from "node:buffer";
+
+class Writer {
+  constructor(size = 512) {
+    this.buf = Buffer.allocUnsafe(size);
+    this.pos = 0;
+  }
+  reserve(n) {
+    if (this.pos + n <= this.buf.length) return;
+    const next = Buffer.allocUnsafe(Math.max(this.buf.length * 2, this.pos + n));
+    this.buf.copy(next, 0, 0, this.pos);
+    this.buf = next;
+  }
+  u8(v) { this.reserve(1); this.buf[this.pos++] = v; }
+  head(len, fix, fixMax, t8, t16, t32) {
+    if (len <= fixMax && fix !== null) this.u8(fix | len);
+    else if (len <= 0xff && t8 !== null) { this.reserve(2); this.buf[this.pos++] = t8; this.buf[this.pos++] = len; }
+    else if (len <= 0xffff) { this.reserve(3); this.buf[this.pos++] = t16; this.buf.writeUInt16BE(len, this.pos); this.pos += 2; }
+    else { this.reserve(5); this.buf[this.pos++] = t32; this.buf.writeUInt32BE(len, this.pos); this.pos += 4; }
+  }
+  result() { return Buffer.from(this.buf.subarray(0, this.pos)); }
+}
+
+function isSkipped(v) {
+  return v === undefined || typeof v === "function" || typeof v === "symbol";
+}
+
+function writeNumber(w, v) {
+  if (!Number.isFinite(v)) { w.u8(0xc0); return; }
+  if (Number.isInteger(v) && Math.abs(v) <= Number.MAX_SAFE_INTEGER) {
+    if (v >= 0) {
+      if (v < 0x80) w.u8(v);
+      else if (v <= 0xff) { w.reserve(2); w.buf[w.pos++] = 0xcc; w.buf[w.pos++] = v; }
+      else if (v <= 0xffff) { w.reserve(3); w.buf[w.pos++] = 0xcd; w.buf.writeUInt16BE(v, w.pos); w.pos += 2; }
+      else if (v <= 0xffffffff) { w.reserve(5); w.buf[w.pos++] = 0xce; w.buf.writeUInt32BE(v, w.pos); w.pos += 4; }
+      else { w.reserve(9); w.buf[w.pos++] = 0xcf; w.buf.writeBigUInt64BE(BigInt(v), w.pos); w.pos += 8; }
+    } else {
+      if (v >= -32) w.u8(v & 0xff);
+      else if (v >= -0x80) { w.reserve(2); w.buf[w.pos++] = 0xd0; w.buf.writeInt8(v, w.pos); w.pos += 1; }
+      else if (v >= -0x8000) { w.reserve(3); w.buf[w.pos++] = 0xd1; w.buf.writeInt16BE(v, w.pos); w.pos += 2; }
+      else if (v >= -0x80000000) { w.reserve(5); w.buf[w.pos++] = 0xd2; w.buf.writeInt32BE(v, w.pos); w.pos += 4; }
+      else { w.reserve(9); w.buf[w.pos++] = 0xd3; w.buf.writeBigInt64BE(BigInt(v), w.pos); w.pos += 8; }
+    }
+    return;
+  }
+  // 위경도 등 정밀도 유지를 위해 float64
+  w.reserve(9); w.buf[w.pos++] = 0xcb; w.buf.writeDoubleBE(v, w.pos); w.pos += 8;
+}
+
+function writeString(w, s) {
+  const len = Buffer.byteLength(s, "utf8");
+  w.head(len, 0xa0, 31, 0xd9, 0xda, 0xdb);
+  w.reserve(len);
+  w.pos += w.buf.write(s, w.pos, "utf8");
+}
+
+function writeValue(w, v) {
+  if (v === null || isSkipped(v)) { w.u8(0xc0); return; }
+  switch (typeof v) {
+    case "boolean": w.u8(v ? 0xc3 : 0xc2); return;
+    case "number": writeNumber(w, v); return;
+    case "bigint": writeNumber(w, Number(v)); return;
+    case "string": writeString(w, v); return;
+  }
+  if (Buffer.isBuffer(v)) {
+    w.head(v.length, null, -1, 0xc4, 0xc5, 0xc6);
+    w.reserve(v.length);
+    v.copy(w.buf, w.pos);
+    w.pos += v.length;
+    return;
+  }
+  if (typeof v.toJSON === "function") { writeValue(w, v.toJSON()); return; }
+  if (Array.isArray(v)) {
+    w.head(v.length, 0x90, 15, null, 0xdc, 0xdd);
+    for (const item of v) writeValue(w, item);
+    return;
+  }
+  writeMap(w, v);
+}
+
+function writeMap(w, obj, skipKeys = null) {
+  const keys = Object.keys(obj).filter(k => !isSkipped(obj[k]) && !(skipKeys && skipKeys.includes(k)));
+  w.head(keys.length, 0x80, 15, null, 0xde, 0xdf);
+  for (const k of keys) {
+    writeString(w, k);
+    writeValue(w, obj[k]);
+  }
+}
+
+// data의 키 구성이 사전과 정확히 같고 모든 값이 있을 때만 값 배열로 전송 (디코더는 zip(keys, values))
+function matchesKeys(data, keys) {
+  if (!keys || typeof data !== "object" || data === null || Array.isArray(data)) return false;
+  let n = 0;
+  for (const k in data) {
+    if (!Object.hasOwn(data, k)) continue;
+    if (isSkipped(data[k])) return false;
+    n++;
+  }
+  if (n !== keys.length) return false;
+  for (const k of keys) if (!Object.hasOwn(data, k)) return false;
+  return true;
+}
+
+/**
+ * 푸시 메시지 -> PUSH_BIN 바디
+ * @param {{cmd:string, data?:any}} msg
+ * @param {Object<string,string[]>} keyDict  cmd -> data 키 목록 (협상된 키 사전)
+ * @returns {Buffer}
+ */
+export function encodeBinMessage(msg, keyDict = {}) {
+  const w = new Writer();
+  const keys = keyDict[msg.cmd];
+  const keyed = matchesKeys(msg.data, keys);
+  w.u8(0x94);
+  writeString(w, String(msg.cmd ?? ""));
+  if (keyed) {
+    w.head(keys.length, 0x90, 15, null, 0xdc, 0xdd);
+    for (const k of keys) writeValue(w, msg.data[k]);
+  } else {
+    writeValue(w, msg.data);
+  }
+  const hasRest = Object.keys(msg).some(k => k !== "cmd" && k !== "data" && !isSkipped(msg[k]));
+  if (hasRest) writeMap(w, msg, ["cmd", "data"]);
+  else w.u8(0xc0);
+  w.u8(keyed ? 0xc3 : 0xc2);
+  return w.result();
+}
@@ -24,8 +24,11 @@ import {
   IMG_JPG, IMG_PNG, IMG_BMP,
   buildHeader, buildJsonPacket, buildAckPacketFor,
   buildPushStatusPacket, buildPushAlertPacket,
+  FEATURE_REQ_ID, buildRequestAck, parseRequestId,
+  PUSH_BIN, FEATURE_BIN, BIN_FORMAT_MSGPACK, buildBinPacket,
 } from "./tcpProtocol.js";
 import { deepMerge, getByPath } from "./deepMerge.js";
+import { encodeBinMessage } from "./msgpack.js";
 
 // ---- 내부 유틸 ----
 class WriteQueue {
@@ -114,6 +117,10 @@ export class TcpServer {
     this.jsonCmdHandlers = new Map();   // ✅ 추가: cmd별 핸들러 맵
 
     this.lastAckStatus = {}; // 클라이언트별 마지막 ACK 상태 기록 , 연결상태나 지연 또는 기기오작동 판단에 활용 가능
+
+    // [!] 바이너리 푸시 (PUSH_BIN/MessagePack)
+    this.binKeys = {};            // cmd -> data 키 사전 (setBinKeys)
+    this.binSockets = new Map();  // bin_hello 협상한 소켓 -> 협상 시점 키 사전
   }
 
     // === 시간 유틸 ===
@@ -165,6 +172,23 @@ export class TcpServer {
     this.jsonCmdHandlers.set(String(cmd).toLowerCase(), handler);
   }
 
+  /**
+   * PUSH_BIN 키 사전 등록 (이후 bin_hello로 협상하는 연결부터 적용)
+   * @param {string} cmd       ex) "robot_update"
+   * @param {string[]} keys    data 객체 키 목록 (순서 = 값 배열 순서)
+   */
+  setBinKeys(cmd, keys) {
+    this.binKeys = { ...this.binKeys, [cmd]: [...keys] };
+  }
+
+  // 푸시 패킷 (bin_hello 협상한 연결은 PUSH_BIN, 나머지는 PUSH_JSON)
+  #buildPushPacket(socket, obj) {
+    const keyDict = this.binSockets.get(socket);
+    return keyDict
+      ? buildBinPacket(PUSH_BIN, encodeBinMessage(obj, keyDict))
+      : buildJsonPacket(PUSH_JSON, obj);
+  }
+
   /**
    * metadata.json 로드
    * @param {{merge?: boolean}} opts
@@ -206,6 +230,7 @@ export class TcpServer {
       version: this.version,
       clients: this.sockets.size,
       banks: this.imageBank.size,
+      binClients: this.binSockets.size,
     };
   }
 
@@ -231,9 +256,15 @@ export class TcpServer {
   }
 
   async broadcastJson(obj) {
-    const buf = buildJsonPacket(PUSH_JSON, obj);
+    // 패킷은 형식(JSON / 키 사전)별로 한 번만 생성
+    const packets = new Map();
+    const packetFor = (sock) => {
+      const kind = this.binSockets.get(sock) ?? PUSH_JSON;
+      if (!packets.has(kind)) packets.set(kind, this.#buildPushPacket(sock, obj));
+      return packets.get(kind);
+    };
     await Promise.all(
-      [...this.sockets].map(sock => new Promise(resolve => sock.write(buf, () => resolve())))
+      [...this.sockets].map(sock => new Promise(resolve => sock.write(packetFor(sock), () => resolve())))
     );
   }
 
@@ -256,7 +287,10 @@ export class TcpServer {
       console.log(`[TCP] closed: ${addr}`);
     };
 
-    socket.on("close", () => this.sockets.delete(socket));
+    socket.on("close", () => {
+      this.sockets.delete(socket);
+      this.binSockets.delete(socket);
+    });
 
     try {
       // welcome push
@@ -266,6 +300,8 @@ export class TcpServer {
         version: this.version,
         app : 'robot_sim_vehicle_model_t01',
         server_time: Math.floor(Date.now() / 1000),
+        features: [FEATURE_REQ_ID, FEATURE_BIN], // 요청 ID 확장 / 바이너리 푸시 지원
+        bin_formats: [BIN_FORMAT_MSGPACK],
         packet_id: nextId(),
         robot_id: this.metadataJson.robot?.id ?? 1
       })); // 원본 흐름 유지 :contentReference[oaicite:2]{index=2}
@@ -318,9 +354,15 @@ export class TcpServer {
             throw e;
           }
 
+          // 요청 ID 확장: req_id가 있으면 ACK/데이터 응답에 같은 ID를 실어 보냄 (클라이언트 동시 요청 구분)
+          let reqId = null;
+          const ack = (status) => writer.send(buildRequestAck(requestCode, reqId, status));
+          const reply = (msg) => writer.send(buildJsonPacket(PUSH_JSON, reqId === null ? msg : { ...msg, req_id: reqId }));
+
           try {
             const obj = JSON.parse(body.toString("utf8"));
             if (typeof obj !== "object" || Array.isArray(obj)) throw new Error("JSON root must be object");
+            reqId = parseRequestId(obj);
 
             const cmd = String(obj.cmd || "").toLowerCase();
 
@@ -332,14 +374,14 @@ export class TcpServer {
                 const ackStatus = result?.ackStatus ?? SUCCESS;
 
                 // 1) 우선 ACK (클라의 send_json 대기 해제)
-                await writer.send(buildAckPacketFor(requestCode, ackStatus));
+                await ack(ackStatus);
 
                 // 2) 선택: PUSH (UI/다중 클라 동기화)
                 if (result?.push) {
-                  await writer.send(buildJsonPacket(PUSH_JSON, result.push));
+                  await writer.send(this.#buildPushPacket(socket, result.push));
                 }
               } catch (e) {
-                await writer.send(buildAckPacketFor(requestCode, ERR_EXCEPTION));
+                await ack(ERR_EXCEPTION);
               }
               continue;
             }
@@ -355,12 +397,12 @@ export class TcpServer {
               const now_time = this.#currentTimeString();
               const elapsed_time = this.#elapsedTimeString();
               
-              await writer.send(buildJsonPacket(PUSH_JSON, { 
+              await reply({ 
                 cmd: "all_metadata", 
                 data: snapshot,
                 now_time,
                 elapsed_time
-              }));
+              });
               continue;
             } else if (cmd === "get_item") {
               const key = String(obj.key || "");
@@ -372,14 +414,14 @@ export class TcpServer {
               const now_time = this.#currentTimeString();
               const elapsed_time = this.#elapsedTimeString();
 
-              await writer.send(buildJsonPacket(PUSH_JSON, {
+              await reply({
                 cmd: "item_metadata",
                 key,
                 token,
                 value,
                 now_time,       // "yyyy-MM-dd hh:mm:ss"
                 elapsed_time    // "HH:MM:SS" (서버 시작 이후)
-              }));
+              });
               // await writer.send(buildJsonPacket(PUSH_JSON, { cmd: "item_metadata", key, value, token }));
 
               continue;
@@ -389,7 +431,7 @@ export class TcpServer {
               const token = obj.token;
 
               if (!key) {
-                await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_PARAMETER));
+                await ack(ERR_INVALID_PARAMETER);
                 continue;
               }
 
@@ -408,7 +450,7 @@ export class TcpServer {
               }
 
               // 1) 요청에 대한 ACK (클라이언트의 send_json()이 기다림)
-              await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+              await ack(SUCCESS);
 
               // 2) (선택) 에코/브로드캐스트용 PUSH_JSON
               //    UI 동기화/다중 클라이언트 갱신에 유용
@@ -419,12 +461,23 @@ export class TcpServer {
 
               continue;
 
+            } else if (cmd === "bin_hello") {
+              // [!] 바이너리 푸시 협상: 키 사전을 먼저 보낸 뒤부터 이 연결의 푸시를 PUSH_BIN으로 전송
+              const formats = Array.isArray(obj.formats) ? obj.formats : [];
+              if (!formats.includes(BIN_FORMAT_MSGPACK)) {
+                await ack(ERR_INVALID_PARAMETER);
+                continue;
+              }
+              const keyDict = this.binKeys;
+              await reply({ cmd: "bin_keys", format: BIN_FORMAT_MSGPACK, keys: keyDict });
+              this.binSockets.set(socket, keyDict);
+              continue;
             } else if (cmd === "list_banks") {
               const banks = [];
               for (const [bId, e] of this.imageBank.entries()) {
                 banks.push({ bank_id: bId, img_type: e.type, img_size: e.size, img_seq: e.seq, ts: Math.floor(e.ts ?? Date.now() / 1000) });
               }
-              await writer.send(buildJsonPacket(PUSH_JSON, { cmd: "bank_list", banks }));
+              await reply({ cmd: "bank_list", banks });
               continue;
             } else if (cmd === "get_bank_info") {
               const bId = Number(obj.bank_id ?? -1);
@@ -432,24 +485,24 @@ export class TcpServer {
               const msg = e
                 ? { cmd: "bank_info", bank_id: bId, exists: true, img_type: e.type, img_size: e.size, img_seq: e.seq, ts: Math.floor(e.ts ?? Date.now() / 1000) }
                 : { cmd: "bank_info", bank_id: bId, exists: false };
-              await writer.send(buildJsonPacket(PUSH_JSON, msg));
+              await reply(msg);
               continue;
             } else if (cmd === "clear_bank") {
               const bId = Number(obj.bank_id ?? -1);
               this.imageBank.delete(bId);
-              await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+              await ack(SUCCESS);
               continue;
             } else {
-              await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_PARAMETER));
+              await ack(ERR_INVALID_PARAMETER);
               continue;
             }
           } catch (e) {
             console.warn(`[TCP][WARN] invalid JSON: ${e.message}`);
-            await writer.send(buildAckPacketFor(requestCode, ERR_INVALID_FORMAT));
+            await ack(ERR_INVALID_FORMAT);
             continue;
           }
 
-          await writer.send(buildAckPacketFor(requestCode, SUCCESS));
+          await ack(SUCCESS);
           continue;
         }
 
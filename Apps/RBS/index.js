@@ -50,6 +50,9 @@ async function main() {
   const seed = { ...(tcp.metadataJson.robot ?? {}), ...(tcp.metadataJson.geo_ref ?? {}) };
   const robot = Robot.fromMetadata({ robot: seed, geo_ref: tcp.metadataJson.geo_ref });
 
+  // robot_update 바이너리 푸시 키 사전 (bin_hello 협상 클라이언트는 data를 이 순서의 값 배열로 수신)
+  tcp.setBinKeys("robot_update", Object.keys(robot.toJSON()));
+
   // ✅ control_robot 콜백 등록
   tcp.registerJsonHandler("control_robot", async (obj, { tcp }) => {
 